@@ -19,11 +19,13 @@ Purpose:
         • Central logic routing
         • Breath logging (this new endpoint)
         • (Optional) OpenAI agent services
-    - Exposes a health-check endpoint.
+    - Watches config/symbolic_rules.json and hot-swaps the compiled rule tables.
+    - Exposes a health-check endpoint and Prometheus metrics at /metrics.
+    - Optionally records API traffic to NDJSON for traffic_replay.py.
     - Launches the aura-based symbolic routing gateway on configured port.
 
 Dependencies:
-    flask, flask-cors, python-dotenv, flask-pymongo, psycopg2, openai
+    flask, flask-cors, python-dotenv, flask-pymongo, psycopg2, openai, numpy
 """
 
 import os
@@ -56,6 +58,10 @@ from controllers.emotion_controller import emotion_bp
 from controllers.memory_controller import memory_bp
 from controllers.humor_controller import humor_bp
 from controllers.logic_router import logic_bp
+from utils.symbolic_rules import start_rule_watcher
+from utils.metrics import init_metrics
+from utils.profiling import init_profiling
+from utils.traffic_capture import init_traffic_capture
 
 # ------------------------------------------------------------------
 # Optional: OpenAI Blueprint
@@ -81,6 +87,9 @@ def create_app():
     init_mongo(app)
     init_postgres_pool(minconn=2, maxconn=10, app=app)
 
+    # Hot-reload paradox, lapis and hope rules from config/symbolic_rules.json
+    start_rule_watcher()
+
     # Register all API endpoints
     app.register_blueprint(transmutation_bp, url_prefix="/api/transmute")
     app.register_blueprint(virtue_vessel_bp, url_prefix="/api/virtue")
@@ -95,6 +104,15 @@ def create_app():
     if OPENAI_ENABLED:
         app.register_blueprint(openai_bp, url_prefix="/api/openai")
 
+    # Route/stage latency histograms and store gauges at /metrics
+    init_metrics(app)
+
+    # Opt-in cProfile capture (PROFILE_TOKEN header or PROFILE_SAMPLE_RATE)
+    init_profiling(app)
+
+    # Opt-in request capture for replay (TRAFFIC_CAPTURE_FILE)
+    init_traffic_capture(app)
+
     # Root health check
     @app.route("/", methods=["GET"])
     def health():
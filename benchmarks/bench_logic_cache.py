@@ -0,0 +1,130 @@
+"""
+bench_logic_cache.py
+---------------------
+Measures /api/logic/logic/process latency with the scoring memo caches cold
+and warm.
+
+Author: Khaylub Thompson-Calvin
+
+Usage:
+    python -m benchmarks.bench_logic_cache --requests 5000 --pairs 50
+
+Runs the logic blueprint in-process through Flask's test client, so no
+database or network is involved. Event logging is routed to an empty
+pipeline to keep stdout out of the timings.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from flask import Flask
+
+from controllers.logic_router import logic_bp
+from utils.event_pipeline import EventPipeline, configure_event_pipeline
+from utils.izumi_izanagi_gate import resolve_paradox_chain
+from utils.mana_converter import convert_experience_to_mana
+from utils.memo import cache_stats, clear_caches
+from utils.wheat_binder import bind_hope_chain
+
+EMOTIONS = ["fear", "grief", "anger", "envy", "pride", "joy", "patience", "awe", "yearning", "shame"]
+VIRTUES = ["courage", "wisdom", "compassion", "gratitude", "humility", "faith", "truth", "honor", "renewal"]
+
+
+def make_client():
+    app = Flask(__name__)
+    app.register_blueprint(logic_bp, url_prefix="/api/logic")
+    return app.test_client()
+
+
+def make_payloads(count, pairs, seed=7):
+    rng = random.Random(seed)
+    pool = [
+        {"emotion": rng.choice(EMOTIONS), "virtue": rng.choice(VIRTUES), "memory": "trial"}
+        for _ in range(pairs)
+    ]
+    return [pool[i % pairs] for i in range(count)]
+
+
+def run(client, payloads, cold):
+    """
+    Posts every payload; `cold` empties the memo caches before each request.
+
+    Returns:
+        list[float]: Per-request latency in milliseconds
+    """
+    latencies = []
+    for payload in payloads:
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        response = client.post("/api/logic/logic/process", json=payload)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"Request failed: {response.status_code} {response.get_json()}")
+    return latencies
+
+
+def run_scoring(payloads, cold):
+    """
+    Calls the memoized scorers the route uses, without Flask around them.
+
+    Returns:
+        list[float]: Per-payload latency in microseconds
+    """
+    latencies = []
+    for payload in payloads:
+        if cold:
+            clear_caches()
+        emotion, virtue = payload["emotion"], payload["virtue"]
+        start = time.perf_counter()
+        convert_experience_to_mana(emotion, virtue)
+        resolve_paradox_chain(virtue, emotion)
+        bind_hope_chain(emotion, virtue, fatigue_level=3)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logic route latency with memo caches cold vs warm")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per scenario")
+    parser.add_argument("--pairs", type=int, default=50, help="Distinct emotion/virtue pairs")
+    args = parser.parse_args()
+
+    configure_event_pipeline(EventPipeline(sinks=[]))
+    client = make_client()
+    payloads = make_payloads(args.requests, args.pairs)
+
+    # One untimed pass so Flask and the vocabulary are warmed equally for both scenarios
+    run(client, payloads[:args.pairs], cold=True)
+
+    scenarios = (
+        ("route", "ms", lambda cold: run(client, payloads, cold)),
+        ("scoring", "us", lambda cold: run_scoring(payloads, cold)),
+    )
+    print(f"{'scenario':<16}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for label, unit, measure in scenarios:
+        for name, cold in (("cold", True), ("warm", False)):
+            clear_caches()
+            if not cold:
+                run_scoring(payloads[:args.pairs], cold=False)
+            latencies = measure(cold)
+            print(
+                f"{f'{label} {name} ({unit})':<16}{statistics.mean(latencies):>10.3f}"
+                f"{percentile(latencies, 50):>10.3f}{percentile(latencies, 95):>10.3f}"
+                f"{percentile(latencies, 99):>10.3f}"
+            )
+
+    print()
+    for name, stats in cache_stats().items():
+        print(f"{name:<50} hits={stats['hits']:<8} misses={stats['misses']:<6} hit_rate={stats['hit_rate']}")
+
+
+if __name__ == "__main__":
+    main()
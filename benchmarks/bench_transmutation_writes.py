@@ -0,0 +1,114 @@
+"""
+bench_transmutation_writes.py
+------------------------------
+Compares per-request Postgres inserts with the batched write-behind flushes
+used by models.transmutation_store.
+
+Author: Khaylub Thompson-Calvin
+
+Usage:
+    python -m benchmarks.bench_transmutation_writes --records 20000 --batch-size 500
+
+Uses the DB_* environment variables from .env, like the app itself.
+Rows are written to the real transmutation_records table under a throwaway
+user id and deleted afterwards.
+"""
+
+import argparse
+import time
+import uuid
+from datetime import datetime
+
+from database import get_postgres_connection, release_postgres_connection
+from models.transmutation_store import (
+    CREATE_TABLE_SQL, TABLE_NAME, COLUMNS, TransmutationWriter, _to_row
+)
+
+BENCH_USER = "bench_transmutation_writes"
+
+
+def make_entry(i):
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "emotion": "awe",
+        "virtue": "truth",
+        "mana": float(34 + i % 120),
+        "aura_tier": "Kindled",
+        "class_shift": False,
+        "memory_reference": "none",
+        "lapis_triggered": {"triggered": True, "virtue_match": True}
+    }
+
+
+def run_per_request(count):
+    """
+    One pool checkout, INSERT and COMMIT per record (the naive synchronous path).
+    """
+    sql = f"INSERT INTO {TABLE_NAME} ({', '.join(COLUMNS)}) VALUES ({', '.join(['%s'] * len(COLUMNS))})"
+    start = time.perf_counter()
+    for i in range(count):
+        conn = get_postgres_connection()
+        with conn.cursor() as cur:
+            cur.execute(sql, _to_row(str(uuid.uuid4()), BENCH_USER, make_entry(i)))
+        conn.commit()
+        release_postgres_connection(conn)
+    return time.perf_counter() - start
+
+
+def run_batched(count, batch_size, method):
+    """
+    Enqueue through TransmutationWriter and flush every batch_size records.
+    """
+    writer = TransmutationWriter(batch_size=batch_size, method=method)
+    start = time.perf_counter()
+    for i in range(count):
+        writer.enqueue(BENCH_USER, make_entry(i))
+        if writer.pending_count() >= batch_size:
+            writer.flush()
+    writer.flush()
+    elapsed = time.perf_counter() - start
+    if writer.stats["written"] != count:
+        raise RuntimeError(f"Writer persisted {writer.stats['written']} of {count} records")
+    return elapsed
+
+
+def cleanup():
+    conn = get_postgres_connection()
+    with conn.cursor() as cur:
+        cur.execute(f"DELETE FROM {TABLE_NAME} WHERE user_id = %s", (BENCH_USER,))
+    conn.commit()
+    release_postgres_connection(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transmutation write throughput benchmark")
+    parser.add_argument("--records", type=int, default=20000, help="Records per scenario")
+    parser.add_argument("--batch-size", type=int, default=500, help="Records per batched flush")
+    args = parser.parse_args()
+
+    conn = get_postgres_connection()
+    if conn is None:
+        raise SystemExit("Postgres is not reachable; check DB_* settings.")
+    with conn.cursor() as cur:
+        cur.execute(CREATE_TABLE_SQL)
+    conn.commit()
+    release_postgres_connection(conn)
+
+    scenarios = [
+        ("per-request INSERT", lambda: run_per_request(args.records)),
+        (f"batched VALUES x{args.batch_size}", lambda: run_batched(args.records, args.batch_size, "values")),
+        (f"batched COPY x{args.batch_size}", lambda: run_batched(args.records, args.batch_size, "copy")),
+    ]
+
+    print(f"{'scenario':<28}{'seconds':>10}{'records/s':>14}")
+    try:
+        for name, run in scenarios:
+            elapsed = run()
+            print(f"{name:<28}{elapsed:>10.3f}{args.records / elapsed:>14,.0f}")
+            cleanup()
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+"""
+http_suite.py
+--------------
+Reproducible latency/throughput benchmark for every registered route.
+
+Author: Khaylub Thompson-Calvin
+
+Usage:
+    python -m benchmarks.http_suite --requests 500
+    python -m benchmarks.http_suite --mode server --concurrency 8
+    python -m benchmarks.http_suite --save-baseline          # refresh the stored baseline
+
+Each route is driven N times through Flask's test client ("client" mode) and
+through a real threaded WSGI server over HTTP ("server" mode). External
+services are replaced with local stand-ins so runs are repeatable:
+
+    Postgres  StandInPool: connections accept every statement and return no rows
+    Mongo     no route reads Mongo; MONGO_URI points at a closed local port
+    OpenAI    FakeOpenAIServer: a local HTTP server returning canned completions;
+              the completion cache lives in the run's temporary directory
+
+Reported per route: p50/p95/p99 latency (ms) and throughput (req/s); per
+mode: RSS growth over the run. Results are compared against
+benchmarks/http_baseline.json; a route whose p95 or throughput is worse than
+the baseline by more than --tolerance is flagged and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "http_baseline.json")
+
+EMOTIONS = ["fear", "grief", "anger", "awe", "joy", "patience", "pride", "envy"]
+VIRTUES = ["courage", "wisdom", "truth", "faith", "humility", "gratitude", "honor", "compassion"]
+MEMORY_TAGS = ["death", "origin", "trial", "loss", None]
+JOKES = [
+    "Knock knock. Who's there? An existential loop.",
+    "A virtue walks into a bar because it was thirsty for meaning.",
+    "Why did the paradox cross the road? It didn't.",
+    "Plain sentence with nothing funny in it.",
+]
+
+
+# -----------------------------------------------------------------------------
+# Stand-ins for external services
+# -----------------------------------------------------------------------------
+class _StandInCursor:
+    def __init__(self, log):
+        self._log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self._log.append(sql)
+
+    def copy_expert(self, sql, buffer):
+        self._log.append(sql)
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+
+class _StandInConnection:
+    def __init__(self):
+        self.statements = []
+
+    def cursor(self, *args, **kwargs):
+        return _StandInCursor(self.statements)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class StandInPool:
+    """
+    Mimics ThreadedConnectionPool.getconn/putconn without a server.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+
+    def getconn(self):
+        self.checkouts += 1
+        return _StandInConnection()
+
+    def putconn(self, conn):
+        pass
+
+
+class _FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; Nagle would add ~40 ms per call
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        prompt = (request.get("messages") or [{}])[-1].get("content", "")
+        model = request.get("model", "gpt-3.5-turbo")
+        reply = f"Echo of: {prompt}"
+
+        if request.get("stream"):
+            self._send("text/event-stream", self._stream_body(model, reply))
+            return
+
+        body = json.dumps({
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }).encode("utf-8")
+        self._send("application/json", body)
+
+    @staticmethod
+    def _stream_body(model, reply):
+        # One chunk per word, then the [DONE] sentinel, as the streaming API sends them
+        events = []
+        for word in reply.split(" "):
+            chunk = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]
+            }
+            events.append(f"data: {json.dumps(chunk)}\n\n")
+        events.append("data: [DONE]\n\n")
+        return "".join(events).encode("utf-8")
+
+    def _send(self, content_type, body):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeOpenAIServer:
+    """
+    Local HTTP server answering /v1/chat/completions with a canned completion.
+    """
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAIHandler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}/v1"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def build_app(workdir):
+    """
+    Imports and creates the app with every external service replaced.
+    Environment must be set before the first import of app/controllers.
+    """
+    os.environ.setdefault("OPENAI_KEY", "bench-key")
+    os.environ["MONGO_URI"] = "mongodb://127.0.0.1:1/bench"
+    os.environ["TRANSMUTATION_PERSIST"] = "0"
+    os.environ["PROFILE_SAMPLE_RATE"] = "0"
+    os.environ.pop("PROFILE_TOKEN", None)
+    os.environ.pop("TRAFFIC_CAPTURE_FILE", None)
+    os.environ["COMPLETION_CACHE_PATH"] = os.path.join(workdir, "completions.sqlite3")
+
+    import app as app_module
+    import database
+    from utils.event_pipeline import EventPipeline, FileSink, configure_event_pipeline
+
+    pool = StandInPool()
+    app_module.init_postgres_pool = lambda *args, **kwargs: None
+    database._pg_pool = pool
+    configure_event_pipeline(EventPipeline(sinks=[FileSink(os.path.join(workdir, "events.log"))]))
+    return app_module.create_app(), pool
+
+
+# -----------------------------------------------------------------------------
+# Route catalogue
+# -----------------------------------------------------------------------------
+def _pair(rng):
+    return rng.choice(EMOTIONS), rng.choice(VIRTUES)
+
+
+def route_catalogue(users=200):
+    """
+    Returns:
+        list: (name, method, path factory, JSON body factory) per route;
+        factories take (i, rng) so every run sends the same sequence
+    """
+    def user(i):
+        return f"bench_user_{i % users}"
+
+    def transmute(i, rng):
+        emotion, virtue = _pair(rng)
+        return {"emotion": emotion, "virtue": virtue, "memory": rng.choice(MEMORY_TAGS)}
+
+    def transmute_batch(i, rng):
+        return {"items": [transmute(i, rng) for _ in range(20)]}
+
+    def breath(i, rng):
+        emotion, virtue = _pair(rng)
+        return {"user_id": user(i), "emotion": emotion, "virtue": virtue,
+                "breath_cycle": 1 + i % 3, "memory_tag": rng.choice(MEMORY_TAGS)}
+
+    def logic(i, rng):
+        emotion, virtue = _pair(rng)
+        return {"emotion": emotion, "virtue": virtue, "memory": "trial"}
+
+    def static(path):
+        return lambda i, rng: path
+
+    post = lambda name, path, body: (name, "POST", static(path), body)
+    get = lambda name, path: (name, "GET", path, None)
+
+    return [
+        get("health", static("/")),
+        post("transmute", "/api/transmute/transmute", transmute),
+        post("transmute_batch", "/api/transmute/batch", transmute_batch),
+        post("logic_process", "/api/logic/logic/process", logic),
+        post("breath_log", "/api/breath/log", breath),
+        post("virtue_update", "/api/virtue/virtue/update",
+             lambda i, rng: {"user_id": user(i), "virtue": rng.choice(VIRTUES)}),
+        get("virtue_leaderboard", static("/api/virtue/virtue/leaderboard?limit=20")),
+        get("virtue_leaderboard_virtue", lambda i, rng: f"/api/virtue/virtue/leaderboard/{rng.choice(VIRTUES)}"),
+        post("emotion_log", "/api/emotion/log",
+             lambda i, rng: {"emotion": rng.choice(EMOTIONS), "intensity": rng.random(), "user_id": user(i)}),
+        get("emotion_view", static("/api/emotion/view")),
+        post("memory_log", "/api/memory/memory/log",
+             lambda i, rng: {"event_type": "trial", "tags": [rng.choice(VIRTUES)],
+                             "emotion": rng.choice(EMOTIONS), "insight": "bench"}),
+        post("humor_analyze", "/api/humor/humor/analyze", lambda i, rng: {"content": rng.choice(JOKES)}),
+        post("humor_batch", "/api/humor/batch", lambda i, rng: {"contents": [rng.choice(JOKES) for _ in range(20)]}),
+        post("openai_echo", "/api/openai/echo", lambda i, rng: {"prompt": f"What is {rng.choice(VIRTUES)}?"}),
+        # Distinct prompts, so every request streams from upstream instead of the cache
+        post("openai_echo_stream", "/api/openai/echo/stream",
+             lambda i, rng: {"prompt": f"What is {rng.choice(VIRTUES)} #{i}?"}),
+        get("metrics", static("/metrics")),
+    ]
+
+
+def check_coverage(app, catalogue):
+    """
+    Returns url rules that the catalogue does not exercise.
+    """
+    covered = {factory(0, random.Random(0)).split("?")[0] for _, _, factory, _ in catalogue}
+    missing = []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == "static":
+            continue
+        if rule.arguments:
+            prefix = rule.rule.split("<")[0]
+            if not any(path.startswith(prefix) and path != prefix.rstrip("/") for path in covered):
+                missing.append(rule.rule)
+        elif rule.rule not in covered:
+            missing.append(rule.rule)
+    return missing
+
+
+# -----------------------------------------------------------------------------
+# Drivers
+# -----------------------------------------------------------------------------
+def _rss_mb():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2 ** 20
+    # Peak RSS; kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def summarize(latencies, elapsed, errors):
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(_percentile(ordered, 50), 3),
+        "p95_ms": round(_percentile(ordered, 95), 3),
+        "p99_ms": round(_percentile(ordered, 99), 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None
+    }
+
+
+def run_client(app, catalogue, count, seed):
+    client = app.test_client()
+    results = {}
+    for name, method, path_factory, body_factory in catalogue:
+        rng = random.Random(f"{seed}:{name}")
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        for i in range(count):
+            path = path_factory(i, rng)
+            body = body_factory(i, rng) if body_factory else None
+            t0 = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            # Drain streamed bodies so timing covers the whole response
+            response.get_data()
+            latencies.append((time.perf_counter() - t0) * 1000)
+            errors += response.status_code >= 400
+        results[name] = summarize(latencies, time.perf_counter() - started, errors)
+    return results
+
+
+def run_server(app, catalogue, count, seed, concurrency):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    def call(method, path, body):
+        conn = HTTPConnection("127.0.0.1", port, timeout=30)
+        try:
+            payload = json.dumps(body).encode("utf-8") if body is not None else None
+            headers = {"Content-Type": "application/json"} if payload else {}
+            t0 = time.perf_counter()
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            return (time.perf_counter() - t0) * 1000, response.status >= 400
+        finally:
+            conn.close()
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for name, method, path_factory, body_factory in catalogue:
+                rng = random.Random(f"{seed}:{name}")
+                requests = [
+                    (method, path_factory(i, rng), body_factory(i, rng) if body_factory else None)
+                    for i in range(count)
+                ]
+                started = time.perf_counter()
+                outcomes = list(pool.map(lambda r: call(*r), requests))
+                elapsed = time.perf_counter() - started
+                results[name] = summarize(
+                    [latency for latency, _ in outcomes], elapsed, sum(failed for _, failed in outcomes)
+                )
+    finally:
+        server.shutdown()
+    return results
+
+
+# -----------------------------------------------------------------------------
+# Baseline comparison
+# -----------------------------------------------------------------------------
+def compare(report, baseline, tolerance):
+    """
+    Returns:
+        list[str]: One line per regressed (mode, route, metric)
+    """
+    regressions = []
+    for mode, data in report["modes"].items():
+        base_routes = baseline.get("modes", {}).get(mode, {}).get("routes", {})
+        for name, current in data["routes"].items():
+            base = base_routes.get(name)
+            if not base:
+                continue
+            if base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{mode}/{name}: p95 {current['p95_ms']} ms vs baseline {base['p95_ms']} ms")
+            if base["throughput_rps"] and current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{mode}/{name}: throughput {current['throughput_rps']} rps vs baseline {base['throughput_rps']} rps"
+                )
+            if current["errors"] > base.get("errors", 0):
+                regressions.append(f"{mode}/{name}: {current['errors']} errors vs baseline {base.get('errors', 0)}")
+    return regressions
+
+
+def print_report(report):
+    for mode, data in report["modes"].items():
+        print(f"\n[{mode}]  RSS {data['rss_start_mb']:.1f} -> {data['rss_end_mb']:.1f} MB "
+              f"(+{data['rss_growth_mb']:.1f} MB)")
+        print(f"{'route':<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>12}{'errors':>8}")
+        for name, r in data["routes"].items():
+            print(f"{name:<28}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+                  f"{r['throughput_rps']:>12,.1f}{r['errors']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP benchmark suite for every registered route")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per route per mode")
+    parser.add_argument("--mode", choices=["client", "server", "both"], default="both")
+    parser.add_argument("--concurrency", type=int, default=4, help="Client threads in server mode")
+    parser.add_argument("--seed", type=int, default=1234, help="Payload RNG seed")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--output", help="Also write this run's report to a JSON file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="aurathent-bench-")
+    with FakeOpenAIServer() as fake_openai:
+        os.environ["OPENAI_BASE_URL"] = fake_openai.base_url
+        app, pool = build_app(workdir)
+        catalogue = route_catalogue()
+
+        missing = check_coverage(app, catalogue)
+        if missing:
+            print(f"Warning: routes not exercised by the suite: {', '.join(missing)}")
+
+        modes = ["client", "server"] if args.mode == "both" else [args.mode]
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests_per_route": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "modes": {}
+        }
+        for mode in modes:
+            rss_start = _rss_mb()
+            if mode == "client":
+                routes = run_client(app, catalogue, args.requests, args.seed)
+            else:
+                routes = run_server(app, catalogue, args.requests, args.seed, args.concurrency)
+            rss_end = _rss_mb()
+            report["modes"][mode] = {
+                "rss_start_mb": round(rss_start, 1),
+                "rss_end_mb": round(rss_end, 1),
+                "rss_growth_mb": round(rss_end - rss_start, 1),
+                "routes": routes
+            }
+
+    report["postgres_checkouts"] = pool.checkouts
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%} of baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.tolerance:.0%} of baseline.")
+
+
+if __name__ == "__main__":
+    main()
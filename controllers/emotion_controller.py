@@ -16,6 +16,8 @@ Purpose:
     - Render symbolic emotion states via Jinja (for prototype testing)
 """
 
+import math
+
 from flask import Blueprint, request, jsonify, render_template
 from utils.chrono_synth import log_emotion_event
 
@@ -28,31 +30,41 @@ def log_emotion():
     Payload:
         {
             "emotion": "joy",
-            "intensity": 1.5
+            "intensity": 1.5,
+            "user_id": optional str
         }
     Returns:
         {
             "status": "logged",
             "emotion": "joy",
             "intensity": 1.5,
-            "chrono_reference": "2025-05-25T12:34:56"
+            "chrono_reference": "2025-05-25T12:34:56",
+            "loop_state": "Reactive" | "Contemplative" | null
         }
     """
     try:
         data = request.get_json(force=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "Expected a JSON object"}), 400
         emotion = data.get('emotion')
         intensity = data.get('intensity', 1.0)
+        user_id = data.get('user_id', 'default_user')
 
         if not emotion:
             return jsonify({"error": "Missing emotion type"}), 400
+        if not isinstance(emotion, str) or not emotion.strip():
+            return jsonify({"error": "Emotion must be a non-empty string"}), 400
+        if isinstance(intensity, bool) or not isinstance(intensity, (int, float)) or not math.isfinite(intensity):
+            return jsonify({"error": "Intensity must be a finite number"}), 400
 
-        log_result = log_emotion_event(emotion, intensity)
+        log_result = log_emotion_event(emotion, intensity, user_id)
 
         return jsonify({
             "status": "logged",
             "emotion": emotion,
             "intensity": intensity,
-            "chrono_reference": log_result.get("timestamp")
+            "chrono_reference": log_result.get("timestamp"),
+            "loop_state": log_result.get("loop_state")
         }), 200
 
     except Exception as e:
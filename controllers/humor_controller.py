@@ -13,6 +13,7 @@ Purpose:
     - Pass input through the Laughter Filter engine
     - Log authenticity and paradox resolution strength
     - Return a “Humor Index” to aid perception training and symbolic resonance
+    - Score many texts in a single batch request
 
 Symbolic Tie-In:
     - Laughing reflects cognitive transcendence (Davidic Eye Level 5 logic)
@@ -25,6 +26,19 @@ from utils.laughter_filter import validate_humor_paradox, validate_humor_signal
 
 humor_bp = Blueprint('humor', __name__)
 
+# Upper bound on texts accepted by a single /batch request
+MAX_BATCH_SIZE = 1000
+
+
+def _analysis(content, result):
+    return {
+        "status": "analyzed",
+        "original": content,
+        "humor_index": result.get("humor_index"),
+        "decoded_meaning": result.get("meaning"),
+        "paradox_resolved": result.get("paradox_resolved")
+    }
+
 @humor_bp.route('/humor/analyze', methods=['POST'])
 def analyze_humor():
     """
@@ -48,12 +62,43 @@ def analyze_humor():
         # Run the content through the paradox detector
         result = validate_humor_paradox(content)
 
+        return jsonify(_analysis(content, result)), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@humor_bp.route('/batch', methods=['POST'])
+def analyze_humor_batch():
+    """
+    Endpoint: /batch
+    Accepts JSON: { "contents": [str, ...] }
+    Returns: {
+        "status": "analyzed",
+        "count": int,
+        "results": [ <same body as /humor/analyze>, ... ]   # input order
+    }
+    """
+    try:
+        data = request.get_json(force=True)
+        contents = data.get("contents") if isinstance(data, dict) else None
+
+        if not isinstance(contents, list) or not contents:
+            return jsonify({"error": "Missing contents list"}), 400
+
+        if len(contents) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"Batch exceeds {MAX_BATCH_SIZE} items"}), 400
+
+        for index, content in enumerate(contents):
+            if not isinstance(content, str) or not content:
+                return jsonify({"error": f"Missing humor content at index {index}"}), 400
+
+        results = [_analysis(content, validate_humor_paradox(content)) for content in contents]
+
         return jsonify({
             "status": "analyzed",
-            "original": content,
-            "humor_index": result.get("humor_index"),
-            "decoded_meaning": result.get("meaning"),
-            "paradox_resolved": result.get("paradox_resolved")
+            "count": len(results),
+            "results": results
         }), 200
 
     except Exception as e:
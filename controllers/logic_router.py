@@ -20,6 +20,7 @@ from utils.phoenix_eye import detect_aura_shift
 from utils.izumi_izanagi_gate import resolve_paradox_chain
 from utils.wheat_binder import bind_hope_chain  # <--- matches actual function name
 from models.query_log import log_query
+from utils.metrics import stage_timer
 
 logic_bp = Blueprint('logic', __name__)
 
@@ -52,28 +53,33 @@ def process_logic_flow():
             return jsonify({"error": "Missing virtue or emotion input"}), 400
 
         # A) Transmute into symbolic mana
-        mana = convert_experience_to_mana(emotion, virtue)
+        with stage_timer("logic", "mana"):
+            mana = convert_experience_to_mana(emotion, virtue)
 
         # B) Analyze aura shift
-        aura_result = detect_aura_shift(mana, memory_tag)
+        with stage_timer("logic", "aura"):
+            aura_result = detect_aura_shift(mana, memory_tag)
 
         # C) Detect paradox (Izanagi/Izanami layer)
-        insight = resolve_paradox_chain(virtue, emotion)
+        with stage_timer("logic", "paradox"):
+            insight = resolve_paradox_chain(virtue, emotion)
 
         # D) Attempt to bind hope (Wheat logic)
-        memory_binding = bind_hope_chain(emotion, virtue, fatigue_level=3)
+        with stage_timer("logic", "hope"):
+            memory_binding = bind_hope_chain(emotion, virtue, fatigue_level=3)
 
         # E) Log everything to the system memory
-        log_query(
-            user_id="default_user",
-            event_type="logic_process",
-            payload={
-                "virtue": virtue,
-                "emotion": emotion,
-                "memory_tag": memory_tag,
-                "aura": aura_result
-            }
-        )
+        with stage_timer("logic", "log"):
+            log_query(
+                user_id="default_user",
+                event_type="logic_process",
+                payload={
+                    "virtue": virtue,
+                    "emotion": emotion,
+                    "memory_tag": memory_tag,
+                    "aura": aura_result
+                }
+            )
 
         return jsonify({
             "mana": mana,
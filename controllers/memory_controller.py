@@ -14,6 +14,8 @@ Purpose:
     - Optionally trigger memory echoes if thresholds are crossed
 """
 
+import math
+
 from flask import Blueprint, request, jsonify
 from utils.chrono_synth import process_memory_input
 from models.symbolic_memory import save_memory_log
@@ -48,6 +50,10 @@ def log_memory():
 
         if not event_type or not tags:
             return jsonify({"error": "Missing required memory event fields"}), 400
+        if not isinstance(emotion, str):
+            return jsonify({"error": "Emotion must be a string"}), 400
+        if isinstance(intensity, bool) or not isinstance(intensity, (int, float)) or not math.isfinite(intensity):
+            return jsonify({"error": "Intensity must be a finite number"}), 400
 
         # 1) Sync into ChronoSynth timeline
         chrono_result = process_memory_input(
@@ -8,19 +8,80 @@ Date: 2025-05-25
 
 Purpose:
     - Accept user prompts (symbolic, emotional, philosophical, etc.)
-    - Forward them to OpenAI for completion
+    - Forward them to OpenAI for completion through utils/openai_gateway.py
     - Return the structured response for rendering or insight logging
+    - Serve repeated prompts from the completion cache (utils/completion_cache.py)
+    - Stream completions token by token as Server-Sent Events (/echo/stream)
+    - While the upstream circuit breaker is open, answer with the cached reply
+      to the most similar prompt, or fail fast with 503
+
+Configuration (environment):
+    ECHO_FALLBACK_MIN_SIMILARITY   word overlap (0-1) a cached prompt needs to be
+                                   served as a fallback (default: 0.5)
 """
 
-from flask import Blueprint, request, jsonify
-from openai import OpenAI
+import json
 import os
 
+from flask import Blueprint, Response, request, jsonify
+
+from models.query_log import log_event
+from utils.completion_cache import completion_key, get_completion_cache
+from utils.circuit_breaker import CircuitOpen
+from utils.openai_gateway import GatewayBusy, chat_completion, stream_chat_completion, upstream_breaker
+
 # Initialize Blueprint
 openai_bp = Blueprint('openai', __name__)
 
-# Use OpenAI client with key from environment
-client = OpenAI(api_key=os.getenv("OPENAI_KEY"))
+# Echo completion parameters; all of them are part of the cache key
+ECHO_MODEL = "gpt-3.5-turbo"
+ECHO_TEMPERATURE = 0.7
+ECHO_MAX_TOKENS = 200
+
+ECHO_FALLBACK_MIN_SIMILARITY = float(os.getenv("ECHO_FALLBACK_MIN_SIMILARITY", 0.5))
+
+
+def _echo_messages(prompt):
+    return [{ "role": "user", "content": prompt }]
+
+
+def _log_echo(prompt, reply, cached, streamed, fallback=False):
+    log_event("openai_echo", {
+        "prompt": prompt,
+        "response": reply,
+        "cached": cached,
+        "streamed": streamed,
+        "fallback": fallback
+    })
+
+
+def _find_fallback(prompt, cache):
+    """
+    Looks up the cached reply to the most similar prompt for a shed request.
+
+    Returns:
+        tuple | None: (reply, {"prompt": ..., "similarity": ...}), or None
+    """
+    match = cache.most_similar(prompt, ECHO_FALLBACK_MIN_SIMILARITY) if cache is not None else None
+    if match is None:
+        upstream_breaker.shed("rejected")
+        return None
+    upstream_breaker.shed("fallback")
+    reply, similar_prompt, score = match
+    return reply, {"prompt": similar_prompt, "similarity": round(score, 3)}
+
+
+def _unavailable(error):
+    retry_after = str(int(upstream_breaker.policy.open_seconds))
+    return jsonify({"status": "unavailable", "message": str(error)}), 503, {"Retry-After": retry_after}
+
+
+def _sse(payload, event=None):
+    """
+    Formats one Server-Sent Event; data is a single JSON line.
+    """
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(payload)}\n\n"
 
 @openai_bp.route('/echo', methods=['POST'])
 def openai_echo():
@@ -34,8 +95,11 @@ def openai_echo():
         {
             "status": "ok",
             "prompt": "What is awe?",
-            "response": "Awe is the feeling of..."
+            "response": "Awe is the feeling of...",
+            "cached": false
         }
+        While the upstream breaker is open, a similar cached reply is returned
+        with "fallback": {"prompt": ..., "similarity": ...}, or 503 if none is close.
     """
     try:
         data = request.get_json(force=True)
@@ -44,24 +108,145 @@ def openai_echo():
         if not prompt:
             return jsonify({"error": "Missing prompt."}), 400
 
-        # Generate completion (OpenAI v1+ syntax)
-        completion = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{ "role": "user", "content": prompt }],
-            temperature=0.7,
-            max_tokens=200
-        )
+        cache = get_completion_cache()
+        key = completion_key(ECHO_MODEL, prompt, ECHO_TEMPERATURE, ECHO_MAX_TOKENS)
+        reply = cache.get(key) if cache is not None else None
+        cached = reply is not None
 
-        reply = completion.choices[0].message.content
+        if not cached:
+            # Shared client; identical concurrent prompts share one upstream call
+            try:
+                reply = chat_completion(
+                    ECHO_MODEL,
+                    _echo_messages(prompt),
+                    caller="echo",
+                    temperature=ECHO_TEMPERATURE,
+                    max_tokens=ECHO_MAX_TOKENS
+                )
+            except CircuitOpen as e:
+                fallback = _find_fallback(prompt, cache)
+                if fallback is None:
+                    return _unavailable(e)
+                reply, source = fallback
+                _log_echo(prompt, reply, cached=True, streamed=False, fallback=True)
+                return jsonify({
+                    "status": "ok",
+                    "prompt": prompt,
+                    "response": reply,
+                    "cached": True,
+                    "fallback": source
+                })
+            if cache is not None and reply is not None:
+                cache.put(key, reply, prompt=prompt)
+
+        _log_echo(prompt, reply, cached, streamed=False)
 
         return jsonify({
             "status": "ok",
             "prompt": prompt,
-            "response": reply
+            "response": reply,
+            "cached": cached
         })
 
+    except GatewayBusy as e:
+        return jsonify({
+            "status": "busy",
+            "message": str(e)
+        }), 503, {"Retry-After": "1"}
+
     except Exception as e:
         return jsonify({
             "status": "error",
             "message": str(e)
         }), 500
+
+
+@openai_bp.route('/echo/stream', methods=['GET', 'POST'])
+def openai_echo_stream():
+    """
+    GET  /api/openai/echo/stream?prompt=What+is+awe%3F   (EventSource)
+    POST /api/openai/echo/stream  {"prompt": "What is awe?"}
+
+    Returns:
+        text/event-stream of
+            data: {"delta": "Awe is"}
+            data: {"delta": " the feeling of..."}
+            event: done
+            data: {"status": "ok", "cached": false}
+        (a breaker fallback adds "fallback": {"prompt": ..., "similarity": ...} to done)
+        or, if the upstream call fails mid-stream,
+            event: error
+            data: {"status": "error", "message": "..."}
+
+    Deltas are forwarded as they arrive; the assembled reply is cached and
+    logged once the stream completes. A cached prompt is sent as one delta.
+    HEAD returns the headers only, without calling upstream.
+    """
+    if request.method == "HEAD":
+        return Response(mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    data = request.get_json(silent=True) or {}
+    prompt = (data.get("prompt") or request.args.get("prompt") or "").strip()
+
+    if not prompt:
+        return jsonify({"error": "Missing prompt."}), 400
+
+    cache = get_completion_cache()
+    key = completion_key(ECHO_MODEL, prompt, ECHO_TEMPERATURE, ECHO_MAX_TOKENS)
+    cached_reply = cache.get(key) if cache is not None else None
+
+    deltas = None
+    done = {"status": "ok", "cached": True}
+    if cached_reply is None:
+        try:
+            deltas = stream_chat_completion(
+                ECHO_MODEL,
+                _echo_messages(prompt),
+                caller="echo_stream",
+                temperature=ECHO_TEMPERATURE,
+                max_tokens=ECHO_MAX_TOKENS
+            )
+        except CircuitOpen as e:
+            fallback = _find_fallback(prompt, cache)
+            if fallback is None:
+                return _unavailable(e)
+            cached_reply, done["fallback"] = fallback
+        except GatewayBusy as e:
+            return jsonify({"status": "busy", "message": str(e)}), 503, {"Retry-After": "1"}
+        except Exception as e:
+            return jsonify({"status": "error", "message": str(e)}), 500
+
+    if deltas is None:
+        _log_echo(prompt, cached_reply, cached=True, streamed=True, fallback="fallback" in done)
+        events = iter([_sse({"delta": cached_reply}), _sse(done, event="done")])
+    else:
+        def relay():
+            parts = []
+            try:
+                for delta in deltas:
+                    parts.append(delta)
+                    yield _sse({"delta": delta})
+            except Exception as e:
+                yield _sse({"status": "error", "message": str(e)}, event="error")
+                return
+            finally:
+                # Also runs when the client disconnects mid-stream
+                deltas.close()
+
+            reply = "".join(parts)
+            if cache is not None:
+                cache.put(key, reply, prompt=prompt)
+            _log_echo(prompt, reply, cached=False, streamed=True)
+            yield _sse({"status": "ok", "cached": False}, event="done")
+
+        events = relay()
+
+    response = Response(events, mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+    if deltas is not None:
+        # A body that is never iterated never runs relay()'s finally; the
+        # server closes every response, so this always frees the upstream slot
+        response.call_on_close(deltas.close)
+    return response
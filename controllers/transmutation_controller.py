@@ -14,15 +14,20 @@ Purpose:
     - Validate and log emotion/virtue combo
     - Pass inputs through the symbolic engine (mana + phoenix_eye + lapis_index)
     - Return structured symbolic output (e.g., aura state, illusion level)
+    - Score bulk emotion/virtue pairs in a single batch request
 """
 
 from flask import Blueprint, request, jsonify
-from utils.mana_converter import convert_experience_to_mana
-from utils.phoenix_eye import detect_aura_shift
+from utils.mana_converter import convert_experience_to_mana, convert_experiences_to_mana
+from utils.phoenix_eye import detect_aura_shift, detect_aura_shifts
 from utils.lapis_index import trigger_lapis_event
+from utils.metrics import stage_timer
 
 transmutation_bp = Blueprint('transmutation', __name__)
 
+# Upper bound on pairs accepted by a single /batch request
+MAX_BATCH_SIZE = 1000
+
 @transmutation_bp.route('/transmute', methods=['POST'])
 def transmute():
     """
@@ -45,13 +50,16 @@ def transmute():
             return jsonify({"error": "Missing emotion or virtue input"}), 400
 
         # 1) Convert raw inputs into a mana score
-        mana = convert_experience_to_mana(emotion, virtue)
+        with stage_timer("transmute", "mana"):
+            mana = convert_experience_to_mana(emotion, virtue)
 
         # 2) Detect any shift in aura based on mana + memory context
-        aura_result = detect_aura_shift(mana, memory_tag)
+        with stage_timer("transmute", "aura"):
+            aura_result = detect_aura_shift(mana, memory_tag)
 
         # 3) Possibly trigger a divine (lapis) event from virtue + memory
-        divine_trigger = trigger_lapis_event(virtue, memory_tag)
+        with stage_timer("transmute", "lapis"):
+            divine_trigger = trigger_lapis_event(virtue, memory_tag)
 
         return jsonify({
             "status": "success",
@@ -64,3 +72,76 @@ def transmute():
         # Catch-all for unexpected failures
         return jsonify({"error": str(e)}), 500
 
+
+@transmutation_bp.route('/batch', methods=['POST'])
+def transmute_batch():
+    """
+    Endpoint: /batch
+    Accepts JSON: {
+        "items": [
+            { "emotion": str, "virtue": str, "memory": optional str },
+            ...
+        ]
+    }
+    Returns: {
+        "status": "success",
+        "count": int,
+        "results": [ <same body as /transmute>, ... ]   # input order
+    }
+    """
+    try:
+        data = request.get_json(force=True)
+        items = data.get('items') if isinstance(data, dict) else None
+
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "Missing items list"}), 400
+
+        if len(items) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"Batch exceeds {MAX_BATCH_SIZE} items"}), 400
+
+        emotions, virtues, memory_tags = [], [], []
+        for index, item in enumerate(items):
+            emotion = item.get('emotion') if isinstance(item, dict) else None
+            virtue  = item.get('virtue') if isinstance(item, dict) else None
+
+            if not isinstance(emotion, str) or not isinstance(virtue, str) or not emotion or not virtue:
+                return jsonify({"error": f"Missing emotion or virtue input at index {index}"}), 400
+
+            emotions.append(emotion)
+            virtues.append(virtue)
+            memory_tags.append(item.get('memory'))
+
+        # 1) Score every pair in one vectorized pass
+        with stage_timer("transmute_batch", "mana"):
+            manas = convert_experiences_to_mana(emotions, virtues)
+
+        # 2) Tier all mana values against the aura cut-offs at once
+        with stage_timer("transmute_batch", "aura"):
+            aura_results = detect_aura_shifts(manas, memory_tags)
+
+        # 3) Lapis triggers stay per pair (set membership on the virtue)
+        with stage_timer("transmute_batch", "lapis"):
+            lapis_results = [
+                trigger_lapis_event(virtue, memory_tag)
+                for virtue, memory_tag in zip(virtues, memory_tags)
+            ]
+
+        results = [
+            {
+                "status": "success",
+                "mana": mana,
+                "aura_result": aura_result,
+                "lapis_triggered": lapis_triggered
+            }
+            for mana, aura_result, lapis_triggered
+            in zip(manas.tolist(), aura_results, lapis_results)
+        ]
+
+        return jsonify({
+            "status": "success",
+            "count": len(results),
+            "results": results
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -13,15 +13,20 @@ Purpose:
     - Updates symbolic virtue vessel for the user (growth, rank, aura)
     - Triggers evolutionary class state if thresholds crossed
     - Interfaces with legacy scroll tree to guide next steps
+    - Serves top-K virtue leaderboards, overall and per virtue
 """
 
 from flask import Blueprint, request, jsonify
 from models.virtue_profile import update_virtue_affinity
+from models.virtue_leaderboard import top_users
 from utils.phoenix_eye import detect_aura_shift
 from legacy.scroll_tree import get_scroll_path
 
 virtue_vessel_bp = Blueprint('virtue_vessel', __name__)
 
+# Largest page a leaderboard request may ask for
+MAX_LEADERBOARD_LIMIT = 100
+
 @virtue_vessel_bp.route('/virtue/update', methods=['POST'])
 def update_vessel():
     """
@@ -31,7 +36,8 @@ def update_vessel():
         "status": "vessel_updated",
         "updated_profile": dict,
         "aura": dict,
-        "scroll_path": list
+        "scroll_path": list,
+        "evolution": dict | null    # set when a VIRTUE_THRESHOLDS stage is crossed
     }
     """
     try:
@@ -44,6 +50,7 @@ def update_vessel():
 
         # 1) Grow or rank the user's virtue affinity
         new_profile = update_virtue_affinity(user_id, virtue)
+        evolution = new_profile.pop('evolution')
 
         # 2) Re-evaluate their aura given updated score
         aura = detect_aura_shift(new_profile['score'], virtue)
@@ -55,9 +62,47 @@ def update_vessel():
             "status": "vessel_updated",
             "updated_profile": new_profile,
             "aura": aura,
-            "scroll_path": scroll_path
+            "scroll_path": scroll_path,
+            "evolution": evolution
         }), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+
+@virtue_vessel_bp.route('/virtue/leaderboard', methods=['GET'])
+@virtue_vessel_bp.route('/virtue/leaderboard/<virtue>', methods=['GET'])
+def virtue_leaderboard(virtue=None):
+    """
+    Endpoint: /virtue/leaderboard[/<virtue>]
+    Query: ?limit=10&cursor=<next_cursor from the previous page>
+    Returns: {
+        "status": "ok",
+        "virtue": str | null,
+        "entries": [{ "user_id": str, "score": int }, ...],
+        "next_cursor": str | null
+    }
+    """
+    try:
+        try:
+            limit = int(request.args.get('limit', 10))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+
+        if not 1 <= limit <= MAX_LEADERBOARD_LIMIT:
+            return jsonify({"error": f"limit must be between 1 and {MAX_LEADERBOARD_LIMIT}"}), 400
+
+        try:
+            page = top_users(limit, request.args.get('cursor'), virtue)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify({
+            "status": "ok",
+            "virtue": virtue,
+            "entries": page["entries"],
+            "next_cursor": page["next_cursor"]
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -11,12 +11,15 @@ Purpose:
 """
 
 import os
+import time
 from dotenv import load_dotenv
 from flask_pymongo import PyMongo
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from psycopg2.pool import ThreadedConnectionPool
 
+from utils.metrics import pool_wait, pool_checkout_failures
+
 # Load .env from project root
 load_dotenv()
 
@@ -81,9 +84,13 @@ def get_postgres_connection():
     if _pg_pool is None:
         # Lazy-init with default sizes if not already done
         init_postgres_pool()
+    start = time.perf_counter()
     try:
-        return _pg_pool.getconn()
+        conn = _pg_pool.getconn()
+        pool_wait.observe(time.perf_counter() - start)
+        return conn
     except Exception as e:
+        pool_checkout_failures.inc()
         print(f"[PostgreSQL] Failed to get connection from pool: {e}")
         return None
 
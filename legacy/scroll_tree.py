@@ -8,14 +8,24 @@ Author: Khaylub Thompson-Calvin
 Purpose:
     - Based on user virtue history, return scroll evolution path
     - Reads from symbolic scroll structure stored in JSON
+    - Caches a precompiled (user_id, virtue) index, reloaded only when the file changes
 """
 
 import json
 import os
+import threading
+from functools import lru_cache
 
 # Absolute path to the scroll_tree.json file
 SCROLL_TREE_PATH = os.path.join(os.path.dirname(__file__), "scroll_tree.json")
 
+# Key used in the compiled index for entries under "defaults"
+DEFAULTS_KEY = "defaults"
+
+# Process-wide cache: (mtime_ns, size) signature and the compiled index
+_cache = {"signature": None, "index": {}}
+_cache_lock = threading.Lock()
+
 def load_scroll_data():
     """
     Load scroll path data from scroll_tree.json.
@@ -30,6 +40,56 @@ def load_scroll_data():
         print(f"[scroll_tree] Error loading scroll data: {e}")
         return {}
 
+def compile_scroll_index(scroll_data):
+    """
+    Flatten the nested user -> virtue -> path tree into a single lookup table.
+
+    Args:
+        scroll_data (dict): Parsed scroll_tree.json content.
+
+    Returns:
+        dict: {(user_id, virtue): tuple(path)}; defaults live under DEFAULTS_KEY.
+    """
+    index = {}
+    for owner, virtues in scroll_data.items():
+        if not isinstance(virtues, dict):
+            continue
+        for virtue, path in virtues.items():
+            # Empty paths stay out of the index so lookups fall through, as before
+            if path:
+                index[(owner, virtue)] = tuple(path)
+    return index
+
+def get_scroll_index():
+    """
+    Return the compiled scroll index, re-reading the file only when its mtime or size changes.
+
+    Returns:
+        dict: The compiled (user_id, virtue) -> path index.
+    """
+    try:
+        stat = os.stat(SCROLL_TREE_PATH)
+        signature = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        signature = None
+
+    if signature == _cache["signature"] and signature is not None:
+        return _cache["index"]
+
+    with _cache_lock:
+        if signature != _cache["signature"] or signature is None:
+            # Swap in a fresh dict so concurrent readers never see a partial index
+            _cache["index"] = compile_scroll_index(load_scroll_data())
+            _cache["signature"] = signature
+        return _cache["index"]
+
+@lru_cache(maxsize=1024)
+def _fallback_path(virtue):
+    """
+    Shared immutable fallback path for virtues with no scroll entry.
+    """
+    return (f"{virtue}_init", f"{virtue}_path", f"{virtue}_trial")
+
 def get_scroll_path(user_id, virtue):
     """
     Get the scroll evolution path for a user and virtue.
@@ -39,12 +99,12 @@ def get_scroll_path(user_id, virtue):
         virtue (str): The virtue being evolved.
 
     Returns:
-        list: List of scroll path stages.
+        tuple: Scroll path stages (shared, read-only).
     """
-    scroll_data = load_scroll_data()
+    index = get_scroll_index()
 
     return (
-        scroll_data.get(user_id, {}).get(virtue) or
-        scroll_data.get("defaults", {}).get(virtue) or
-        [f"{virtue}_init", f"{virtue}_path", f"{virtue}_trial"]
+        index.get((user_id, virtue)) or
+        index.get((DEFAULTS_KEY, virtue)) or
+        _fallback_path(virtue)
     )
@@ -9,6 +9,7 @@ Purpose:
     - Interpret mana levels and virtue inputs into aura changes
     - Track symbolic aura states (e.g., lumina, void, prism, eclipse)
     - Trigger class evolution based on aura shifts and scroll history
+    - Keep aura history as run-length-encoded runs of interned state codes
 
 Aura States (Examples):
     - "neutral": Base state
@@ -18,25 +19,145 @@ Aura States (Examples):
     - "eclipse": Transformation under pressure (high mana + contradiction)
 """
 
+import time
+from array import array
+from datetime import datetime, timezone
+
+from models.vocabulary import UNINTERNED, SymbolId, decode, intern
+
+
+class AuraRuns:
+    """
+    Run-length-encoded aura history: one (state_code, count, first_ts, last_ts)
+    run per stretch of identical consecutive states, held in typed arrays.
+    State codes are ids from the shared vocabulary, or UNINTERNED with the
+    spelling kept in `raw_states` once the vocabulary is full.
+    """
+
+    __slots__ = ("codes", "raw_states", "counts", "first_ts", "last_ts")
+
+    def __init__(self, state, now):
+        self.codes = array("I")
+        self.raw_states = {}
+        self.counts = array("I")
+        self.first_ts = array("d")
+        self.last_ts = array("d")
+        self._start_run(intern(state), now)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def observe(self, state, now):
+        code = intern(state)
+        if code == self._code(-1):
+            self.counts[-1] += 1
+            self.last_ts[-1] = now
+        else:
+            self._start_run(code, now)
+
+    def state(self, index):
+        return decode(self._code(index))
+
+    def current(self):
+        return self.state(-1)
+
+    def _code(self, index):
+        # The id, or the raw spelling for an UNINTERNED run
+        index %= len(self.codes)
+        code = self.codes[index]
+        return self.raw_states[index] if code == UNINTERNED else SymbolId(code)
+
+    def _start_run(self, code, now):
+        if isinstance(code, str):
+            self.raw_states[len(self.codes)] = code
+            code = UNINTERNED
+        self.codes.append(code)
+        self.counts.append(1)
+        self.first_ts.append(now)
+        self.last_ts.append(now)
+
+
+def _to_iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat()
+
+
 aura_registry = {}
 
 def initialize_aura(user_id):
     if user_id not in aura_registry:
-        aura_registry[user_id] = {
-            "current": "neutral",
-            "history": []
-        }
+        aura_registry[user_id] = AuraRuns("neutral", time.time())
 
 def update_aura(user_id, new_state):
     initialize_aura(user_id)
-    aura_registry[user_id]["history"].append(aura_registry[user_id]["current"])
-    aura_registry[user_id]["current"] = new_state
+    aura_registry[user_id].observe(new_state, time.time())
 
 def get_current_aura(user_id):
-    return aura_registry.get(user_id, {}).get("current", "neutral")
+    runs = aura_registry.get(user_id)
+    return runs.current() if runs else "neutral"
 
 def get_aura_history(user_id):
-    return aura_registry.get(user_id, {}).get("history", [])
+    """
+    Returns the run-length-encoded aura history, oldest run first.
+
+    Returns:
+        list[dict]: {"state", "count", "first_ts", "last_ts"} per run
+    """
+    runs = aura_registry.get(user_id)
+    if not runs:
+        return []
+    return [
+        {
+            "state": runs.state(i),
+            "count": count,
+            "first_ts": _to_iso(first),
+            "last_ts": _to_iso(last)
+        }
+        for i, (count, first, last) in enumerate(zip(runs.counts, runs.first_ts, runs.last_ts))
+    ]
+
+def get_time_in_states(user_id, now=None):
+    """
+    Sums the seconds spent in each aura state; a run lasts until the next one starts.
+
+    Args:
+        user_id (str): The user's unique identifier
+        now (float, optional): Epoch seconds closing the current run (defaults to now)
+
+    Returns:
+        dict: {state: seconds}
+    """
+    runs = aura_registry.get(user_id)
+    if not runs:
+        return {}
+
+    now = time.time() if now is None else now
+    ends = list(runs.first_ts[1:]) + [now]
+    totals = {}
+    for i, (start, end) in enumerate(zip(runs.first_ts, ends)):
+        state = runs.state(i)
+        totals[state] = totals.get(state, 0.0) + max(0.0, end - start)
+    return totals
+
+def get_recent_transitions(user_id, limit=5):
+    """
+    Returns the last state changes, newest first.
+
+    Returns:
+        list[dict]: {"from", "to", "timestamp"} per transition
+    """
+    runs = aura_registry.get(user_id)
+    if not runs or limit <= 0:
+        return []
+
+    first = max(1, len(runs) - limit)
+    return [
+        {
+            "from": runs.state(i - 1),
+            "to": runs.state(i),
+            "timestamp": _to_iso(runs.first_ts[i])
+        }
+        for i in range(len(runs) - 1, first - 1, -1)
+    ]
 
 def infer_aura(mana_level, virtue, modifiers=None):
     """
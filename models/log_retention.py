@@ -0,0 +1,265 @@
+"""
+log_retention.py
+-----------------
+Bounded, ring-buffered storage behind the symbolic query logs.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Cap in-memory events per user and for the shared "system" key
+    - Expire events older than a configured age
+    - Evict overflow into a compact gzip NDJSON archive on disk
+    - Page transparently across archived and in-memory events
+    - Count evicted, expired, archived and retained events
+
+Configuration (environment, read by RetentionPolicy.from_env):
+    QUERY_LOG_USER_CAP      in-memory events kept per user (default: 1000)
+    QUERY_LOG_SYSTEM_CAP    in-memory events kept for "system" (default: 10000)
+    QUERY_LOG_MAX_AGE       seconds before an event expires (default: no expiry)
+    QUERY_LOG_ARCHIVE_DIR   directory for evicted events (default: discard)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+
+SYSTEM_KEY = "system"
+
+
+class RetentionPolicy:
+    """
+    Caps and expiry settings for a RetainedLog.
+    """
+
+    def __init__(self, user_cap=1000, system_cap=10000, max_age_seconds=None,
+                 archive_dir=None, archive_batch=64):
+        """
+        Args:
+            user_cap (int): In-memory events kept per user
+            system_cap (int): In-memory events kept under the "system" key
+            max_age_seconds (float): Age after which events leave memory (None = never)
+            archive_dir (str): Where evicted events are written (None = discard)
+            archive_batch (int): Evicted events buffered per key before a disk write
+        """
+        self.user_cap = user_cap
+        self.system_cap = system_cap
+        self.max_age_seconds = max_age_seconds
+        self.archive_dir = archive_dir
+        self.archive_batch = archive_batch
+
+    @classmethod
+    def from_env(cls):
+        max_age = os.getenv("QUERY_LOG_MAX_AGE")
+        return cls(
+            user_cap=int(os.getenv("QUERY_LOG_USER_CAP", 1000)),
+            system_cap=int(os.getenv("QUERY_LOG_SYSTEM_CAP", 10000)),
+            max_age_seconds=float(max_age) if max_age else None,
+            archive_dir=os.getenv("QUERY_LOG_ARCHIVE_DIR") or None
+        )
+
+    def cap_for(self, key):
+        return self.system_cap if key == SYSTEM_KEY else self.user_cap
+
+
+class LogArchive:
+    """
+    Append-only gzip NDJSON files, one per log key.
+
+    Each append adds a gzip member, which gzip readers concatenate transparently.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._counts = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", key)[:64]
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.directory, f"{safe}-{digest}.ndjson.gz")
+
+    def append(self, key, events):
+        if not events:
+            return
+        payload = "".join(
+            json.dumps(e, separators=(",", ":"), default=str) + "\n" for e in events
+        )
+        with gzip.open(self._path(key), "at", encoding="utf-8") as f:
+            f.write(payload)
+        if key in self._counts:
+            self._counts[key] += len(events)
+
+    def count(self, key):
+        """
+        Number of archived events for a key (counted once, then tracked).
+        """
+        if key not in self._counts:
+            path = self._path(key)
+            total = 0
+            if os.path.exists(path):
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    total = sum(1 for _ in f)
+            self._counts[key] = total
+        return self._counts[key]
+
+    def read(self, key, offset=0, limit=None):
+        """
+        Yields archived events in write order, skipping `offset` of them.
+        """
+        path = self._path(key)
+        if not os.path.exists(path) or limit == 0:
+            return
+        emitted = 0
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for index, line in enumerate(f):
+                if index < offset:
+                    continue
+                yield json.loads(line)
+                emitted += 1
+                if limit is not None and emitted >= limit:
+                    return
+
+
+class RetainedLog:
+    """
+    Per-key ring buffers with age expiry and eviction to a LogArchive.
+
+    Appends are O(1): a full buffer evicts its oldest entry before accepting
+    the new one, and evicted entries are batched to disk.
+    """
+
+    def __init__(self, policy=None, decode=None):
+        """
+        Args:
+            policy (RetentionPolicy): Caps, expiry and archive settings
+            decode (callable, optional): Maps a stored event to its public form;
+                applied on reads and before events are archived
+        """
+        self.policy = policy or RetentionPolicy()
+        self.decode = decode
+        self.archive = LogArchive(self.policy.archive_dir) if self.policy.archive_dir else None
+        self._buffers = {}
+        self._pending = {}
+        self._lock = threading.RLock()
+        self._counters = {
+            "evicted": 0,
+            "expired": 0,
+            "archived": 0,
+            "archive_errors": 0
+        }
+
+    def __contains__(self, key):
+        return key in self._buffers
+
+    def keys(self):
+        return list(self._buffers.keys())
+
+    def append(self, key, event):
+        """
+        Stores an event under a key, evicting or expiring old entries as needed.
+        """
+        now = time.time()
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = deque()
+
+            self._expire(key, buffer, now)
+            if len(buffer) >= self.policy.cap_for(key):
+                self._evict(key, buffer.popleft()[1], "evicted")
+            buffer.append((now, event))
+        return event
+
+    def page(self, key, offset=0, limit=None):
+        """
+        Returns events oldest-first, spanning the archive and memory.
+
+        Args:
+            key (str): User ID or "system"
+            offset (int): Events to skip from the oldest
+            limit (int): Maximum events to return (None = all)
+
+        Returns:
+            list: Event dictionaries
+        """
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is not None:
+                self._expire(key, buffer, time.time())
+            self._flush_pending(key)
+            in_memory = [event for _, event in buffer] if buffer else []
+            archived = self.archive.count(key) if self.archive else 0
+
+        results = []
+        if offset < archived:
+            # Bounded by the snapshot count so concurrent evictions are not read twice
+            take = archived - offset if limit is None else min(limit, archived - offset)
+            results.extend(self.archive.read(key, offset, take))
+            offset = 0
+        else:
+            offset -= archived
+
+        remaining = None if limit is None else limit - len(results)
+        if remaining is None:
+            page = in_memory[offset:]
+        elif remaining > 0:
+            page = in_memory[offset:offset + remaining]
+        else:
+            page = []
+        if self.decode is not None:
+            page = [self.decode(event) for event in page]
+        results.extend(page)
+        return results
+
+    def stats(self):
+        """
+        Returns:
+            dict: Eviction counters and current retained totals
+        """
+        with self._lock:
+            snapshot = dict(self._counters)
+            snapshot["retained"] = sum(len(b) for b in self._buffers.values())
+            snapshot["keys"] = len(self._buffers)
+            snapshot["pending_archive"] = sum(len(p) for p in self._pending.values())
+        return snapshot
+
+    def flush(self):
+        """
+        Writes every buffered eviction to the archive.
+        """
+        with self._lock:
+            for key in list(self._pending):
+                self._flush_pending(key)
+
+    def _expire(self, key, buffer, now):
+        max_age = self.policy.max_age_seconds
+        if max_age is None:
+            return
+        cutoff = now - max_age
+        while buffer and buffer[0][0] < cutoff:
+            self._evict(key, buffer.popleft()[1], "expired")
+
+    def _evict(self, key, event, reason):
+        self._counters[reason] += 1
+        if self.archive is None:
+            return
+        pending = self._pending.setdefault(key, [])
+        pending.append(self.decode(event) if self.decode is not None else event)
+        if len(pending) >= self.policy.archive_batch:
+            self._flush_pending(key)
+
+    def _flush_pending(self, key):
+        pending = self._pending.pop(key, None)
+        if not pending or self.archive is None:
+            return
+        try:
+            self.archive.append(key, pending)
+            self._counters["archived"] += len(pending)
+        except OSError as e:
+            self._counters["archive_errors"] += 1
+            print(f"[log_retention] Archive write failed for {key}: {e}")
@@ -11,13 +11,31 @@ Purpose:
     - Retrieve historical transmutation patterns
     - Export logs for reflection, analytics, or class advancement
     - Provide a universal `log_event()` shim used by other modules
+    - Hand system events to the background event pipeline instead of printing inline
+    - Keep memory bounded through ring-buffer retention with an on-disk archive
+    - Store event types and symbolic payload fields as vocabulary ids
 """
 
+import atexit
 from datetime import datetime
-from typing import Union
+from typing import Optional, Union
 
-# In-memory structure for now; to be upgraded to Mongo/Postgres later
-query_logs = {}
+from models.log_retention import RetainedLog, RetentionPolicy, SYSTEM_KEY
+from models.vocabulary import intern, encode_fields, decode_fields
+from utils.event_pipeline import get_event_pipeline
+
+# Ring-buffered in-memory store; caps, expiry and archive come from QUERY_LOG_* env vars
+# Events are held with vocabulary ids and decoded on the way out
+query_logs = RetainedLog(RetentionPolicy.from_env(), decode=decode_fields)
+atexit.register(query_logs.flush)
+
+
+def _store(key: str, event: dict) -> None:
+    query_logs.append(key, {
+        "event": intern(event["event"]),
+        "timestamp": event["timestamp"],
+        "details": encode_fields(event["details"])
+    })
 
 
 def log_query(user_id: str, event_type: str, payload: dict) -> dict:
@@ -39,50 +57,57 @@ def log_query(user_id: str, event_type: str, payload: dict) -> dict:
         "details": payload
     }
 
-    if user_id not in query_logs:
-        query_logs[user_id] = []
-
-    query_logs[user_id].append(event)
+    _store(user_id, event)
     return event
 
 
-def get_logs(user_id: str) -> list:
+def get_logs(user_id: str, offset: int = 0, limit: Optional[int] = None) -> list:
     """
-    Retrieves all logs associated with a user.
+    Retrieves logs associated with a user, oldest first.
+
+    Archived (evicted) events are paged in ahead of those still in memory.
 
     Args:
         user_id (str): The user's unique identifier
+        offset (int): Number of events to skip from the oldest
+        limit (int, optional): Maximum number of events to return
 
     Returns:
         list: List of log dictionaries
     """
-    return query_logs.get(user_id, [])
+    return query_logs.page(user_id, offset, limit)
 
 
-def export_logs(user_id: str) -> list:
+def export_logs(user_id: str, offset: int = 0, limit: Optional[int] = None) -> list:
     """
     Returns logs in a structured, printable format.
 
     Args:
         user_id (str): The user's unique identifier
+        offset (int): Number of events to skip from the oldest
+        limit (int, optional): Maximum number of events to return
 
     Returns:
         list: List of human-readable strings summarizing the logs
     """
-    logs = get_logs(user_id)
+    logs = get_logs(user_id, offset, limit)
     return [
         f"{log['timestamp']} - [{log['event']}] → {log['details']}"
         for log in logs
     ]
 
 
-def log_event(module: str, detail: Union[str, dict]) -> dict:
+def log_event(module: str, detail: Union[str, dict], level: str = "info") -> dict:
     """
     Logs a general symbolic system event (not tied to user).
 
+    The event is stored in memory right away; sink output (stdout, file,
+    Postgres) is written later by the event pipeline's background writer.
+
     Args:
         module (str): Name of the system module (e.g., 'virtue', 'emotion', 'lapis_index')
         detail (str | dict): Human-readable or structured info
+        level (str): Severity used for pipeline filtering ('debug', 'info', 'warning', 'error')
 
     Returns:
         dict: The stored event object
@@ -94,9 +119,16 @@ def log_event(module: str, detail: Union[str, dict]) -> dict:
         "details": detail
     }
 
-    if "system" not in query_logs:
-        query_logs["system"] = []
-
-    query_logs["system"].append(event)
-    print(f"[LOG EVENT] {timestamp} :: [{module}] {detail}")
+    _store(SYSTEM_KEY, event)
+    get_event_pipeline().submit(event, level)
     return event
+
+
+def get_retention_stats() -> dict:
+    """
+    Reports retention counters for the query log store.
+
+    Returns:
+        dict: Evicted, expired, archived and retained event counts
+    """
+    return query_logs.stats()
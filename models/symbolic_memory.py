@@ -9,10 +9,11 @@ Purpose:
     - Preserve user memory triggers that affect aura or virtue shift
     - Enable lookup of related fragments during transmutation
     - Provide symbolic insight feedback across user sessions
+    - Answer recent, filtered and time-range queries from per-user indexes
 
 Structure:
     memory_store = {
-        "user_id": [
+        "user_id": MemoryTimeline([
             {
                 "emotion": "awe",
                 "virtue": "humility",
@@ -20,40 +21,162 @@ Structure:
                 "timestamp": "2025-05-25T10:10:10"
             },
             ...
-        ]
+        ])
     }
 """
 
-from datetime import datetime
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+
+from models.vocabulary import encode_fields, decode_fields, lookup, normalize
+
+
+class MemoryTimeline:
+    """
+    Time-ordered memory fragments for one user, with inverted indexes.
+
+    Entries stay sorted by timestamp as they are appended. The emotion,
+    virtue and (emotion, virtue) indexes hold (timestamp, sequence, entry)
+    keys in the same order, so recent and filtered lookups cost in proportion
+    to the result rather than the history, and a late arrival is insorted
+    into its own index lists without touching the rest.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.times = []
+        self.by_emotion = {}
+        self.by_virtue = {}
+        self.by_pair = {}
+        self._seq = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def append(self, entry):
+        ts = _to_epoch(entry.get("timestamp"))
+        # Ties on timestamp keep arrival order, like bisect_right on self.times
+        key = (ts, self._seq, entry)
+        self._seq += 1
+
+        if self.times and ts < self.times[-1]:
+            pos = bisect_right(self.times, ts)
+            self.times.insert(pos, ts)
+            self.entries.insert(pos, entry)
+            add = insort
+        else:
+            self.times.append(ts)
+            self.entries.append(entry)
+            add = list.append
+
+        emotion = entry.get("emotion")
+        virtue = entry.get("virtue")
+        add(self.by_emotion.setdefault(emotion, []), key)
+        add(self.by_virtue.setdefault(virtue, []), key)
+        add(self.by_pair.setdefault((emotion, virtue), []), key)
+        return entry
+
+    def recent(self, limit):
+        if limit <= 0:
+            return []
+        return self.entries[-limit:][::-1]
+
+    def filtered(self, emotion=None, virtue=None):
+        if emotion is None and virtue is None:
+            return list(self.entries)
+        if emotion is not None and virtue is not None:
+            keys = self.by_pair.get((emotion, virtue), ())
+        elif emotion is not None:
+            keys = self.by_emotion.get(emotion, ())
+        else:
+            keys = self.by_virtue.get(virtue, ())
+        return [key[2] for key in keys]
+
+    def between(self, start=None, end=None, offset=0, limit=None):
+        lo = 0 if start is None else bisect_left(self.times, _to_epoch(start))
+        hi = len(self.times) if end is None else bisect_left(self.times, _to_epoch(end))
+        lo = min(lo + offset, hi)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return self.entries[lo:hi]
+
+
+def _to_epoch(value):
+    """
+    Normalize an ISO string, datetime or epoch number to UTC epoch seconds.
+    """
+    if value is None:
+        return datetime.now(timezone.utc).timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        # Stored timestamps come from utcnow(), so naive values are UTC
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
 
 # In-memory database (for future persistent DB migration)
 memory_store = {}
+_store_lock = threading.Lock()
 
-def store_memory(user_id, emotion, virtue, note=""):
-    if user_id not in memory_store:
-        memory_store[user_id] = []
 
-    memory_store[user_id].append({
+def _timeline(user_id):
+    timeline = memory_store.get(user_id)
+    if timeline is None:
+        with _store_lock:
+            timeline = memory_store.setdefault(user_id, MemoryTimeline())
+    return timeline
+
+def store_memory(user_id, emotion, virtue, note=""):
+    entry = {
         "emotion": emotion,
         "virtue": virtue,
         "note": note,
         "timestamp": datetime.utcnow().isoformat()
-    })
+    }
+    timeline = _timeline(user_id)
+    with _store_lock:
+        timeline.append(encode_fields(entry))
     return True
 
 def fetch_recent_memories(user_id, limit=5):
-    memories = memory_store.get(user_id, [])
-    return sorted(memories, key=lambda x: x["timestamp"], reverse=True)[:limit]
+    timeline = memory_store.get(user_id)
+    return [decode_fields(m) for m in timeline.recent(limit)] if timeline else []
+
+def _index_key(value):
+    # Values that did not fit in the vocabulary were stored by their spelling
+    symbol_id = lookup(value)
+    return normalize(value) if symbol_id is None else symbol_id
 
 def fetch_by_emotion_virtue(user_id, emotion=None, virtue=None):
     if user_id not in memory_store:
         return []
 
-    return [
-        m for m in memory_store[user_id]
-        if (emotion is None or m["emotion"] == emotion) and
-           (virtue is None or m["virtue"] == virtue)
-    ]
+    emotion_id = None if emotion is None else _index_key(emotion)
+    virtue_id = None if virtue is None else _index_key(virtue)
+    return [decode_fields(m) for m in memory_store[user_id].filtered(emotion_id, virtue_id)]
+
+def fetch_memories_between(user_id, start=None, end=None, offset=0, limit=50):
+    """
+    Returns a page of memories with start <= timestamp < end, oldest first.
+
+    Args:
+        user_id (str): The user's unique identifier
+        start (str | datetime | float, optional): Inclusive lower bound
+        end (str | datetime | float, optional): Exclusive upper bound
+        offset (int): Matching entries to skip
+        limit (int, optional): Maximum entries to return
+
+    Returns:
+        list: Memory entries in time order
+    """
+    timeline = memory_store.get(user_id)
+    if not timeline:
+        return []
+    return [decode_fields(m) for m in timeline.between(start, end, offset, limit)]
 
 def save_memory_log(event_type, tags, emotion, intensity, insight, chrono_result):
     """
@@ -82,8 +205,8 @@ def save_memory_log(event_type, tags, emotion, intensity, insight, chrono_result
         "timestamp": chrono_result.get("timestamp")
     }
 
-    if user_id not in memory_store:
-        memory_store[user_id] = []
-
-    memory_store[user_id].append(memory_entry)
-    return memory_entry
+    stored = encode_fields(memory_entry)
+    timeline = _timeline(user_id)
+    with _store_lock:
+        timeline.append(stored)
+    return decode_fields(stored)
@@ -0,0 +1,328 @@
+"""
+transmutation_columns.py
+-------------------------
+Columnar in-memory store for transmutation history with NumPy analytics.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Keep one typed array per field instead of one dict per record
+    - Grow in fixed-size chunks so appends stay amortized O(1) with no copying
+    - Index rows per user so per-user reads touch only that user's rows
+    - Run tier histograms, mana percentiles and lapis rates as vectorized operations
+
+Columns:
+    ts            float64   epoch seconds (UTC)
+    mana          float64   mana rounded to 2 places
+    tier          int8      index into AURA_STATES (-1 = unknown)
+    emotion       uint32    vocabulary id (UNINTERNED = spelling kept in raw)
+    virtue        uint32    vocabulary id (UNINTERNED = spelling kept in raw)
+    memory        object    free-text memory reference, or None
+    class_shift   int8      1 / 0 (-1 = not reported)
+    lapis         int8      lapis "triggered" flag
+    virtue_match  int8      lapis "virtue_match" flag (-1 = lapis given as a bare bool)
+    amplified     int8      lapis "amplified_context" (1 / 0, -1 = None)
+    raw           object    None, or {"emotion": str, "virtue": str} for the
+                            fields that did not fit in a full vocabulary
+"""
+
+import threading
+from array import array
+
+import numpy as np
+
+from config.constants import AURA_STATES
+from models.vocabulary import UNINTERNED, intern, normalize, symbol
+
+COLUMNS = (
+    ("ts", np.float64),
+    ("mana", np.float64),
+    ("tier", np.int8),
+    ("emotion", np.uint32),
+    ("virtue", np.uint32),
+    ("memory", object),
+    ("class_shift", np.int8),
+    ("lapis", np.int8),
+    ("virtue_match", np.int8),
+    ("amplified", np.int8),
+    ("raw", object),
+)
+
+# Object columns hold references; tombstoned rows drop theirs
+_OBJECT_COLUMNS = tuple(name for name, dtype in COLUMNS if dtype is object)
+
+_TIER_CODES = {name: code for code, name in enumerate(AURA_STATES)}
+_TIER_NAMES = np.array(list(AURA_STATES) + ["None"], dtype=object)
+
+
+def _flag(value):
+    return -1 if value is None else int(bool(value))
+
+
+def _unflag(value):
+    return None if value < 0 else bool(value)
+
+
+def encode_record(entry, ts):
+    """
+    Maps a transmutation entry dict to a tuple of column values.
+    """
+    lapis = entry.get("lapis_triggered")
+    if isinstance(lapis, dict):
+        lapis_values = (
+            _flag(lapis.get("triggered")),
+            _flag(lapis.get("virtue_match")),
+            _flag(lapis.get("amplified_context"))
+        )
+    else:
+        lapis_values = (_flag(lapis), -1, -1)
+
+    tier = entry.get("aura_tier")
+    codes = {}
+    raw = None
+    for field in ("emotion", "virtue"):
+        code = intern(entry[field])
+        if isinstance(code, str):
+            raw = raw or {}
+            raw[field] = code
+            code = UNINTERNED
+        codes[field] = code
+    return (
+        ts,
+        entry["mana"],
+        _TIER_CODES.get(normalize(tier), -1) if tier else -1,
+        codes["emotion"],
+        codes["virtue"],
+        entry.get("memory_reference"),
+        _flag(entry.get("class_shift")),
+    ) + lapis_values + (raw,)
+
+
+class ColumnarHistory:
+    """
+    Chunked column store shared by all users, with a row index per user.
+    """
+
+    def __init__(self, chunk_size=4096):
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.user_rows = {}
+        self._chunks = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, user_id):
+        return user_id in self.user_rows
+
+    def append(self, user_id, values):
+        """
+        Appends one row of column values (see encode_record) for a user.
+
+        Returns:
+            int: The global row number
+        """
+        with self._lock:
+            return self._append(user_id, values)
+
+    def replace_user(self, user_id, rows_values, since=None):
+        """
+        Swaps a user's rows for a freshly loaded set (e.g. from Postgres).
+
+        Old rows stay in their chunks as tombstones (NaN timestamp) so no
+        column ever has to be compacted; every aggregate skips them.
+
+        Args:
+            since (int, optional): user_count() taken before the load started;
+                rows appended after it are kept unless the loaded set already
+                holds a row with the same timestamp
+        """
+        rows_values = list(rows_values)
+        loaded_ts = {values[0] for values in rows_values}
+        with self._lock:
+            kept = array("q")
+            for index, row in enumerate(self.user_rows.pop(user_id, ())):
+                chunk_no, offset = divmod(row, self.chunk_size)
+                chunk = self._chunks[chunk_no]
+                if since is not None and index >= since and chunk["ts"][offset] not in loaded_ts:
+                    kept.append(row)
+                else:
+                    chunk["ts"][offset] = np.nan
+                    for name in _OBJECT_COLUMNS:
+                        chunk[name][offset] = None
+            for values in rows_values:
+                self._append(user_id, values)
+            self.user_rows.setdefault(user_id, array("q")).extend(kept)
+
+    def _append(self, user_id, values):
+        row = self.size
+        chunk_no, offset = divmod(row, self.chunk_size)
+        if chunk_no == len(self._chunks):
+            self._chunks.append({
+                name: np.empty(self.chunk_size, dtype=dtype) for name, dtype in COLUMNS
+            })
+        chunk = self._chunks[chunk_no]
+        for (name, _), value in zip(COLUMNS, values):
+            chunk[name][offset] = value
+
+        rows = self.user_rows.get(user_id)
+        if rows is None:
+            rows = self.user_rows[user_id] = array("q")
+        rows.append(row)
+        self.size = row + 1
+        return row
+
+    def user_count(self, user_id):
+        rows = self.user_rows.get(user_id)
+        return len(rows) if rows is not None else 0
+
+    def columns(self, names, user_id=None):
+        """
+        Materializes the requested columns for one user or for every row.
+
+        Args:
+            names (iterable[str]): Column names from COLUMNS
+            user_id (str, optional): Restrict to this user's rows, in their order
+
+        Returns:
+            dict: name -> numpy.ndarray
+        """
+        with self._lock:
+            size = self.size
+            chunks = list(self._chunks)
+            rows = None
+            if user_id is not None:
+                rows = np.array(self.user_rows.get(user_id, ()), dtype=np.int64)
+
+        if rows is None:
+            return {
+                name: np.concatenate([c[name] for c in chunks])[:size] if chunks
+                else np.empty(0, dtype=dict(COLUMNS)[name])
+                for name in names
+            }
+
+        chunk_nos, offsets = np.divmod(rows, self.chunk_size)
+        result = {name: np.empty(len(rows), dtype=dict(COLUMNS)[name]) for name in names}
+        for chunk_no in np.unique(chunk_nos):
+            mask = chunk_nos == chunk_no
+            chunk = chunks[chunk_no]
+            for name in names:
+                result[name][mask] = chunk[name][offsets[mask]]
+        return result
+
+
+# -----------------------------------------------------------------------------
+# Decoding and analytics
+# -----------------------------------------------------------------------------
+def _iso(ts):
+    return np.datetime_as_string(np.round(ts * 1e6).astype("datetime64[us]"), unit="us")
+
+
+def _window(cols, start=None, end=None):
+    ts = cols["ts"]
+    mask = ~np.isnan(ts)
+    if start is not None:
+        mask &= ts >= start
+    if end is not None:
+        mask &= ts < end
+    return mask
+
+
+def _name(code, raw, field):
+    return raw[field] if code == UNINTERNED else symbol(code)
+
+
+def decode_rows(store, user_id):
+    """
+    Rebuilds a user's records as dicts, oldest first.
+    """
+    cols = store.columns([name for name, _ in COLUMNS], user_id)
+    records = []
+    for ts, mana, tier, emotion, virtue, memory_name, shift, lapis, match, amplified, raw in zip(
+        _iso(cols["ts"]).tolist(), cols["mana"].tolist(), cols["tier"].tolist(),
+        cols["emotion"].tolist(), cols["virtue"].tolist(), cols["memory"].tolist(),
+        cols["class_shift"].tolist(), cols["lapis"].tolist(),
+        cols["virtue_match"].tolist(), cols["amplified"].tolist(), cols["raw"].tolist()
+    ):
+        virtue_name = _name(virtue, raw, "virtue")
+        if match < 0:
+            lapis_value = _unflag(lapis)
+        else:
+            lapis_value = {
+                "triggered": _unflag(lapis),
+                "virtue_match": _unflag(match),
+                "amplified_context": _unflag(amplified),
+                "virtue": virtue_name,
+                "memory_tag": memory_name or "none"
+            }
+        records.append({
+            "timestamp": ts,
+            "emotion": _name(emotion, raw, "emotion"),
+            "virtue": virtue_name,
+            "mana": mana,
+            "aura_tier": AURA_STATES[tier] if tier >= 0 else None,
+            "class_shift": _unflag(shift),
+            "memory_reference": memory_name,
+            "lapis_triggered": lapis_value
+        })
+    return records
+
+
+def summary_lines(store, user_id):
+    """
+    Formats "<timestamp> → <tier> (<virtue> + <emotion>)" for a user with
+    vectorized string operations.
+    """
+    cols = store.columns(["ts", "tier", "emotion", "virtue", "raw"], user_id)
+    if not len(cols["ts"]):
+        return []
+
+    ids = np.concatenate([cols["emotion"], cols["virtue"]])
+    unique_ids, inverse = np.unique(ids, return_inverse=True)
+    names = np.array([None if i == UNINTERNED else symbol(i) for i in unique_ids.tolist()], dtype=object)
+    emotions, virtues = np.split(names[inverse], 2)
+    for i in np.flatnonzero(cols["raw"] != None).tolist():  # noqa: E711 (elementwise)
+        raw = cols["raw"][i]
+        emotions[i] = raw.get("emotion", emotions[i])
+        virtues[i] = raw.get("virtue", virtues[i])
+
+    tiers = _TIER_NAMES[cols["tier"]]
+    lines = _iso(cols["ts"]).astype(object) + " → " + tiers + " (" + virtues + " + " + emotions + ")"
+    return lines.tolist()
+
+
+def tier_histogram(store, user_id=None, start=None, end=None):
+    """
+    Returns:
+        dict: {aura tier: count} for the selected rows
+    """
+    cols = store.columns(["ts", "tier"], user_id)
+    tiers = cols["tier"][_window(cols, start, end)]
+    counts = np.bincount(tiers[tiers >= 0].astype(np.intp), minlength=len(AURA_STATES))
+    return {name: int(count) for name, count in zip(AURA_STATES, counts.tolist())}
+
+
+def mana_percentiles(store, percentiles=(50, 90, 99), user_id=None, start=None, end=None):
+    """
+    Returns:
+        dict: {"p50": float, ...}, or None values when no rows match
+    """
+    cols = store.columns(["ts", "mana"], user_id)
+    mana = cols["mana"][_window(cols, start, end)]
+    if not len(mana):
+        return {f"p{p:g}": None for p in percentiles}
+    values = np.percentile(mana, percentiles)
+    return {f"p{p:g}": round(float(v), 2) for p, v in zip(percentiles, values)}
+
+
+def lapis_trigger_rate(store, user_id=None, start=None, end=None):
+    """
+    Returns:
+        float | None: Share of selected rows with a triggered lapis event
+    """
+    cols = store.columns(["ts", "lapis"], user_id)
+    lapis = cols["lapis"][_window(cols, start, end)]
+    if not len(lapis):
+        return None
+    return round(float(np.mean(lapis == 1)), 4)
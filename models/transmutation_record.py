@@ -10,12 +10,42 @@ Purpose:
     - Store transmutation outcomes linked to user profiles
     - Capture full input/output of each symbolic transformation
     - Enable reflection, sorting, insight unlocking, and memory streaks
+    - Persist records to Postgres through the write-behind transmutation_store
+    - Hold cached records column-wise (see transmutation_columns), decoded only when read
+    - Answer tier, mana and lapis aggregates with vectorized NumPy operations
+
+Configuration (environment):
+    TRANSMUTATION_LOAD_RETRY       seconds before retrying a failed history load,
+                                   doubled per consecutive failure (default: 1.0)
+    TRANSMUTATION_LOAD_RETRY_MAX   ceiling on that delay in seconds (default: 60)
 """
 
-from datetime import datetime
+import os
+import threading
+import time
+from datetime import datetime, timezone
 
-# In-memory symbolic log store
-transmutation_records = {}
+from models import transmutation_store
+from models import transmutation_columns as columns
+from models.vocabulary import encode_fields, decode_fields
+
+# Columnar read-through cache in front of Postgres, shared by all users
+transmutation_records = columns.ColumnarHistory()
+
+LOAD_RETRY_SECONDS = float(os.getenv("TRANSMUTATION_LOAD_RETRY", 1.0))
+LOAD_RETRY_MAX_SECONDS = float(os.getenv("TRANSMUTATION_LOAD_RETRY_MAX", 60))
+
+# Users whose persisted history has already been merged into the cache
+_loaded_users = set()
+# Users whose history is being loaded by some thread
+_loading = set()
+# user_id -> (consecutive failed loads, monotonic time of the next attempt)
+_load_failures = {}
+_cache_lock = threading.RLock()
+
+
+def _epoch(timestamp):
+    return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
 
 
 def record_transmutation(user_id, emotion, virtue, mana, aura_result, lapis_triggered):
@@ -36,8 +66,9 @@ def record_transmutation(user_id, emotion, virtue, mana, aura_result, lapis_trig
     if not user_id:
         raise ValueError("User ID must be provided for transmutation logging.")
 
+    now = datetime.utcnow()
     entry = {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": now.isoformat(),
         "emotion": emotion,
         "virtue": virtue,
         "mana": round(float(mana), 2),
@@ -46,12 +77,59 @@ def record_transmutation(user_id, emotion, virtue, mana, aura_result, lapis_trig
         "memory_reference": aura_result.get("memory_reference"),
         "lapis_triggered": lapis_triggered
     }
+    # Round-trip through the vocabulary so every symbol comes back in canonical spelling
+    entry = decode_fields(encode_fields(entry))
+
+    with _cache_lock:
+        transmutation_records.append(
+            user_id, columns.encode_record(entry, now.replace(tzinfo=timezone.utc).timestamp())
+        )
+        if transmutation_store.PERSIST_ENABLED:
+            transmutation_store.writer.enqueue(user_id, entry)
+    return entry
 
-    if user_id not in transmutation_records:
-        transmutation_records[user_id] = []
 
-    transmutation_records[user_id].append(entry)
-    return entry
+def _ensure_loaded(user_id):
+    """
+    The first read for a user flushes pending writes and loads the persisted
+    history from Postgres; later reads are served from the in-process cache.
+
+    The flush and load run outside _cache_lock, so record_transmutation never
+    waits on Postgres. Records appended meanwhile are kept by replace_user().
+    A failed load is retried with exponential backoff; until then reads are
+    served from the cache alone.
+    """
+    if not transmutation_store.PERSIST_ENABLED or user_id in _loaded_users:
+        return
+
+    with _cache_lock:
+        if user_id in _loaded_users or user_id in _loading:
+            return
+        failures, retry_at = _load_failures.get(user_id, (0, 0.0))
+        if time.monotonic() < retry_at:
+            return
+        _loading.add(user_id)
+        since = transmutation_records.user_count(user_id)
+
+    loaded = None
+    try:
+        # Flushing first means the persisted rows already include this process's records
+        failed_flushes = transmutation_store.writer.stats["failed_flushes"]
+        transmutation_store.writer.flush()
+        if transmutation_store.writer.stats["failed_flushes"] == failed_flushes:
+            persisted = transmutation_store.load_history(user_id)
+            if persisted is not None:
+                loaded = [columns.encode_record(e, _epoch(e["timestamp"])) for e in persisted]
+    finally:
+        with _cache_lock:
+            _loading.discard(user_id)
+            if loaded is None:
+                delay = min(LOAD_RETRY_MAX_SECONDS, LOAD_RETRY_SECONDS * 2 ** failures)
+                _load_failures[user_id] = (failures + 1, time.monotonic() + delay)
+            else:
+                transmutation_records.replace_user(user_id, loaded, since)
+                _load_failures.pop(user_id, None)
+                _loaded_users.add(user_id)
 
 
 def get_transmutation_history(user_id):
@@ -64,7 +142,8 @@ def get_transmutation_history(user_id):
     Returns:
         list: List of symbolic transformation events
     """
-    return transmutation_records.get(user_id, [])
+    _ensure_loaded(user_id)
+    return columns.decode_rows(transmutation_records, user_id)
 
 
 def summarize_transmutations(user_id):
@@ -77,8 +156,40 @@ def summarize_transmutations(user_id):
     Returns:
         list[str]: Summary descriptions of symbolic transitions
     """
-    history = get_transmutation_history(user_id)
-    return [
-        f"{record['timestamp']} → {record['aura_tier']} ({record['virtue']} + {record['emotion']})"
-        for record in history
-    ]
+    _ensure_loaded(user_id)
+    return columns.summary_lines(transmutation_records, user_id)
+
+
+def get_tier_histogram(user_id=None, start=None, end=None):
+    """
+    Counts transmutations per aura tier.
+
+    Args:
+        user_id (str, optional): Restrict to one user; all users when omitted
+        start (float, optional): Window start, epoch seconds (inclusive)
+        end (float, optional): Window end, epoch seconds (exclusive)
+
+    Returns:
+        dict: {aura tier: count}
+    """
+    if user_id is not None:
+        _ensure_loaded(user_id)
+    return columns.tier_histogram(transmutation_records, user_id, start, end)
+
+
+def get_mana_percentiles(percentiles=(50, 90, 99), user_id=None, start=None, end=None):
+    """
+    Mana percentiles over a time window, e.g. {"p50": 61.0, "p90": 94.5, "p99": 99.1}.
+    """
+    if user_id is not None:
+        _ensure_loaded(user_id)
+    return columns.mana_percentiles(transmutation_records, percentiles, user_id, start, end)
+
+
+def get_lapis_trigger_rate(user_id=None, start=None, end=None):
+    """
+    Share of transmutations in the window that triggered a lapis event.
+    """
+    if user_id is not None:
+        _ensure_loaded(user_id)
+    return columns.lapis_trigger_rate(transmutation_records, user_id, start, end)
@@ -0,0 +1,275 @@
+"""
+transmutation_store.py
+-----------------------
+Write-behind Postgres persistence for symbolic transmutation records.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Buffer records off the request path and flush them to Postgres in batches
+    - Flush on a size trigger (batch full) or a time trigger (flush interval)
+    - Use multi-row INSERT (default) or COPY for each batch
+    - Load a user's persisted history for the read-through cache in transmutation_record
+
+Configuration (environment):
+    TRANSMUTATION_PERSIST          "0" disables Postgres persistence (default: enabled)
+    TRANSMUTATION_BATCH_SIZE       records per flush before the size trigger fires (default: 500)
+    TRANSMUTATION_FLUSH_INTERVAL   seconds between time-triggered flushes (default: 1.0)
+    TRANSMUTATION_WRITE_METHOD     "values" (multi-row INSERT) or "copy" (default: values)
+"""
+
+import atexit
+import csv
+import io
+import json
+import os
+import threading
+import uuid
+from collections import deque
+
+from database import get_postgres_connection, release_postgres_connection
+
+TABLE_NAME = "transmutation_records"
+
+COLUMNS = (
+    "record_id", "user_id", "recorded_at", "emotion", "virtue", "mana",
+    "aura_tier", "class_shift", "memory_reference", "lapis_triggered"
+)
+
+CREATE_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+        record_id UUID PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        recorded_at TIMESTAMP NOT NULL,
+        emotion TEXT,
+        virtue TEXT,
+        mana DOUBLE PRECISION,
+        aura_tier TEXT,
+        class_shift BOOLEAN,
+        memory_reference TEXT,
+        lapis_triggered JSONB
+    );
+    CREATE INDEX IF NOT EXISTS {TABLE_NAME}_user_idx
+        ON {TABLE_NAME} (user_id, recorded_at);
+"""
+
+
+def _to_row(record_id, user_id, entry):
+    return (
+        record_id,
+        user_id,
+        entry["timestamp"],
+        entry["emotion"],
+        entry["virtue"],
+        entry["mana"],
+        entry["aura_tier"],
+        entry["class_shift"],
+        entry["memory_reference"],
+        json.dumps(entry["lapis_triggered"], default=str)
+    )
+
+
+def _from_row(row):
+    return {
+        "timestamp": row["recorded_at"].isoformat(),
+        "emotion": row["emotion"],
+        "virtue": row["virtue"],
+        "mana": row["mana"],
+        "aura_tier": row["aura_tier"],
+        "class_shift": row["class_shift"],
+        "memory_reference": row["memory_reference"],
+        "lapis_triggered": row["lapis_triggered"]
+    }
+
+
+class TransmutationWriter:
+    """
+    Buffers transmutation records and writes them to Postgres in batches.
+    """
+
+    def __init__(self, batch_size=500, flush_interval=1.0, method="values",
+                 max_pending=100000):
+        """
+        Args:
+            batch_size (int): Buffered records that trigger an immediate flush
+            flush_interval (float): Seconds between time-triggered flushes
+            method (str): "values" for multi-row INSERT, "copy" for COPY FROM STDIN
+            max_pending (int): Buffer ceiling while Postgres is unreachable
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.method = method
+        self.max_pending = max_pending
+
+        # Oldest records fall off the left once max_pending is reached
+        self._pending = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._table_ready = False
+        self._thread = None
+        self.stats = {"written": 0, "flushes": 0, "failed_flushes": 0, "dropped": 0}
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="transmutation-writer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+        self.flush()
+
+    def enqueue(self, user_id, entry):
+        """
+        Queues one record for the next batch; wakes the writer when the batch is full.
+        """
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.stats["dropped"] += 1
+            self._pending.append(_to_row(str(uuid.uuid4()), user_id, entry))
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Writes everything buffered so far. Failed batches are put back for retry.
+
+        Returns:
+            int: Number of records written
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = list(self._pending), deque(maxlen=self.max_pending)
+            if not rows:
+                return 0
+            try:
+                self._write(rows)
+            except Exception as e:
+                with self._lock:
+                    overflow = len(rows) + len(self._pending) - self.max_pending
+                    retry = deque(rows, maxlen=self.max_pending)
+                    retry.extend(self._pending)
+                    self._pending = retry
+                    if overflow > 0:
+                        self.stats["dropped"] += overflow
+                self.stats["failed_flushes"] += 1
+                print(f"[transmutation_store] Flush of {len(rows)} records failed: {e}")
+                return 0
+            self.stats["written"] += len(rows)
+            self.stats["flushes"] += 1
+            return len(rows)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _write(self, rows):
+        conn = get_postgres_connection()
+        if conn is None:
+            raise RuntimeError("No Postgres connection available")
+        try:
+            with conn.cursor() as cur:
+                if not self._table_ready:
+                    cur.execute(CREATE_TABLE_SQL)
+                    self._table_ready = True
+                if self.method == "copy":
+                    copy_rows(cur, rows)
+                else:
+                    insert_rows(cur, rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            release_postgres_connection(conn)
+
+
+def insert_rows(cur, rows):
+    """
+    Writes rows with one multi-row INSERT ... VALUES statement.
+    """
+    from psycopg2.extras import execute_values
+
+    execute_values(
+        cur,
+        f"INSERT INTO {TABLE_NAME} ({', '.join(COLUMNS)}) VALUES %s "
+        f"ON CONFLICT (record_id) DO NOTHING",
+        rows,
+        page_size=len(rows)
+    )
+
+
+def copy_rows(cur, rows):
+    """
+    Streams rows through COPY ... FROM STDIN in CSV form.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cur.copy_expert(
+        f"COPY {TABLE_NAME} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+
+def load_history(user_id):
+    """
+    Reads a user's persisted records, oldest first.
+
+    Args:
+        user_id (str): The user's unique identifier
+
+    Returns:
+        list | None: Record dictionaries, or None if Postgres is unavailable
+    """
+    conn = get_postgres_connection()
+    if conn is None:
+        return None
+    try:
+        with conn.cursor() as cur:
+            cur.execute(CREATE_TABLE_SQL)
+            cur.execute(
+                f"SELECT {', '.join(COLUMNS[2:])} FROM {TABLE_NAME} "
+                f"WHERE user_id = %s ORDER BY recorded_at",
+                (user_id,)
+            )
+            rows = cur.fetchall()
+        conn.commit()
+        return [_from_row(row) for row in rows]
+    except Exception as e:
+        conn.rollback()
+        print(f"[transmutation_store] History load for {user_id} failed: {e}")
+        return None
+    finally:
+        release_postgres_connection(conn)
+
+
+# -----------------------------------------------------------------------------
+# Process-wide writer
+# -----------------------------------------------------------------------------
+PERSIST_ENABLED = os.getenv("TRANSMUTATION_PERSIST", "1") != "0"
+
+writer = TransmutationWriter(
+    batch_size=int(os.getenv("TRANSMUTATION_BATCH_SIZE", 500)),
+    flush_interval=float(os.getenv("TRANSMUTATION_FLUSH_INTERVAL", 1.0)),
+    method=os.getenv("TRANSMUTATION_WRITE_METHOD", "values")
+)
+
+if PERSIST_ENABLED:
+    writer.start()
+    atexit.register(writer.stop)
@@ -0,0 +1,211 @@
+"""
+virtue_leaderboard.py
+----------------------
+Ranked indexes of users by total virtue score and by individual virtue.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Keep users ordered by score with O(log n) expected updates (skip list)
+    - Serve top-K pages with an opaque cursor instead of offsets
+    - Hold one global board plus one board per virtue (keyed by vocabulary id)
+
+Ordering:
+    Higher score first; ties broken by user_id ascending, so pages are stable.
+"""
+
+import base64
+import json
+import random
+import threading
+
+from models.vocabulary import lookup, normalize
+
+
+class _Node:
+    __slots__ = ("key", "forward")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.forward = [None] * level
+
+
+class SkipList:
+    """
+    Ordered set of comparable keys with O(log n) expected insert and remove.
+    """
+
+    MAX_LEVEL = 32
+    P = 0.25
+
+    def __init__(self):
+        self.head = _Node(None, self.MAX_LEVEL)
+        self.level = 1
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _random_level(self):
+        level = 1
+        while level < self.MAX_LEVEL and random.random() < self.P:
+            level += 1
+        return level
+
+    def _predecessors(self, key):
+        update = [self.head] * self.MAX_LEVEL
+        node = self.head
+        for i in range(self.level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].key < key:
+                node = node.forward[i]
+            update[i] = node
+        return update
+
+    def insert(self, key):
+        update = self._predecessors(key)
+        level = self._random_level()
+        if level > self.level:
+            self.level = level
+        node = _Node(key, level)
+        for i in range(level):
+            node.forward[i] = update[i].forward[i]
+            update[i].forward[i] = node
+        self.size += 1
+
+    def remove(self, key):
+        update = self._predecessors(key)
+        target = update[0].forward[0]
+        if target is None or target.key != key:
+            return False
+        for i in range(len(target.forward)):
+            update[i].forward[i] = target.forward[i]
+        while self.level > 1 and self.head.forward[self.level - 1] is None:
+            self.level -= 1
+        self.size -= 1
+        return True
+
+    def iter_after(self, key=None):
+        """
+        Yields keys in order, starting strictly after `key` (or from the start).
+        """
+        if key is None:
+            node = self.head.forward[0]
+        else:
+            node = self._predecessors(key)[0].forward[0]
+            if node is not None and node.key == key:
+                node = node.forward[0]
+        while node is not None:
+            yield node.key
+            node = node.forward[0]
+
+
+def encode_cursor(score, user_id):
+    raw = json.dumps([score, user_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor()
+    """
+    try:
+        score, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return int(score), str(user_id)
+    except Exception:
+        raise ValueError("Invalid leaderboard cursor")
+
+
+class Leaderboard:
+    """
+    Users ranked by one score, kept in a skip list keyed on (-score, user_id).
+    """
+
+    def __init__(self):
+        self.scores = {}
+        self._ranks = SkipList()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.scores)
+
+    def set_score(self, user_id, score):
+        with self._lock:
+            previous = self.scores.get(user_id)
+            if previous == score:
+                return
+            if previous is not None:
+                self._ranks.remove((-previous, user_id))
+            self._ranks.insert((-score, user_id))
+            self.scores[user_id] = score
+
+    def top(self, limit=10, cursor=None):
+        """
+        Returns one page of the board.
+
+        Args:
+            limit (int): Maximum entries in the page
+            cursor (str, optional): next_cursor from the previous page
+
+        Returns:
+            dict: {"entries": [{"user_id", "score"}], "next_cursor": str | None}
+        """
+        after = None
+        if cursor:
+            score, user_id = decode_cursor(cursor)
+            after = (-score, user_id)
+
+        entries = []
+        has_more = False
+        with self._lock:
+            for neg_score, user_id in self._ranks.iter_after(after):
+                if len(entries) == limit:
+                    has_more = True
+                    break
+                entries.append({"user_id": user_id, "score": -neg_score})
+
+        last = entries[-1] if entries else None
+        return {
+            "entries": entries,
+            "next_cursor": encode_cursor(last["score"], last["user_id"]) if has_more else None
+        }
+
+
+# -----------------------------------------------------------------------------
+# Process-wide boards
+# -----------------------------------------------------------------------------
+global_board = Leaderboard()
+virtue_boards = {}
+_boards_lock = threading.Lock()
+
+
+def virtue_board(virtue_id):
+    board = virtue_boards.get(virtue_id)
+    if board is None:
+        with _boards_lock:
+            board = virtue_boards.setdefault(virtue_id, Leaderboard())
+    return board
+
+
+def record_scores(user_id, virtue_id, virtue_level, total_score):
+    """
+    Moves a user on the global board and on the board of the updated virtue.
+    """
+    # Boards order on user_id, so keep keys comparable even for numeric IDs
+    user_id = str(user_id)
+    global_board.set_score(user_id, total_score)
+    virtue_board(virtue_id).set_score(user_id, virtue_level)
+
+
+def top_users(limit=10, cursor=None, virtue=None):
+    """
+    Returns a page of the global board, or of one virtue's board (by name).
+    """
+    if virtue is None:
+        return global_board.top(limit, cursor)
+    # Virtues that did not fit in the vocabulary are keyed by their spelling
+    virtue_id = lookup(virtue)
+    board = virtue_boards.get(normalize(virtue) if virtue_id is None else virtue_id)
+    if board is None:
+        return {"entries": [], "next_cursor": None}
+    return board.top(limit, cursor)
@@ -10,6 +10,8 @@ Purpose:
     - Initialize and update user's symbolic virtue stats
     - Support aura evolution based on repeated virtue patterns
     - Interface with scroll_tree.json and vault_key_registry.json for Order alignment
+    - Keep each profile's total score incrementally and feed the virtue leaderboards
+    - Hand every increment to the evolution engine for threshold-crossing events
 
 Example Output:
     {
@@ -19,12 +21,16 @@ Example Output:
             "patience": 5,
             "clarity": 2
         },
+        "score": 10,
         "last_updated": "2025-05-25T11:11:11"
     }
 """
 
 from datetime import datetime
 from models.query_log import log_event
+from models.virtue_leaderboard import record_scores
+from models.vocabulary import decode, intern
+from utils.evolution_engine import evaluate_increment
 
 # -----------------------------------------------------------------------------
 # In-memory virtue store (replace with DB access later)
@@ -39,6 +45,7 @@ def init_virtue_profile(user_id):
     profile = {
         "user_id": user_id,
         "virtues": {},
+        "score": 0,
         "last_updated": datetime.utcnow().isoformat()
     }
     user_profiles[user_id] = profile
@@ -57,20 +64,37 @@ def update_virtue(user_id, virtue):
     Returns:
         int: New virtue level
     """
+    level, _ = _increment_virtue(user_id, virtue)
+    return level
+
+
+def _increment_virtue(user_id, virtue):
+    """
+    Applies one virtue increment and checks it against the evolution thresholds.
+
+    Returns:
+        tuple: (new level, crossing event or None)
+    """
     if user_id not in user_profiles:
         init_virtue_profile(user_id)
 
-    virtues = user_profiles[user_id]["virtues"]
-    virtues[virtue] = virtues.get(virtue, 0) + 1
-    user_profiles[user_id]["last_updated"] = datetime.utcnow().isoformat()
+    # An id, or the virtue's own spelling once the vocabulary is full
+    virtue_id = intern(virtue)
+    profile = user_profiles[user_id]
+    virtues = profile["virtues"]
+    level = virtues[virtue_id] = virtues.get(virtue_id, 0) + 1
+    profile["score"] += 1
+    profile["last_updated"] = datetime.utcnow().isoformat()
+
+    record_scores(user_id, virtue_id, level, profile["score"])
 
     log_event("virtue_update", {
         "user": user_id,
         "virtue": virtue,
-        "new_level": virtues[virtue]
+        "new_level": level
     })
 
-    return virtues[virtue]
+    return level, evaluate_increment(user_id, virtue_id, level - 1, level)
 
 
 def get_virtue_profile(user_id):
@@ -81,9 +105,18 @@ def get_virtue_profile(user_id):
         user_id (str): Unique identifier
 
     Returns:
-        dict: Full virtue profile
+        dict: Full virtue profile, with virtue names decoded
     """
-    return user_profiles.get(user_id, init_virtue_profile(user_id))
+    profile = user_profiles.get(user_id)
+    if profile is None:
+        profile = init_virtue_profile(user_id)
+
+    return {
+        "user_id": profile["user_id"],
+        "virtues": {decode(v): level for v, level in profile["virtues"].items()},
+        "score": profile["score"],
+        "last_updated": profile["last_updated"]
+    }
 
 
 def update_virtue_affinity(user_id, virtue):
@@ -97,16 +130,17 @@ def update_virtue_affinity(user_id, virtue):
         virtue (str): The name of the virtue to update
 
     Returns:
-        dict: Structured profile data including total score
+        dict: Structured profile data including total score and any
+              evolution event fired by this update (None otherwise)
     """
-    level = update_virtue(user_id, virtue)
+    level, evolution = _increment_virtue(user_id, virtue)
     profile = get_virtue_profile(user_id)
-    total_score = sum(profile["virtues"].values())
 
     return {
         "user_id": user_id,
         "virtues": profile["virtues"],
-        "score": total_score,
-        "last_updated": profile["last_updated"]
+        "score": profile["score"],
+        "last_updated": profile["last_updated"],
+        "evolution": evolution
     }
 
@@ -0,0 +1,189 @@
+"""
+vocabulary.py
+--------------
+Central registry of symbolic vocabulary shared by every model.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Map each emotion, virtue and aura tier to a small integer id
+    - Normalize case once, when a spelling is first seen
+    - Let models store ids and decode them only at the JSON boundary
+    - Stay bounded no matter how many distinct strings clients send
+
+Normalization:
+    Symbols are keyed by their stripped, lower-cased form. Decoding returns the
+    canonical spelling: the seeded form for built-in symbols ("Phoenix Phase")
+    and the lower-cased form for everything else ("Awe" -> "awe").
+    normalize() never registers anything, so read paths cannot grow the table.
+
+Bounds:
+    At most VOCABULARY_MAX_SYMBOLS symbols are registered, and at most four raw
+    spellings per symbol slot are remembered for the fast path. Once the table
+    is full, intern() returns the normalized string instead of an id, so a new
+    value is never merged with another one. Stores keep such values as plain
+    strings; typed arrays record UNINTERNED and keep the string on the side.
+    Free-text fields (memory tags and references) are never interned.
+
+Configuration (environment):
+    VOCABULARY_MAX_SYMBOLS   symbols registered per process (default: 4096)
+"""
+
+import os
+import threading
+
+from config.constants import VIRTUE_THRESHOLDS, AURA_STATES
+
+# Payload keys whose string values are stored as symbol ids
+SYMBOL_FIELDS = frozenset({"emotion", "virtue", "tier", "aura_tier"})
+
+MAX_SYMBOLS = int(os.getenv("VOCABULARY_MAX_SYMBOLS", 4096))
+
+# Typed-array code for a value intern() returned as a string; the store keeps
+# the string itself next to the array
+UNINTERNED = 0xFFFFFFFE
+
+
+class SymbolId(int):
+    """
+    An int that is known to be a vocabulary id, so payload decoding never
+    mistakes an ordinary number for a symbol.
+    """
+
+    __slots__ = ()
+
+
+class Vocabulary:
+    """
+    Bidirectional symbol <-> id table with a per-spelling fast path.
+    """
+
+    def __init__(self, seed=(), max_symbols=MAX_SYMBOLS):
+        self._ids = {}          # normalized form -> SymbolId
+        self._raw_ids = {}      # exact spelling seen -> SymbolId (skips re-normalizing)
+        self._symbols = []      # id -> canonical spelling
+        self._lock = threading.Lock()
+        self.overflows = 0
+        # Seeded symbols never count against the cap
+        self.max_symbols = max_symbols + len(seed)
+        for symbol in seed:
+            self._register(symbol.strip().lower(), symbol.strip(), symbol)
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def intern(self, symbol):
+        """
+        Returns the id for a symbol, registering it on first sight while the
+        table has room.
+
+        Args:
+            symbol (str): Any spelling of the symbol
+
+        Returns:
+            SymbolId | str: Stable id for this process, or the normalized
+            spelling if the symbol is new and the table is full
+        """
+        symbol_id = self._raw_ids.get(symbol)
+        if symbol_id is not None:
+            return symbol_id
+        key = symbol.strip().lower()
+        symbol_id = self._register(key, key, symbol)
+        return key if symbol_id is None else symbol_id
+
+    def lookup(self, symbol):
+        """
+        Returns the id for a known symbol without registering it.
+
+        Returns:
+            SymbolId | None: The id, or None if the symbol has never been interned
+        """
+        symbol_id = self._raw_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._ids.get(symbol.strip().lower())
+        return symbol_id
+
+    def symbol(self, symbol_id):
+        """
+        Decodes an id back to its canonical spelling.
+        """
+        return self._symbols[symbol_id]
+
+    def decode(self, value):
+        """
+        Decodes an intern() result: ids become their spelling, strings pass through.
+        """
+        return self._symbols[value] if type(value) is SymbolId else value
+
+    def normalize(self, symbol):
+        """
+        Returns the canonical spelling of a symbol without registering it.
+        """
+        symbol_id = self.lookup(symbol)
+        return symbol.strip().lower() if symbol_id is None else self._symbols[symbol_id]
+
+    def _register(self, key, canonical, raw):
+        with self._lock:
+            symbol_id = self._ids.get(key)
+            if symbol_id is None:
+                if len(self._symbols) >= self.max_symbols:
+                    self.overflows += 1
+                    return None
+                symbol_id = self._ids[key] = SymbolId(len(self._symbols))
+                self._symbols.append(canonical)
+            # Spellings differing only in case or whitespace are unbounded too
+            if len(self._raw_ids) < 4 * self.max_symbols:
+                self._raw_ids[raw] = symbol_id
+        return symbol_id
+
+
+# -----------------------------------------------------------------------------
+# Process-wide registry, seeded with the built-in vocabulary
+# -----------------------------------------------------------------------------
+vocabulary = Vocabulary(
+    seed=list(AURA_STATES) + list(VIRTUE_THRESHOLDS) +
+         ["neutral", "lumina", "void", "prism", "eclipse", "none"]
+)
+
+intern = vocabulary.intern
+lookup = vocabulary.lookup
+symbol = vocabulary.symbol
+decode = vocabulary.decode
+normalize = vocabulary.normalize
+
+
+def encode_fields(payload):
+    """
+    Copies a payload, replacing string values of SYMBOL_FIELDS with ids.
+
+    Nested dicts are encoded too; anything that is not a dict is returned as is.
+    Values that do not fit in a full vocabulary stay plain strings.
+    """
+    if not isinstance(payload, dict):
+        return payload
+    encoded = {}
+    for key, value in payload.items():
+        if key in SYMBOL_FIELDS and isinstance(value, str):
+            encoded[key] = intern(value)
+        elif isinstance(value, dict):
+            encoded[key] = encode_fields(value)
+        else:
+            encoded[key] = value
+    return encoded
+
+
+def decode_fields(payload):
+    """
+    Inverse of encode_fields(): turns every SymbolId back into its spelling.
+    """
+    if not isinstance(payload, dict):
+        return payload
+    decoded = {}
+    for key, value in payload.items():
+        if type(value) is SymbolId:
+            decoded[key] = symbol(value)
+        elif isinstance(value, dict):
+            decoded[key] = decode_fields(value)
+        else:
+            decoded[key] = value
+    return decoded
@@ -0,0 +1,83 @@
+"""
+profile_report.py
+------------------
+Aggregates request profiles written by utils/profiling.py into a per-endpoint
+hot-function report.
+
+Author: Khaylub Thompson-Calvin
+
+Usage:
+    python profile_report.py --dir profiles --top 15 --sort tottime
+    python profile_report.py --route api.logic.logic.process
+"""
+
+import argparse
+import os
+import pstats
+import statistics
+from collections import defaultdict
+
+from utils.profiling import PROFILE_DIR, parse_profile_filename
+
+# Column of each report row used for ranking
+SORT_KEYS = {"ncalls": 0, "tottime": 1, "cumtime": 2}
+
+
+def group_profiles(directory, route=None):
+    """
+    Returns:
+        dict: "METHOD route" -> list of (path, latency_ms)
+    """
+    groups = defaultdict(list)
+    for name in sorted(os.listdir(directory)):
+        meta = parse_profile_filename(name)
+        if meta is None or (route and meta["route"] != route):
+            continue
+        groups[f"{meta['method']} {meta['route']}"].append(
+            (os.path.join(directory, name), meta["latency_ms"])
+        )
+    return groups
+
+
+def hot_functions(paths, top, sort):
+    """
+    Merges profiles and returns the top functions.
+
+    Returns:
+        list: (ncalls, tottime, cumtime, "file:line(function)") rows
+    """
+    stats = pstats.Stats(*paths)
+    rows = []
+    for (filename, line, function), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append((ncalls, tottime, cumtime, f"{filename}:{line}({function})"))
+    rows.sort(key=lambda row: row[SORT_KEYS[sort]], reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-endpoint hot-function report from stored profiles")
+    parser.add_argument("--dir", default=PROFILE_DIR, help="Profile directory")
+    parser.add_argument("--top", type=int, default=15, help="Functions listed per endpoint")
+    parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="tottime", help="Ranking column")
+    parser.add_argument("--route", help="Only this route slug (as it appears in file names)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dir):
+        raise SystemExit(f"No profile directory at {args.dir}")
+
+    groups = group_profiles(args.dir, args.route)
+    if not groups:
+        print("No profiles found.")
+        return
+
+    for endpoint, entries in sorted(groups.items(), key=lambda item: -len(item[1])):
+        latencies = [latency for _, latency in entries]
+        print(f"\n=== {endpoint}  ({len(entries)} profiles, "
+              f"mean {statistics.mean(latencies):.2f} ms, max {max(latencies):.2f} ms)")
+        print(f"{'ncalls':>10}{'tottime':>12}{'cumtime':>12}  function")
+        for ncalls, tottime, cumtime, function in hot_functions([p for p, _ in entries], args.top, args.sort):
+            print(f"{ncalls:>10}{tottime:>12.6f}{cumtime:>12.6f}  {function}")
+
+
+if __name__ == "__main__":
+    main()
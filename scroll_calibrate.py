@@ -1,26 +1,25 @@
 import os
+import time
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from langchain_community.chat_models import ChatOpenAI
+from psycopg2.extras import RealDictCursor, execute_values
 from langchain.prompts import PromptTemplate
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 
 # Load environment variables
 load_dotenv()
 
-# Set up LangChain/OpenAI
-llm = ChatOpenAI(temperature=0.6, openai_api_key=os.getenv("OPENAI_API_KEY"))
-
-# Connect to PostgreSQL
-conn = psycopg2.connect(
-    host=os.getenv("DB_HOST"),
-    port=os.getenv("DB_PORT"),
-    dbname=os.getenv("DB_NAME"),
-    user=os.getenv("DB_USER"),
-    password=os.getenv("DB_PASSWORD"),
-    cursor_factory=RealDictCursor
-)
+from utils.completion_cache import completion_key, get_calibration_cache
+from utils.openai_gateway import CALIBRATION_DEADLINE, call_with_retry, chat_completion
+
+# Completion settings (shared OpenAI client via utils/openai_gateway.py)
+CALIBRATION_MODEL = "gpt-3.5-turbo"
+CALIBRATION_TEMPERATURE = 0.6
+
+# Batch defaults; the gateway's OPENAI_MAX_CONCURRENCY caps upstream calls as well
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
 
 # Define LangChain prompt
 calibration_prompt = PromptTemplate(
@@ -44,48 +43,233 @@ Respond in the following format:
 """
 )
 
-def calibrate_scroll(scroll_id):
+
+class CalibrationFormatError(ValueError):
+    """
+    Raised when the model's reply is not three non-empty lines.
+    """
+
+
+def connect():
+    return psycopg2.connect(
+        host=os.getenv("DB_HOST"),
+        port=os.getenv("DB_PORT"),
+        dbname=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        cursor_factory=RealDictCursor
+    )
+
+
+def fetch_scrolls(conn, ids=None):
+    """
+    Loads the scrolls to calibrate with one query: the given ids, or every
+    scroll whose poetic_excerpt is still NULL.
+    """
     with conn.cursor() as cur:
-        cur.execute("SELECT * FROM scroll_assets WHERE id = %s", (scroll_id,))
-        row = cur.fetchone()
+        if ids is None:
+            cur.execute(
+                "SELECT id, title, core_virtue FROM scroll_assets WHERE poetic_excerpt IS NULL ORDER BY id"
+            )
+        else:
+            cur.execute(
+                "SELECT id, title, core_virtue FROM scroll_assets WHERE id = ANY(%s) ORDER BY id", (list(ids),)
+            )
+        return cur.fetchall()
 
-        if not row:
-            print(f"❌ No scroll found with ID {scroll_id}")
-            return
 
-        title = row["title"]
-        virtue = row["core_virtue"]
+def parse_calibration(response):
+    lines = [line.strip() for line in response.strip().split("\n") if line.strip()]
+    if len(lines) != 3:
+        raise CalibrationFormatError(response)
+    return tuple(lines)
 
-        # Generate response
-        prompt = calibration_prompt.format(title=title, virtue=virtue)
-        response = llm.predict(prompt)
 
-        try:
-            poetic, emotion, tone = [line.strip() for line in response.strip().split("\n")]
-        except:
-            print("⚠️ Unexpected response format. Output:")
-            print(response)
-            return
+def calibration_key(title, virtue):
+    # Editing the template or switching models invalidates every cached calibration
+    return completion_key(
+        CALIBRATION_MODEL, calibration_prompt.template, CALIBRATION_TEMPERATURE,
+        title=title, virtue=virtue
+    )
 
-        # Update DB
-        cur.execute("""
-            UPDATE scroll_assets
-            SET poetic_excerpt = %s,
-                emotional_theme = %s,
-                tone_signature = %s
-            WHERE id = %s
-        """, (poetic, emotion, tone, scroll_id))
-        conn.commit()
 
-        print("✅ Scroll calibrated:")
-        print(f"📜 {poetic}")
-        print(f"💧 Theme: {emotion}")
-        print(f"🔊 Tone: {tone}")
+def generate_calibration(title, virtue, cache=None):
+    """
+    Returns:
+        tuple: (poetic excerpt, emotional theme, tone signature)
+    """
+    prompt = calibration_prompt.format(title=title, virtue=virtue)
+    response = chat_completion(
+        CALIBRATION_MODEL,
+        [{"role": "user", "content": prompt}],
+        caller="scroll_calibrate",
+        deadline=CALIBRATION_DEADLINE,
+        temperature=CALIBRATION_TEMPERATURE
+    )
+    calibration = parse_calibration(response)
+    if cache is not None:
+        cache.put(calibration_key(title, virtue), list(calibration))
+    return calibration
+
+
+def cached_calibration(cache, title, virtue):
+    """
+    Returns:
+        tuple | None: Stored calibration for an unchanged scroll, or None
+    """
+    if cache is None:
+        return None
+    hit = cache.get(calibration_key(title, virtue))
+    return tuple(hit) if hit is not None else None
+
+
+def calibrate_with_retry(scroll, retries, cache=None):
+    """
+    Calibrates one scroll, retrying transient failures with jittered
+    exponential backoff. Malformed replies are retried too, since sampling
+    usually fixes them; client errors such as a bad API key are not.
+
+    Returns:
+        tuple: (poetic, emotion, tone)
+    """
+    return call_with_retry(
+        lambda: generate_calibration(scroll["title"], scroll["core_virtue"], cache),
+        retries, transient=(CalibrationFormatError,)
+    )
+
+
+def write_calibrations(conn, results):
+    """
+    Writes every calibration back in one batched UPDATE.
+
+    Args:
+        results (list): (scroll_id, poetic, emotion, tone) tuples
+    """
+    if not results:
+        return
+    with conn.cursor() as cur:
+        execute_values(
+            cur,
+            """
+            UPDATE scroll_assets AS s
+            SET poetic_excerpt = v.poetic,
+                emotional_theme = v.emotion,
+                tone_signature = v.tone
+            FROM (VALUES %s) AS v(id, poetic, emotion, tone)
+            WHERE s.id = v.id
+            """,
+            results,
+            page_size=len(results)
+        )
+    conn.commit()
+
+
+def calibrate_batch(conn, scrolls, concurrency=DEFAULT_CONCURRENCY, retries=DEFAULT_RETRIES,
+                    cache=None, force=False):
+    """
+    Calibrates scrolls concurrently, reporting progress as each finishes,
+    then writes all successful results in a single UPDATE.
+
+    Scrolls whose title, virtue, prompt template and model match a cached
+    calibration skip the upstream call unless force is set.
+
+    Returns:
+        tuple: (results, failures) where failures maps scroll id -> error text
+    """
+    results, failures = [], {}
+    total = len(scrolls)
+    start = time.perf_counter()
+
+    pending = []
+    for scroll in scrolls:
+        hit = None if force else cached_calibration(cache, scroll["title"], scroll["core_virtue"])
+        if hit is None:
+            pending.append(scroll)
+        else:
+            results.append((scroll["id"], *hit))
+    if results:
+        print(f"💾 {len(results)}/{total} scrolls unchanged; reusing cached calibrations")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(calibrate_with_retry, scroll, retries, cache): scroll for scroll in pending}
+        for done, future in enumerate(as_completed(futures), start=total - len(pending) + 1):
+            scroll = futures[future]
+            try:
+                poetic, emotion, tone = future.result()
+                results.append((scroll["id"], poetic, emotion, tone))
+                status = f"✅ {scroll['title']}"
+            except Exception as e:
+                failures[scroll["id"]] = str(e)
+                status = f"⚠️ {scroll['title']}: {type(e).__name__}"
+            rate = done / (time.perf_counter() - start)
+            print(f"[{done}/{total}] #{scroll['id']} {status}  ({rate:.2f} scrolls/s)")
+
+    write_calibrations(conn, results)
+    elapsed = time.perf_counter() - start
+    print(f"\n📜 Calibrated {len(results)}/{total} scrolls in {elapsed:.1f}s "
+          f"({len(results) / elapsed if elapsed else 0:.2f} scrolls/s); {len(failures)} failed")
+    return results, failures
+
+
+def calibrate_scroll(conn, scroll_id, cache=None, force=False, retries=DEFAULT_RETRIES):
+    scrolls = fetch_scrolls(conn, [scroll_id])
+    if not scrolls:
+        print(f"❌ No scroll found with ID {scroll_id}")
+        return
+
+    title, virtue = scrolls[0]["title"], scrolls[0]["core_virtue"]
+    try:
+        hit = None if force else cached_calibration(cache, title, virtue)
+        if hit is not None:
+            print("💾 Unchanged scroll; reusing cached calibration")
+        poetic, emotion, tone = hit or calibrate_with_retry(scrolls[0], retries, cache)
+    except CalibrationFormatError as e:
+        print("⚠️ Unexpected response format. Output:")
+        print(e)
+        return
+
+    write_calibrations(conn, [(scroll_id, poetic, emotion, tone)])
+
+    print("✅ Scroll calibrated:")
+    print(f"📜 {poetic}")
+    print(f"💧 Theme: {emotion}")
+    print(f"🔊 Tone: {tone}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate a Scroll (AI Tone Generator)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--id", type=int, help="ID of scroll to calibrate")
+    target.add_argument("--ids", type=int, nargs="+", help="Calibrate these scroll IDs as a batch")
+    target.add_argument("--all-uncalibrated", action="store_true",
+                        help="Calibrate every scroll without a poetic excerpt")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Scrolls calibrated in parallel")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help="Retries per scroll on transient failures")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore cached calibrations and call the model for every scroll")
+    args = parser.parse_args()
+
+    cache = get_calibration_cache()
+    conn = connect()
+    try:
+        if args.id is not None:
+            calibrate_scroll(conn, args.id, cache, args.force, args.retries)
+            return
+
+        scrolls = fetch_scrolls(conn, None if args.all_uncalibrated else args.ids)
+        if not scrolls:
+            print("✅ Nothing to calibrate.")
+            return
 
-# CLI Interface
-parser = argparse.ArgumentParser(description="Calibrate a Scroll (AI Tone Generator)")
-parser.add_argument("--id", type=int, required=True, help="ID of scroll to calibrate")
+        print(f"🔮 Calibrating {len(scrolls)} scrolls with {args.concurrency} workers...")
+        _, failures = calibrate_batch(conn, scrolls, args.concurrency, args.retries, cache, args.force)
+        for scroll_id, error in sorted(failures.items()):
+            print(f"   #{scroll_id}: {error}")
+    finally:
+        conn.close()
 
-args = parser.parse_args()
 
-calibrate_scroll(args.id)
+if __name__ == "__main__":
+    main()
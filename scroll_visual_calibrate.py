@@ -1,16 +1,26 @@
 import os
 import base64
+import hashlib
 import argparse
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from openai import OpenAI
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# OpenAI setup
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from utils.completion_cache import completion_key, get_calibration_cache
+from utils.openai_gateway import CALIBRATION_DEADLINE, call_with_retry, chat_completion
+
+# Vision model used for symbolic decoding (shared client via utils/openai_gateway.py)
+VISUAL_MODEL = "gpt-4o"
+# Sent explicitly (the API default) so the cache key records it, as in scroll_calibrate.py
+VISUAL_TEMPERATURE = 1.0
+DEFAULT_RETRIES = 3
+
+# Prompt text; part of the calibration cache key
+SCRIBE_PROMPT = "You are an ancient scribe trained in symbolic decoding. Analyze the scroll's image and describe its mythic, philosophical, or virtue-based meaning."
+ANALYSIS_TEMPLATE = "This is the scroll titled '{title}', aligned with the virtue of '{virtue}'. Analyze its symbolic meaning."
 
 # PostgreSQL connection
 conn = psycopg2.connect(
@@ -22,48 +32,70 @@ conn = psycopg2.connect(
     cursor_factory=RealDictCursor
 )
 
-def encode_image_to_base64(image_path):
-    with open(image_path, "rb") as f:
-        return base64.b64encode(f.read()).decode("utf-8")
+def encode_image_to_base64(image_bytes):
+    return base64.b64encode(image_bytes).decode("utf-8")
+
+def visual_calibration_key(title, virtue, image_bytes):
+    # Same title and virtue with a retouched image is a different calibration
+    return completion_key(
+        VISUAL_MODEL, [SCRIBE_PROMPT, ANALYSIS_TEMPLATE], VISUAL_TEMPERATURE,
+        title=title, virtue=virtue, image_sha256=hashlib.sha256(image_bytes).hexdigest()
+    )
 
-def analyze_scroll_with_image(title, virtue, image_path):
+def analyze_scroll_with_image(title, virtue, image_path, cache=None, force=False, retries=DEFAULT_RETRIES):
     if not os.path.isfile(image_path):
         return "❌ Image file not found.", None, None
 
+    with open(image_path, "rb") as f:
+        image_bytes = f.read()
+
+    key = visual_calibration_key(title, virtue, image_bytes)
+    cached = cache.get(key) if cache is not None and not force else None
+    if cached is not None:
+        print(f"💾 Unchanged scroll and image; reusing cached analysis for {image_path}")
+        return cached, image_path, title
+
     print(f"🖼️ Sending image: {image_path}...")
 
-    base64_image = encode_image_to_base64(image_path)
+    base64_image = encode_image_to_base64(image_bytes)
     image_data_url = f"data:image/png;base64,{base64_image}"
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {
-                "role": "system",
-                "content": "You are an ancient scribe trained in symbolic decoding. Analyze the scroll's image and describe its mythic, philosophical, or virtue-based meaning."
-            },
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"This is the scroll titled '{title}', aligned with the virtue of '{virtue}'. Analyze its symbolic meaning."
-                    },
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": image_data_url
-                        }
+    messages = [
+        {
+            "role": "system",
+            "content": SCRIBE_PROMPT
+        },
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": ANALYSIS_TEMPLATE.format(title=title, virtue=virtue)
+                },
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": image_data_url
                     }
-                ]
-            }
-        ]
-    )
-
-    result = response.choices[0].message.content.strip()
+                }
+            ]
+        }
+    ]
+
+    # The deadline is per attempt; transient upstream failures are retried with backoff
+    response = call_with_retry(lambda: chat_completion(
+        VISUAL_MODEL, messages,
+        caller="scroll_visual_calibrate",
+        deadline=CALIBRATION_DEADLINE,
+        temperature=VISUAL_TEMPERATURE
+    ), retries)
+
+    result = response.strip()
+    if cache is not None:
+        cache.put(key, result)
     return result, image_path, title
 
-def calibrate_scroll(scroll_code):
+def calibrate_scroll(scroll_code, cache=None, force=False, retries=DEFAULT_RETRIES):
     with conn.cursor() as cur:
         cur.execute("SELECT * FROM scroll_assets WHERE scroll_code = %s", (scroll_code,))
         scroll = cur.fetchone()
@@ -76,7 +108,7 @@ def calibrate_scroll(scroll_code):
         virtue = scroll["core_virtue"]
         image_path = scroll["image_path"]
 
-        output, image_url, title = analyze_scroll_with_image(title, virtue, image_path)
+        output, image_url, title = analyze_scroll_with_image(title, virtue, image_path, cache, force, retries)
 
         print("\n📜 Symbolic Analysis:")
         print(f"Scroll: {title}")
@@ -86,6 +118,9 @@ def calibrate_scroll(scroll_code):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Scroll Visual Calibration Tool")
     parser.add_argument("--id", type=str, required=True, help="Scroll code (e.g., 055)")
+    parser.add_argument("--force", action="store_true", help="Ignore the cached analysis and call the model")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help="Retries on transient failures")
     args = parser.parse_args()
 
-    calibrate_scroll(args.id)
+    calibrate_scroll(args.id, get_calibration_cache(), args.force, args.retries)
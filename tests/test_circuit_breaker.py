@@ -0,0 +1,69 @@
+"""
+Circuit breaker probes, and streams cancelled while the breaker is half-open.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from utils import openai_gateway
+from utils.circuit_breaker import BreakerPolicy, CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+
+
+def _half_open_breaker(name):
+    breaker = CircuitBreaker(name, BreakerPolicy(window=2, min_calls=1, open_seconds=0.0))
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_release_frees_probe_without_closing():
+    breaker = _half_open_breaker("test-release")
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+class _FakeStream:
+    def __init__(self, deltas):
+        self._chunks = iter([
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=d))]) for d in deltas
+        ])
+        self.closed = False
+
+    def __iter__(self):
+        return self._chunks
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def half_open_upstream(monkeypatch):
+    breaker = _half_open_breaker("test-openai")
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create=lambda **kwargs: _FakeStream(["a", "b", "c"])
+    )))
+    monkeypatch.setattr(openai_gateway, "upstream_breaker", breaker)
+    monkeypatch.setattr(openai_gateway, "get_client", lambda: fake)
+    return breaker
+
+
+def test_cancelled_probe_stream_leaves_breaker_half_open(half_open_upstream):
+    stream = openai_gateway.stream_chat_completion("m", [], caller="test")
+    assert next(stream) == "a"
+    stream.close()
+
+    assert half_open_upstream.state == HALF_OPEN
+    assert half_open_upstream.allow()
+
+
+def test_finished_probe_stream_closes_breaker(half_open_upstream):
+    stream = openai_gateway.stream_chat_completion("m", [], caller="test")
+    assert list(stream) == ["a", "b", "c"]
+
+    assert half_open_upstream.state == CLOSED
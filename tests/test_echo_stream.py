@@ -0,0 +1,78 @@
+"""
+/api/openai/echo/stream must free its upstream slot even when the body is
+never read.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from werkzeug.test import EnvironBuilder
+
+from controllers import openai_controller
+from utils import openai_gateway
+from utils.circuit_breaker import CircuitBreaker
+
+
+class _FakeStream:
+    def __init__(self):
+        self._chunks = iter([
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=d))]) for d in ("Awe", " is")
+        ])
+
+    def __iter__(self):
+        return self._chunks
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        return _FakeStream()
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(openai_gateway, "get_client", lambda: fake)
+    monkeypatch.setattr(openai_gateway, "upstream_breaker", CircuitBreaker("test-echo-stream"))
+    monkeypatch.setattr(openai_controller, "get_completion_cache", lambda: None)
+    monkeypatch.setattr(openai_controller, "log_event", lambda *args: None)
+
+    app = Flask(__name__)
+    app.register_blueprint(openai_controller.openai_bp, url_prefix="/api/openai")
+    test_client = app.test_client()
+    test_client.upstream_calls = calls
+    return test_client
+
+
+def _close_unread(app, path):
+    # What a WSGI server does with a body it never sends: close without iterating
+    environ = EnvironBuilder(path=path).get_environ()
+    body = app.wsgi_app(environ, lambda status, headers, exc_info=None: None)
+    body.close()
+
+
+def test_head_does_not_take_an_upstream_slot(client):
+    for _ in range(openai_gateway.MAX_CONCURRENCY + 1):
+        response = client.head("/api/openai/echo/stream?prompt=What+is+awe")
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+    assert client.upstream_calls == []
+    assert openai_gateway._active[0] == 0
+
+
+def test_unread_stream_releases_its_slot(client):
+    for _ in range(openai_gateway.MAX_CONCURRENCY + 1):
+        _close_unread(client.application, "/api/openai/echo/stream?prompt=What+is+awe")
+    assert len(client.upstream_calls) == openai_gateway.MAX_CONCURRENCY + 1
+    assert openai_gateway._active[0] == 0
+
+
+def test_read_stream_relays_deltas(client):
+    body = client.get("/api/openai/echo/stream?prompt=What+is+awe").get_data(as_text=True)
+    assert '"delta": "Awe"' in body or '"delta":"Awe"' in body
+    assert "event: done" in body
+    assert openai_gateway._active[0] == 0
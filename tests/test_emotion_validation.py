@@ -0,0 +1,47 @@
+"""
+Validation of /api/emotion/log payloads and memory fields kept by ChronoSynth.
+"""
+
+import pytest
+from flask import Flask
+
+from controllers.emotion_controller import emotion_bp
+from utils import chrono_synth
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(emotion_bp, url_prefix="/api/emotion")
+    return app.test_client()
+
+
+@pytest.mark.parametrize("payload", [
+    {"emotion": "joy", "intensity": "high"},
+    {"emotion": "joy", "intensity": None},
+    {"emotion": "joy", "intensity": True},
+    {"emotion": ["joy"], "intensity": 1.0},
+    {"emotion": 3, "intensity": 1.0},
+    {"emotion": "   ", "intensity": 1.0},
+    ["joy", 1.0],
+])
+def test_invalid_payload_is_rejected(client, payload):
+    response = client.post("/api/emotion/log", json=payload)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_valid_payload_is_logged(client):
+    response = client.post("/api/emotion/log", json={"emotion": "joy", "intensity": 2, "user_id": "validation"})
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "logged"
+
+
+def test_memory_input_keeps_type_tags_and_insight():
+    chrono_synth.process_memory_input("trial", ["river"], "awe", 1.5, "cross it", user_id="memory-fields")
+    [event] = chrono_synth.get_memory_events("memory-fields")
+    assert event["type"] == "trial"
+    assert event["tags"] == ["river"]
+    assert event["insight"] == "cross it"
+    assert event["emotion"] == "awe"
+    assert event["intensity"] == 1.5
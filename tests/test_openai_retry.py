@@ -0,0 +1,50 @@
+"""
+call_with_retry retries transient upstream failures and nothing else.
+"""
+
+import pytest
+
+from utils import openai_gateway
+from utils.openai_gateway import GatewayBusy, call_with_retry
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(openai_gateway.time, "sleep", lambda seconds: None)
+
+
+def _failing(errors, result="ok"):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return fn, calls
+
+
+def test_transient_failures_are_retried():
+    fn, calls = _failing([GatewayBusy("busy"), GatewayBusy("busy")])
+    assert call_with_retry(fn, retries=3) == "ok"
+    assert len(calls) == 3
+
+
+def test_extra_transient_types_are_retried():
+    fn, calls = _failing([KeyError("format")])
+    assert call_with_retry(fn, retries=1, transient=(KeyError,)) == "ok"
+    assert len(calls) == 2
+
+
+def test_client_errors_are_not_retried():
+    fn, calls = _failing([ValueError("bad request")])
+    with pytest.raises(ValueError):
+        call_with_retry(fn, retries=3)
+    assert len(calls) == 1
+
+
+def test_last_error_is_raised_when_retries_run_out():
+    fn, calls = _failing([GatewayBusy("busy")] * 3)
+    with pytest.raises(GatewayBusy):
+        call_with_retry(fn, retries=2)
+    assert len(calls) == 3
@@ -0,0 +1,48 @@
+"""
+Transmutation rows keep their emotion, virtue and memory reference when the
+vocabulary is full.
+"""
+
+from models import transmutation_columns as columns
+from models.vocabulary import Vocabulary
+
+
+def _entry(emotion, virtue, memory):
+    return {
+        "emotion": emotion, "virtue": virtue, "mana": 12.5, "aura_tier": None,
+        "class_shift": False, "memory_reference": memory,
+        "lapis_triggered": {"triggered": True, "virtue_match": True, "amplified_context": None}
+    }
+
+
+def test_rows_survive_a_full_vocabulary(monkeypatch):
+    small = Vocabulary(seed=["courage"], max_symbols=1)
+    small.intern("awe")
+    monkeypatch.setattr(columns, "intern", small.intern)
+    monkeypatch.setattr(columns, "symbol", small.symbol)
+
+    store = columns.ColumnarHistory(chunk_size=4)
+    store.append("u", columns.encode_record(_entry("Awe", "Courage", "The River"), 1.0))
+    store.append("u", columns.encode_record(_entry("Dread", "Kindness", None), 2.0))
+    store.append("u", columns.encode_record(_entry("Wonder", "Gratitude", "a free-text note"), 3.0))
+
+    rows = columns.decode_rows(store, "u")
+    assert [(r["emotion"], r["virtue"], r["memory_reference"]) for r in rows] == [
+        ("awe", "courage", "The River"),
+        ("dread", "kindness", None),
+        ("wonder", "gratitude", "a free-text note"),
+    ]
+    assert rows[2]["lapis_triggered"]["memory_tag"] == "a free-text note"
+    assert [line.split(" → ")[1] for line in columns.summary_lines(store, "u")] == [
+        "None (courage + awe)", "None (kindness + dread)", "None (gratitude + wonder)"
+    ]
+    assert len(small) == 2
+
+
+def test_replace_user_drops_object_references():
+    store = columns.ColumnarHistory(chunk_size=4)
+    store.append("u", columns.encode_record(_entry("awe", "courage", "old note"), 1.0))
+    store.replace_user("u", [columns.encode_record(_entry("awe", "courage", "new note"), 2.0)])
+
+    assert [r["memory_reference"] for r in columns.decode_rows(store, "u")] == ["new note"]
+    assert store.columns(["memory"])["memory"].tolist() == [None, "new note"]
@@ -0,0 +1,53 @@
+"""
+A full vocabulary must keep new values distinct instead of merging them.
+"""
+
+import pytest
+
+from models import aura_model, virtue_profile, vocabulary
+from models.vocabulary import Vocabulary, encode_fields
+from utils import chrono_synth
+
+
+@pytest.fixture
+def full_vocabulary(monkeypatch):
+    small = Vocabulary(seed=["neutral", "courage"], max_symbols=5)
+    for i in range(60):
+        small.intern(f"emotion-{i}")
+    assert len(small) == 7
+    for module in (vocabulary, virtue_profile, aura_model, chrono_synth):
+        for name in ("intern", "decode", "symbol"):
+            if hasattr(module, name):
+                monkeypatch.setattr(module, name, getattr(small, name))
+    return small
+
+
+def test_free_text_fields_are_not_interned():
+    before = len(vocabulary.vocabulary)
+    encoded = encode_fields({"memory_tag": "tag-not-a-symbol", "memory_reference": "ref-not-a-symbol"})
+    assert encoded == {"memory_tag": "tag-not-a-symbol", "memory_reference": "ref-not-a-symbol"}
+    assert len(vocabulary.vocabulary) == before
+
+
+def test_distinct_virtues_stay_distinct(full_vocabulary, monkeypatch):
+    monkeypatch.setattr(virtue_profile, "user_profiles", {})
+    virtue_profile.update_virtue("u1", "kindness")
+    virtue_profile.update_virtue("u1", "gratitude")
+    virtue_profile.update_virtue("u1", "Courage")
+
+    profile = virtue_profile.get_virtue_profile("u1")
+    assert profile["virtues"] == {"kindness": 1, "gratitude": 1, "courage": 1}
+
+
+def test_distinct_states_and_emotions_stay_distinct(full_vocabulary):
+    runs = aura_model.AuraRuns("neutral", 0.0)
+    runs.observe("radiant", 1.0)
+    runs.observe("radiant", 2.0)
+    runs.observe("gloom", 3.0)
+    assert [runs.state(i) for i in range(len(runs))] == ["neutral", "radiant", "gloom"]
+    assert list(runs.counts) == [1, 2, 1]
+
+    timeline = chrono_synth.ChronoTimeline()
+    for emotion in ("wonder", "dread"):
+        timeline.record(chrono_synth.intern(emotion), 1.0, 0.0)
+    assert [timeline.emotion(0), timeline.emotion(1)] == ["wonder", "dread"]
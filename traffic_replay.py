@@ -0,0 +1,198 @@
+"""
+traffic_replay.py
+------------------
+Replays an NDJSON capture from utils/traffic_capture.py against a server.
+
+Author: Khaylub Thompson-Calvin
+
+Usage:
+    python traffic_replay.py captures/traffic.ndjson --target http://127.0.0.1:5001
+    python traffic_replay.py traffic.ndjson --speed 4 --concurrency 16
+    python traffic_replay.py traffic.ndjson --speed 0 --route /api/breath/log
+
+Requests keep their original spacing divided by --speed (0 sends as fast as
+the workers allow). The report lists, per route, request count, error rate,
+latency percentiles and how far sends lagged behind schedule.
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPSConnection, RemoteDisconnected
+from urllib.parse import urlsplit
+
+from utils.traffic_capture import EVENT_NAME
+
+
+def load_capture(path, route=None, limit=None):
+    """
+    Returns:
+        list[dict]: Captured requests in arrival order
+    """
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("event") != EVENT_NAME:
+                continue
+            if route and record.get("route") != route:
+                continue
+            records.append(record)
+    records.sort(key=lambda r: r["ts"])
+    return records[:limit] if limit else records
+
+
+class Replayer:
+    """
+    Sends captured requests with one keep-alive connection per worker thread.
+    """
+
+    def __init__(self, target, timeout=30.0):
+        parts = urlsplit(target)
+        self.connection_class = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self.connection_class(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def send(self, record):
+        """
+        Returns:
+            tuple: (status or None, latency_ms, error message or None)
+        """
+        headers = {}
+        payload = None
+        if record.get("body") is not None:
+            payload = json.dumps(record["body"]).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif record.get("raw_body") is not None:
+            payload = record["raw_body"].encode("utf-8")
+            headers["Content-Type"] = record.get("content_type") or "application/octet-stream"
+
+        path = self.base_path + record["path"]
+        start = time.perf_counter()
+        for attempt in range(2):
+            conn = self._connection()
+            reused = conn.sock is not None
+            try:
+                conn.request(record["method"], path, body=payload, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.will_close:
+                    conn.close()
+                    self._local.conn = None
+                return response.status, (time.perf_counter() - start) * 1000, None
+            except OSError as e:
+                conn.close()
+                self._local.conn = None
+                # Only a keep-alive connection the server closed while idle is
+                # safe to retry; anything else (timeouts included) may have
+                # reached the server already
+                stale = reused and isinstance(e, (RemoteDisconnected, BrokenPipeError, ConnectionResetError))
+                if attempt == 1 or not stale:
+                    return None, (time.perf_counter() - start) * 1000, str(e)
+
+
+def replay(records, replayer, speed, concurrency):
+    """
+    Returns:
+        list[dict]: One outcome per request, with route, status, latency and lag
+    """
+    if not records:
+        return []
+    outcomes = []
+    outcomes_lock = threading.Lock()
+    first_ts = records[0]["ts"]
+
+    def run(record, due):
+        lag_ms = max(0.0, (time.perf_counter() - due) * 1000)
+        status, latency_ms, error = replayer.send(record)
+        with outcomes_lock:
+            outcomes.append({
+                "route": record.get("route", record["path"]),
+                "status": status,
+                "latency_ms": latency_ms,
+                "lag_ms": lag_ms,
+                "error": error
+            })
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for record in records:
+            due = start + ((record["ts"] - first_ts) / speed if speed > 0 else 0.0)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(run, record, due)
+    return outcomes
+
+
+def _percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def report(outcomes, elapsed):
+    by_route = defaultdict(list)
+    for outcome in outcomes:
+        by_route[outcome["route"]].append(outcome)
+
+    print(f"{'route':<40}{'count':>7}{'err %':>8}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'max ms':>10}{'lag p95':>10}")
+    for route, items in sorted(by_route.items(), key=lambda item: -len(item[1])):
+        latencies = sorted(o["latency_ms"] for o in items)
+        lags = sorted(o["lag_ms"] for o in items)
+        errors = sum(1 for o in items if o["status"] is None or o["status"] >= 400)
+        print(f"{route:<40}{len(items):>7}{errors / len(items) * 100:>8.1f}"
+              f"{_percentile(latencies, 50):>10.2f}{_percentile(latencies, 95):>10.2f}"
+              f"{_percentile(latencies, 99):>10.2f}{latencies[-1]:>10.2f}{_percentile(lags, 95):>10.2f}")
+
+    failures = [o for o in outcomes if o["error"]]
+    total_errors = sum(1 for o in outcomes if o["status"] is None or o["status"] >= 400)
+    print(f"\n{len(outcomes)} requests in {elapsed:.2f}s "
+          f"({len(outcomes) / elapsed:,.1f} req/s), error rate {total_errors / len(outcomes) * 100:.2f}%, "
+          f"mean latency {statistics.mean(o['latency_ms'] for o in outcomes):.2f} ms")
+    if failures:
+        print(f"Transport failures: {len(failures)} (first: {failures[0]['error']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured API traffic against a server")
+    parser.add_argument("capture", help="NDJSON capture file")
+    parser.add_argument("--target", default="http://127.0.0.1:5001", help="Base URL of the server")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Speed multiplier for original spacing (0 = as fast as possible)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Worker threads")
+    parser.add_argument("--route", help="Only replay this url rule, e.g. /api/breath/log")
+    parser.add_argument("--limit", type=int, help="Replay at most this many requests")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    records = load_capture(args.capture, args.route, args.limit)
+    if not records:
+        raise SystemExit("No captured requests to replay.")
+
+    span = records[-1]["ts"] - records[0]["ts"]
+    print(f"Replaying {len(records)} requests captured over {span:.1f}s "
+          f"to {args.target} at {args.speed or 'max'}x with {args.concurrency} workers\n")
+
+    start = time.perf_counter()
+    outcomes = replay(records, Replayer(args.target, args.timeout), args.speed, args.concurrency)
+    report(outcomes, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,52 +10,207 @@ Purpose:
     - Capture the current timestamp during emotional log events
     - Calculate symbolic loops or intervals
     - Store rhythm-based logic for future evolution phases
+    - Keep one compact, array-backed timeline per user with rolling interval stats
 
 Symbolic Logic:
     • Short loops imply rapid emotional cycles (Reactive)
     • Long loops imply deeper reflection (Contemplative)
 """
 
+import threading
 import time
-from datetime import datetime
+from array import array
+from datetime import datetime, timezone
 
-memory_log = []
+from models.vocabulary import UNINTERNED, intern, symbol
 
-def log_emotion_event(emotion, intensity):
+# Smoothed interval (seconds) below which a user's loop reads as Reactive
+REACTIVE_LOOP_SECONDS = 60.0
+
+# Weight of the newest interval in the exponentially weighted moving average
+EWMA_ALPHA = 0.3
+
+DEFAULT_USER = "default_user"
+
+
+class ChronoTimeline:
+    """
+    Per-user event timeline stored in typed arrays.
+
+    Timestamps are non-decreasing epoch floats and intensities are floats.
+    Emotions are vocabulary ids, or UNINTERNED with the spelling kept in
+    `raw_emotions` once the vocabulary is full. Memory events also keep their type, tags and
+    insight in `memories`, keyed by event index. Interval mean, variance
+    (Welford) and EWMA are updated on every append, so loop classification
+    never rescans history.
+    """
+
+    __slots__ = ("timestamps", "emotions", "raw_emotions", "intensities", "memories",
+                 "interval_count", "interval_mean", "_interval_m2", "interval_ewma")
+
+    def __init__(self):
+        self.timestamps = array("d")
+        self.emotions = array("I")
+        self.raw_emotions = {}
+        self.intensities = array("d")
+        self.memories = {}
+        self.interval_count = 0
+        self.interval_mean = 0.0
+        self._interval_m2 = 0.0
+        self.interval_ewma = None
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def record(self, emotion_code, intensity, now, memory=None):
+        """
+        Appends one event and folds its interval into the rolling stats.
+
+        Args:
+            memory (dict, optional): type, tags and insight of a memory event
+
+        Returns:
+            float: The stored (monotonic) timestamp
+        """
+        if self.timestamps:
+            last = self.timestamps[-1]
+            ts = now if now > last else last
+            self._observe(ts - last)
+        else:
+            ts = now
+
+        self.timestamps.append(ts)
+        if isinstance(emotion_code, str):
+            self.raw_emotions[len(self.emotions)] = emotion_code
+            emotion_code = UNINTERNED
+        self.emotions.append(emotion_code)
+        self.intensities.append(intensity)
+        if memory is not None:
+            self.memories[len(self.timestamps) - 1] = memory
+        return ts
+
+    def emotion(self, index):
+        code = self.emotions[index]
+        return self.raw_emotions[index] if code == UNINTERNED else symbol(code)
+
+    def last_interval(self):
+        if len(self.timestamps) < 2:
+            return -1
+        return self.timestamps[-1] - self.timestamps[-2]
+
+    def interval_variance(self):
+        if self.interval_count < 2:
+            return 0.0
+        return self._interval_m2 / (self.interval_count - 1)
+
+    def loop_state(self):
+        if self.interval_ewma is None:
+            return None
+        return "Reactive" if self.interval_ewma < REACTIVE_LOOP_SECONDS else "Contemplative"
+
+    def _observe(self, interval):
+        self.interval_count += 1
+        delta = interval - self.interval_mean
+        self.interval_mean += delta / self.interval_count
+        self._interval_m2 += delta * (interval - self.interval_mean)
+        if self.interval_ewma is None:
+            self.interval_ewma = interval
+        else:
+            self.interval_ewma += EWMA_ALPHA * (interval - self.interval_ewma)
+
+
+# -----------------------------------------------------------------------------
+# Per-user timelines
+# -----------------------------------------------------------------------------
+timelines = {}
+_lock = threading.Lock()
+
+
+def _record(user_id, emotion, intensity, memory=None):
+    emotion_id = intern(emotion)
+    with _lock:
+        timeline = timelines.get(user_id)
+        if timeline is None:
+            timeline = timelines[user_id] = ChronoTimeline()
+        return timeline.record(emotion_id, float(intensity), time.time(), memory)
+
+
+def _to_iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def log_emotion_event(emotion, intensity, user_id=DEFAULT_USER):
     """
     Records a timestamped emotional event.
 
     Args:
         emotion (str): Type of emotion (e.g., awe, fear, joy)
         intensity (int): Numeric value of intensity
+        user_id (str): Owner of the timeline
 
     Returns:
-        dict: A symbolic memory event with timestamp and values
+        dict: A symbolic memory event with timestamp, values and current loop state
     """
-    now = datetime.utcnow().isoformat()
-    entry = {
-        "timestamp": now,
+    ts = _record(user_id, emotion, intensity)
+    return {
+        "timestamp": _to_iso(ts),
         "emotion": emotion,
-        "intensity": intensity
+        "intensity": intensity,
+        "loop_state": get_loop_state(user_id)
     }
-    memory_log.append(entry)
-    return entry
 
-def calculate_loop_interval():
+def calculate_loop_interval(user_id=DEFAULT_USER):
     """
     Calculates time delta between the last two emotional entries.
 
+    Args:
+        user_id (str): Owner of the timeline
+
     Returns:
         float: Seconds between entries, or -1 if not enough data.
     """
-    if len(memory_log) < 2:
-        return -1
+    timeline = timelines.get(user_id)
+    return timeline.last_interval() if timeline else -1
+
+def get_loop_state(user_id=DEFAULT_USER):
+    """
+    Classifies the user's emotional rhythm from the smoothed interval.
 
-    t1 = datetime.fromisoformat(memory_log[-2]["timestamp"])
-    t2 = datetime.fromisoformat(memory_log[-1]["timestamp"])
-    return (t2 - t1).total_seconds()
+    Args:
+        user_id (str): Owner of the timeline
+
+    Returns:
+        str | None: "Reactive", "Contemplative", or None with fewer than two events
+    """
+    timeline = timelines.get(user_id)
+    return timeline.loop_state() if timeline else None
 
-def process_memory_input(event_type, tags, emotion, intensity, insight=None):
+def get_interval_stats(user_id=DEFAULT_USER):
+    """
+    Reports the rolling interval statistics for a user's timeline.
+
+    Args:
+        user_id (str): Owner of the timeline
+
+    Returns:
+        dict: Event count, interval mean / variance / EWMA (seconds) and loop state
+    """
+    timeline = timelines.get(user_id)
+    if timeline is None:
+        return {"events": 0, "intervals": 0, "mean": None,
+                "variance": None, "ewma": None, "loop_state": None}
+
+    with _lock:
+        return {
+            "events": len(timeline),
+            "intervals": timeline.interval_count,
+            "mean": timeline.interval_mean if timeline.interval_count else None,
+            "variance": timeline.interval_variance(),
+            "ewma": timeline.interval_ewma,
+            "loop_state": timeline.loop_state()
+        }
+
+def process_memory_input(event_type, tags, emotion, intensity, insight=None, user_id=DEFAULT_USER):
     """
     Anchors a symbolic memory event into the timeline.
 
@@ -65,26 +220,44 @@ def process_memory_input(event_type, tags, emotion, intensity, insight=None):
         emotion (str): Emotion associated with the memory
         intensity (int or float): Intensity of the memory event
         insight (str, optional): Reflection or decoded symbolic meaning
+        user_id (str): Owner of the timeline
 
     Returns:
         dict: Harmonized timeline reference for memory evolution
     """
-    now = datetime.utcnow().isoformat()
-    memory_event = {
-        "timestamp": now,
-        "type": event_type,
-        "tags": tags,
-        "emotion": emotion,
-        "intensity": intensity,
-        "insight": insight
-    }
-
-    memory_log.append(memory_event)
+    memory = {"type": event_type, "tags": tags, "insight": insight}
+    ts = _record(user_id, emotion, intensity, memory)
 
     return {
         "status": "anchored",
-        "timestamp": now,
+        "timestamp": _to_iso(ts),
         "tags": tags,
         "insight": insight
     }
 
+def get_memory_events(user_id=DEFAULT_USER):
+    """
+    Lists the memory events anchored into a user's timeline.
+
+    Args:
+        user_id (str): Owner of the timeline
+
+    Returns:
+        list: Memory events with timestamp, type, tags, emotion, intensity and insight
+    """
+    timeline = timelines.get(user_id)
+    if timeline is None:
+        return []
+
+    with _lock:
+        return [
+            {
+                "timestamp": _to_iso(timeline.timestamps[index]),
+                "type": memory["type"],
+                "tags": memory["tags"],
+                "emotion": timeline.emotion(index),
+                "intensity": timeline.intensities[index],
+                "insight": memory["insight"]
+            }
+            for index, memory in timeline.memories.items()
+        ]
@@ -0,0 +1,213 @@
+"""
+circuit_breaker.py
+-------------------
+Failure-rate circuit breaker for calls to slow or failing dependencies.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Track the outcome of the most recent calls in a sliding window
+    - Trip open when the failure rate crosses a threshold, so callers fail
+      fast instead of tying up worker threads on a struggling upstream
+    - After a cool-down, let a few half-open probe calls through; close on a
+      successful probe, re-open on a failed one
+    - Export breaker state, transitions and shed calls as metrics
+
+States:
+    closed     every call allowed; outcomes recorded in the window
+    open       calls rejected until open_seconds have passed
+    half_open  up to half_open_calls concurrent probes allowed, others rejected
+
+Configuration (environment, read by BreakerPolicy.from_env with a prefix,
+e.g. OPENAI_BREAKER):
+    <PREFIX>_FAILURE_RATE     failure fraction that trips the breaker (default: 0.5)
+    <PREFIX>_WINDOW           recent calls considered (default: 20)
+    <PREFIX>_MIN_CALLS        calls needed in the window before tripping (default: 10)
+    <PREFIX>_OPEN_SECONDS     cool-down before half-open probing (default: 30)
+    <PREFIX>_HALF_OPEN_CALLS  concurrent probes while half-open (default: 1)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from utils.metrics import registry
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Gauge encoding of each state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+breaker_transitions = registry.counter(
+    "aurathent_breaker_transitions_total", "Circuit breaker state changes", ("breaker", "state")
+)
+breaker_shed = registry.counter(
+    "aurathent_breaker_shed_total", "Calls rejected by an open breaker, by how they were answered",
+    ("breaker", "outcome")
+)
+
+# name -> CircuitBreaker, for the state gauge
+_breakers = {}
+
+registry.gauge(
+    "aurathent_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    lambda: {(name,): STATE_VALUES[b.state] for name, b in _breakers.items()}, ("breaker",)
+)
+
+
+class CircuitOpen(RuntimeError):
+    """
+    Raised when a call is rejected because its breaker is open.
+    """
+
+
+class BreakerPolicy:
+    """
+    Thresholds and timings for a CircuitBreaker.
+    """
+
+    def __init__(self, failure_rate=0.5, window=20, min_calls=10, open_seconds=30.0, half_open_calls=1):
+        """
+        Args:
+            failure_rate (float): Failure fraction in the window that trips the breaker
+            window (int): Number of recent calls considered
+            min_calls (int): Calls required in the window before it can trip
+            open_seconds (float): Cool-down before half-open probing
+            half_open_calls (int): Concurrent probes allowed while half-open
+        """
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_calls = min(min_calls, window)
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+    @classmethod
+    def from_env(cls, prefix):
+        return cls(
+            failure_rate=float(os.getenv(f"{prefix}_FAILURE_RATE", 0.5)),
+            window=int(os.getenv(f"{prefix}_WINDOW", 20)),
+            min_calls=int(os.getenv(f"{prefix}_MIN_CALLS", 10)),
+            open_seconds=float(os.getenv(f"{prefix}_OPEN_SECONDS", 30)),
+            half_open_calls=int(os.getenv(f"{prefix}_HALF_OPEN_CALLS", 1))
+        )
+
+
+class CircuitBreaker:
+    """
+    Thread-safe breaker. Callers ask allow() before a call and report the
+    outcome with record(), or release() when it has none; call() does both.
+    """
+
+    def __init__(self, name, policy=None, is_failure=None):
+        """
+        Args:
+            name (str): Metrics label
+            policy (BreakerPolicy, optional): Thresholds (default: BreakerPolicy())
+            is_failure (callable, optional): exception -> bool; exceptions it
+                rejects (e.g. client errors) count as successful calls
+        """
+        self.name = name
+        self.policy = policy or BreakerPolicy()
+        self.is_failure = is_failure or (lambda error: True)
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=self.policy.window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        _breakers[name] = self
+
+    def _transition(self, state):
+        self.state = state
+        breaker_transitions.inc(1, (self.name, state))
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._probes = 0
+
+    def allow(self):
+        """
+        Returns:
+            bool: True if the call may proceed (it must then report its outcome)
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.policy.open_seconds:
+                    return False
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probes >= self.policy.half_open_calls:
+                    return False
+                self._probes += 1
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._transition(CLOSED)
+            elif self.state == CLOSED:
+                self._outcomes.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+            if self.state != CLOSED:
+                return
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self.policy.min_calls:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.policy.failure_rate:
+                    self._transition(OPEN)
+
+    def release(self):
+        """
+        Ends an allowed call without recording an outcome, e.g. one the client
+        abandoned. Frees its half-open probe slot.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record(self, error=None):
+        """
+        Records a finished call; error is the exception it raised, if any.
+        """
+        if error is not None and self.is_failure(error):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def call(self, fn):
+        """
+        Runs fn() if the breaker allows it, recording the outcome.
+
+        Raises:
+            CircuitOpen: If the breaker rejected the call
+        """
+        if not self.allow():
+            raise CircuitOpen(f"Circuit '{self.name}' is {self.state}")
+        try:
+            result = fn()
+        except BaseException as e:
+            self.record(e)
+            raise
+        self.record()
+        return result
+
+    def shed(self, outcome):
+        """
+        Counts a rejected call and how it was answered ("fallback" or "rejected").
+        """
+        breaker_shed.inc(1, (self.name, outcome))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "window_calls": len(self._outcomes),
+                "window_failures": self._outcomes.count(False)
+            }
@@ -0,0 +1,353 @@
+"""
+completion_cache.py
+--------------------
+Content-addressed cache for model completions.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Key completions on a hash of model, prompt and sampling parameters
+    - Serve repeats from an in-process LRU tier, then a persistent SQLite tier
+    - Expire entries after a TTL and evict least-recently-used rows once the
+      SQLite tier outgrows its byte budget
+    - Count hits, misses and evictions for /metrics
+    - Find the cached answer whose prompt is most similar to a new one, as a
+      fallback while the upstream is unavailable
+
+Tiers:
+    memory  OrderedDict LRU shared by all threads of the process (lock-guarded)
+    sqlite  one table in COMPLETION_CACHE_PATH, WAL mode, one connection per thread;
+            survives restarts and is shared between processes on the same host
+
+A disk hit is promoted into the memory tier. Disk rows record when they were
+last read from disk, so entries that stay hot in memory can age out of the
+SQLite tier first; they are written back on the next miss.
+
+Similarity is the Jaccard overlap of lowercase word sets, computed over the
+most recently read SQLite rows that were stored with a prompt.
+
+Configuration (environment):
+    COMPLETION_CACHE_ENABLED    "0" disables caching (default: enabled)
+    COMPLETION_CACHE_PATH       SQLite file (default: cache/completions.sqlite3)
+    COMPLETION_CACHE_TTL        seconds an entry stays valid (default: 604800)
+    COMPLETION_CACHE_MAXSIZE    entries kept in the memory tier (default: 1024)
+    COMPLETION_CACHE_MAX_BYTES  byte budget of the SQLite tier (default: 67108864)
+    CALIBRATION_CACHE_PATH      SQLite file for scroll calibrations (default: cache/calibrations.sqlite3)
+    CALIBRATION_CACHE_TTL       seconds a calibration stays valid (default: 31536000)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from utils.metrics import registry
+
+CACHE_ENABLED = os.getenv("COMPLETION_CACHE_ENABLED", "1") != "0"
+CACHE_PATH = os.getenv("COMPLETION_CACHE_PATH", os.path.join("cache", "completions.sqlite3"))
+CACHE_TTL = float(os.getenv("COMPLETION_CACHE_TTL", 7 * 24 * 3600))
+CACHE_MAXSIZE = int(os.getenv("COMPLETION_CACHE_MAXSIZE", 1024))
+CACHE_MAX_BYTES = int(os.getenv("COMPLETION_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+CALIBRATION_CACHE_PATH = os.getenv("CALIBRATION_CACHE_PATH", os.path.join("cache", "calibrations.sqlite3"))
+CALIBRATION_CACHE_TTL = float(os.getenv("CALIBRATION_CACHE_TTL", 365 * 24 * 3600))
+
+# Size-based eviction runs once per this many writes, not on every put
+EVICT_EVERY = 32
+
+# Rows scanned by most_similar(), most recently read first
+SIMILARITY_SCAN = 2000
+
+_WORD = re.compile(r"\w+")
+
+cache_lookups = registry.counter(
+    "aurathent_completion_cache_lookups_total", "Completion cache lookups by tier and result", ("tier", "result")
+)
+cache_evictions = registry.counter(
+    "aurathent_completion_cache_evictions_total", "Completion cache entries evicted", ("tier", "reason")
+)
+
+
+def completion_key(model, prompt, temperature=None, max_tokens=None, **extra):
+    """
+    Content address of a completion request.
+
+    Args:
+        model (str): Model name
+        prompt (str | list): Prompt text or chat messages
+        temperature (float, optional): Sampling temperature
+        max_tokens (int, optional): Completion length limit
+        **extra: Any other parameter that changes the output
+
+    Returns:
+        str: Hex SHA-256 of the canonical JSON form of the request
+    """
+    canonical = json.dumps(
+        {"model": model, "prompt": prompt, "temperature": temperature, "max_tokens": max_tokens, **extra},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _words(text):
+    return frozenset(_WORD.findall(text.lower()))
+
+
+class CompletionCache:
+    """
+    Two-tier (memory LRU + SQLite) cache of JSON-serializable values.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, maxsize=CACHE_MAXSIZE, max_bytes=CACHE_MAX_BYTES):
+        """
+        Args:
+            path (str | None): SQLite file; None keeps only the memory tier
+            ttl (float): Seconds an entry stays valid
+            maxsize (int): Entries kept in the memory tier
+            max_bytes (int): Byte budget of the SQLite tier
+        """
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+
+        # key -> (expires_at, encoded JSON value)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._db().execute(
+                """
+                CREATE TABLE IF NOT EXISTS completions (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    prompt TEXT
+                )
+                """
+            )
+            columns = {row[1] for row in self._db().execute("PRAGMA table_info(completions)")}
+            if "prompt" not in columns:
+                self._db().execute("ALTER TABLE completions ADD COLUMN prompt TEXT")
+            self._db().execute("CREATE INDEX IF NOT EXISTS completions_last_access ON completions (last_access)")
+
+    def _db(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -------------------------------------------------------------------------
+    # Memory tier
+    # -------------------------------------------------------------------------
+    def _memory_get(self, key, now):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._memory[key]
+                cache_evictions.inc(1, ("memory", "expired"))
+                return None
+            self._memory.move_to_end(key)
+            return entry[1]
+
+    def _memory_put(self, key, encoded, expires_at):
+        with self._lock:
+            self._memory[key] = (expires_at, encoded)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+                cache_evictions.inc(1, ("memory", "size"))
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+    def get(self, key):
+        """
+        Returns:
+            object | None: Cached value, or None on a miss
+        """
+        now = time.time()
+        encoded = self._memory_get(key, now)
+        if encoded is not None:
+            cache_lookups.inc(1, ("memory", "hit"))
+            return json.loads(encoded)
+
+        if self.path:
+            db = self._db()
+            row = db.execute(
+                "SELECT value, expires_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                db.execute("UPDATE completions SET last_access = ? WHERE key = ?", (now, key))
+                self._memory_put(key, row[0], row[1])
+                cache_lookups.inc(1, ("sqlite", "hit"))
+                return json.loads(row[0])
+            if row is not None:
+                db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                cache_evictions.inc(1, ("sqlite", "expired"))
+
+        cache_lookups.inc(1, ("all", "miss"))
+        return None
+
+    def put(self, key, value, ttl=None, prompt=None):
+        """
+        Stores a JSON-serializable value in both tiers.
+
+        Args:
+            prompt (str, optional): Prompt text, kept for most_similar()
+        """
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        encoded = json.dumps(value, ensure_ascii=False)
+        self._memory_put(key, encoded, expires_at)
+
+        if not self.path:
+            return
+        self._db().execute(
+            "INSERT OR REPLACE INTO completions (key, value, size, expires_at, last_access, prompt) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, encoded, len(encoded.encode("utf-8")), expires_at, now, prompt)
+        )
+        with self._lock:
+            self._writes += 1
+            due = self._writes % EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def most_similar(self, prompt, min_similarity=0.5, scan=SIMILARITY_SCAN):
+        """
+        Returns:
+            tuple | None: (value, cached prompt, similarity) of the closest
+            unexpired entry at or above min_similarity, or None
+        """
+        if not self.path:
+            return None
+        rows = self._db().execute(
+            "SELECT prompt, value FROM completions WHERE prompt IS NOT NULL AND expires_at > ? "
+            "ORDER BY last_access DESC LIMIT ?",
+            (time.time(), scan)
+        )
+        target = _words(prompt)
+        if not target:
+            return None
+
+        best = None
+        best_score = min_similarity
+        for cached_prompt, encoded in rows:
+            words = _words(cached_prompt)
+            if not words:
+                continue
+            score = len(target & words) / len(target | words)
+            if score >= best_score:
+                best, best_score = (cached_prompt, encoded), score
+                if score == 1.0:
+                    break
+        if best is None:
+            return None
+        return json.loads(best[1]), best[0], best_score
+
+    def evict(self):
+        """
+        Drops expired rows, then the least recently used rows beyond max_bytes.
+
+        Returns:
+            int: Rows removed from the SQLite tier
+        """
+        if not self.path:
+            return 0
+        db = self._db()
+        expired = db.execute("DELETE FROM completions WHERE expires_at <= ?", (time.time(),)).rowcount
+        oversized = db.execute(
+            """
+            DELETE FROM completions WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY last_access DESC, key) AS running
+                    FROM completions
+                ) WHERE running > ?
+            )
+            """,
+            (self.max_bytes,)
+        ).rowcount
+        if expired:
+            cache_evictions.inc(expired, ("sqlite", "expired"))
+        if oversized:
+            cache_evictions.inc(oversized, ("sqlite", "size"))
+        return expired + oversized
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            self._db().execute("DELETE FROM completions")
+
+    def stats(self):
+        """
+        Returns:
+            dict: Entry counts per tier and bytes held by the SQLite tier
+        """
+        with self._lock:
+            memory_entries = len(self._memory)
+        stats = {"memory_entries": memory_entries, "sqlite_entries": 0, "sqlite_bytes": 0}
+        if self.path:
+            count, size = self._db().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+            stats["sqlite_entries"] = count
+            stats["sqlite_bytes"] = size
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_completion_cache():
+    """
+    Returns:
+        CompletionCache | None: Process-wide cache, or None when disabled
+    """
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CompletionCache()
+                registry.gauge(
+                    "aurathent_completion_cache_size", "Completion cache entries and bytes",
+                    lambda: {(k,): v for k, v in _cache.stats().items()}, ("stat",)
+                )
+    return _cache
+
+
+_calibration_cache = None
+
+
+def get_calibration_cache():
+    """
+    Returns:
+        CompletionCache: Process-wide cache for the scroll calibration scripts,
+        kept in its own file so echo traffic never evicts calibrations
+    """
+    global _calibration_cache
+    if _calibration_cache is None:
+        with _cache_lock:
+            if _calibration_cache is None:
+                _calibration_cache = CompletionCache(path=CALIBRATION_CACHE_PATH, ttl=CALIBRATION_CACHE_TTL)
+                registry.gauge(
+                    "aurathent_calibration_cache_size", "Calibration cache entries and bytes",
+                    lambda: {(k,): v for k, v in _calibration_cache.stats().items()}, ("stat",)
+                )
+    return _calibration_cache
@@ -18,6 +18,7 @@ from utils.phoenix_eye import detect_aura_shift
 from utils.lapis_index import trigger_lapis_event
 from models.query_log import log_event
 from models.transmutation_record import record_transmutation
+from utils.metrics import stage_timer
 
 def sanctify_input(user_id, emotion, virtue, breath_cycle=1, memory_tag=None):
     """
@@ -35,33 +36,38 @@ def sanctify_input(user_id, emotion, virtue, breath_cycle=1, memory_tag=None):
     """
     try:
         # A) Calculate symbolic mana
-        mana = convert_experience_to_mana(emotion, virtue) * breath_cycle
+        with stage_timer("sanctify", "mana"):
+            mana = convert_experience_to_mana(emotion, virtue) * breath_cycle
 
         # B) Detect aura state
-        aura_result = detect_aura_shift(mana, memory_tag)
+        with stage_timer("sanctify", "aura"):
+            aura_result = detect_aura_shift(mana, memory_tag)
 
         # C) Trigger divine logic (lapis)
-        lapis_triggered = trigger_lapis_event(virtue, memory_tag)
+        with stage_timer("sanctify", "lapis"):
+            lapis_triggered = trigger_lapis_event(virtue, memory_tag)
 
         # D) Record to symbolic transmutation history
-        record = record_transmutation(
-            user_id,
-            emotion,
-            virtue,
-            mana,
-            aura_result["aura_tier"],
-            lapis_triggered
-        )
+        with stage_timer("sanctify", "record"):
+            record = record_transmutation(
+                user_id,
+                emotion,
+                virtue,
+                mana,
+                aura_result,
+                lapis_triggered
+            )
 
         # E) Log it
-        log_event("core_sanctifier", {
-            "user": user_id,
-            "virtue": virtue,
-            "emotion": emotion,
-            "mana": mana,
-            "aura": aura_result,
-            "lapis": lapis_triggered
-        })
+        with stage_timer("sanctify", "log"):
+            log_event("core_sanctifier", {
+                "user": user_id,
+                "virtue": virtue,
+                "emotion": emotion,
+                "mana": mana,
+                "aura": aura_result,
+                "lapis": lapis_triggered
+            })
 
         return {
             "status": "sanctified",
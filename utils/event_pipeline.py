@@ -0,0 +1,339 @@
+"""
+event_pipeline.py
+------------------
+Queue-backed writer for symbolic system events.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Take structured events off the request thread with a non-blocking enqueue
+    - Drain them in batches from a background writer to stdout, file or Postgres
+    - Filter by level and sample per module before anything is queued
+    - Report enqueue latency and drop counts when the queue applies backpressure
+
+Configuration (environment, read when the default pipeline is first used):
+    EVENT_LOG_SINKS       comma list of "stdout", "file", "postgres" (default: stdout)
+    EVENT_LOG_FILE        path for the file sink (default: system_events.log)
+    EVENT_LOG_LEVEL       minimum level: debug, info, warning, error (default: info)
+    EVENT_LOG_SAMPLING    per-module rates, e.g. "phoenix_eye=0.1,lapis_index=0.5"
+    EVENT_LOG_QUEUE_SIZE  maximum queued events before drops (default: 10000)
+"""
+
+import atexit
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+LEVELS = {
+    "debug":   10,
+    "info":    20,
+    "warning": 30,
+    "error":   40
+}
+
+
+# -----------------------------------------------------------------------------
+# Sinks
+# -----------------------------------------------------------------------------
+class StdoutSink:
+    """
+    Writes each batch to stdout in the legacy "[LOG EVENT]" line format.
+    """
+
+    def write_batch(self, events):
+        lines = [
+            f"[LOG EVENT] {e['timestamp']} :: [{e['event']}] {e['details']}"
+            for e in events
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+
+class FileSink:
+    """
+    Appends each batch as newline-delimited JSON.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def write_batch(self, events):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(e, default=str) + "\n" for e in events))
+
+
+class PostgresSink:
+    """
+    Inserts each batch into Postgres with a single multi-row INSERT.
+    """
+
+    def __init__(self, table="system_events"):
+        self.table = table
+        self._table_ready = False
+
+    def write_batch(self, events):
+        # Imported here so the pipeline never forces a DB driver on callers
+        from psycopg2.extras import Json, execute_values
+        from database import get_postgres_connection, release_postgres_connection
+
+        conn = get_postgres_connection()
+        if conn is None:
+            raise RuntimeError("No Postgres connection available")
+
+        try:
+            with conn.cursor() as cur:
+                if not self._table_ready:
+                    cur.execute(f"""
+                        CREATE TABLE IF NOT EXISTS {self.table} (
+                            id BIGSERIAL PRIMARY KEY,
+                            module TEXT NOT NULL,
+                            level TEXT NOT NULL,
+                            logged_at TIMESTAMP NOT NULL,
+                            details JSONB
+                        )
+                    """)
+                    self._table_ready = True
+
+                execute_values(
+                    cur,
+                    f"INSERT INTO {self.table} (module, level, logged_at, details) VALUES %s",
+                    [
+                        (e["event"], e.get("level", "info"), e["timestamp"],
+                         Json(e["details"], dumps=lambda d: json.dumps(d, default=str)))
+                        for e in events
+                    ]
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            release_postgres_connection(conn)
+
+
+# -----------------------------------------------------------------------------
+# Pipeline
+# -----------------------------------------------------------------------------
+class EventPipeline:
+    """
+    Bounded queue between request threads and a single background writer.
+    """
+
+    def __init__(self, sinks=None, maxsize=10000, batch_size=256,
+                 flush_interval=0.5, level="info", sampling=None):
+        """
+        Args:
+            sinks (list): Objects exposing write_batch(events)
+            maxsize (int): Queue capacity; events beyond it are dropped
+            batch_size (int): Maximum events handed to the sinks per write
+            flush_interval (float): Seconds the writer waits for new events
+            level (str): Minimum level accepted by submit()
+            sampling (dict): Module name -> keep rate between 0.0 and 1.0
+        """
+        self.sinks = sinks if sinks is not None else [StdoutSink()]
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.min_level = LEVELS.get(level, LEVELS["info"])
+        self.sampling = dict(sampling or {})
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "filtered": 0,
+            "sampled_out": 0,
+            "sink_errors": 0,
+            "batches": 0,
+            "enqueue_seconds_total": 0.0,
+            "enqueue_seconds_max": 0.0
+        }
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="event-pipeline-writer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        """
+        Signals the writer to drain what is queued and exit.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def flush(self):
+        """
+        Blocks until every event queued so far has been handed to the sinks.
+        """
+        self._queue.join()
+
+    def submit(self, event, level="info"):
+        """
+        Offers an event to the pipeline without blocking the caller.
+
+        Args:
+            event (dict): Structured event with "event", "timestamp", "details"
+            level (str): Severity name from LEVELS
+
+        Returns:
+            bool: True if queued, False if filtered, sampled out or dropped
+        """
+        if LEVELS.get(level, LEVELS["info"]) < self.min_level:
+            self._bump("filtered")
+            return False
+
+        rate = self.sampling.get(event.get("event"))
+        if rate is not None and random.random() >= rate:
+            self._bump("sampled_out")
+            return False
+
+        start = time.perf_counter()
+        try:
+            self._queue.put_nowait(dict(event, level=level))
+        except queue.Full:
+            self._bump("dropped")
+            return False
+        elapsed = time.perf_counter() - start
+
+        with self._stats_lock:
+            self._stats["enqueued"] += 1
+            self._stats["enqueue_seconds_total"] += elapsed
+            if elapsed > self._stats["enqueue_seconds_max"]:
+                self._stats["enqueue_seconds_max"] = elapsed
+        return True
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counters plus queue depth and enqueue latency in milliseconds
+        """
+        with self._stats_lock:
+            snapshot = dict(self._stats)
+
+        enqueued = snapshot.pop("enqueued")
+        total = snapshot.pop("enqueue_seconds_total")
+        peak = snapshot.pop("enqueue_seconds_max")
+
+        snapshot.update({
+            "enqueued": enqueued,
+            "queue_depth": self._queue.qsize(),
+            "enqueue_latency_ms": {
+                "avg": round(total / enqueued * 1000, 4) if enqueued else 0.0,
+                "max": round(peak * 1000, 4)
+            }
+        })
+        return snapshot
+
+    def _bump(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for sink in self.sinks:
+                try:
+                    sink.write_batch(batch)
+                except Exception as e:
+                    self._bump("sink_errors")
+                    print(f"[event_pipeline] {type(sink).__name__} failed: {e}", file=sys.stderr)
+
+            self._bump("written", len(batch))
+            self._bump("batches")
+            for _ in batch:
+                self._queue.task_done()
+
+
+# -----------------------------------------------------------------------------
+# Process-wide default pipeline
+# -----------------------------------------------------------------------------
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def _parse_sampling(spec):
+    rates = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        module, _, rate = part.partition("=")
+        rates[module.strip()] = float(rate)
+    return rates
+
+
+def pipeline_from_env():
+    """
+    Builds a pipeline from the EVENT_LOG_* environment variables.
+    """
+    sinks = []
+    for name in os.getenv("EVENT_LOG_SINKS", "stdout").split(","):
+        name = name.strip().lower()
+        if name == "stdout":
+            sinks.append(StdoutSink())
+        elif name == "file":
+            sinks.append(FileSink(os.getenv("EVENT_LOG_FILE", "system_events.log")))
+        elif name == "postgres":
+            sinks.append(PostgresSink())
+
+    return EventPipeline(
+        sinks=sinks,
+        maxsize=int(os.getenv("EVENT_LOG_QUEUE_SIZE", 10000)),
+        level=os.getenv("EVENT_LOG_LEVEL", "info").lower(),
+        sampling=_parse_sampling(os.getenv("EVENT_LOG_SAMPLING", ""))
+    )
+
+
+def get_event_pipeline():
+    """
+    Returns the running process-wide pipeline, creating it on first use.
+    """
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = pipeline_from_env().start()
+    return _pipeline
+
+
+def configure_event_pipeline(pipeline):
+    """
+    Replaces the process-wide pipeline, draining the previous one first.
+
+    Args:
+        pipeline (EventPipeline): The new pipeline (started here if needed)
+
+    Returns:
+        EventPipeline: The active pipeline
+    """
+    global _pipeline
+    with _pipeline_lock:
+        previous, _pipeline = _pipeline, pipeline.start()
+    if previous is not None:
+        previous.stop()
+    return _pipeline
+
+
+@atexit.register
+def _drain_on_exit():
+    if _pipeline is not None:
+        _pipeline.stop()
@@ -0,0 +1,114 @@
+"""
+evolution_engine.py
+--------------------
+Detects virtue threshold crossings and publishes evolution events.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Compare each virtue increment against VIRTUE_THRESHOLDS in O(1)
+    - Fire an event only when a new evolution stage is actually reached
+    - Apply KI amplification tiers from the same precomputed table
+    - Let downstream modules subscribe to crossings instead of rescanning profiles
+
+Staging:
+    stage = level // threshold, so "wisdom" (threshold 7) crosses into
+    stage 1 at level 7, stage 2 at level 14, and so on. Stage n uses the
+    n-th KI tier by amplification (low, moderate, high), capped at the top tier.
+"""
+
+import threading
+from datetime import datetime
+from types import MappingProxyType
+
+from config.constants import VIRTUE_THRESHOLDS, KI_AMPLIFIER
+from models.query_log import log_event
+from models.vocabulary import intern, symbol
+
+# KI tiers ordered from weakest to strongest amplification
+KI_TIERS = tuple(sorted(KI_AMPLIFIER.items(), key=lambda item: item[1]))
+
+# virtue id -> (threshold, KI tiers), built once at import
+EVOLUTION_TABLE = MappingProxyType({
+    intern(virtue): (threshold, KI_TIERS)
+    for virtue, threshold in VIRTUE_THRESHOLDS.items()
+})
+
+_subscribers = []
+_subscribers_lock = threading.Lock()
+
+
+def subscribe(callback):
+    """
+    Registers a callable invoked with every crossing event.
+
+    Args:
+        callback (callable): Receives the event dict
+
+    Returns:
+        callable: The callback, so this can be used as a decorator
+    """
+    with _subscribers_lock:
+        if callback not in _subscribers:
+            _subscribers.append(callback)
+    return callback
+
+
+def unsubscribe(callback):
+    with _subscribers_lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def publish(event):
+    """
+    Delivers an event to every subscriber; a failing subscriber never blocks the rest.
+    """
+    for callback in tuple(_subscribers):
+        try:
+            callback(event)
+        except Exception as e:
+            log_event("evolution_engine", {
+                "subscriber": getattr(callback, "__name__", repr(callback)),
+                "error": str(e)
+            }, level="error")
+
+
+def evaluate_increment(user_id, virtue_id, previous_level, new_level):
+    """
+    Checks whether a virtue increment crosses into a new evolution stage.
+
+    Args:
+        user_id (str): The user whose virtue changed
+        virtue_id (SymbolId | str): intern() result for the incremented virtue
+        previous_level (int): Level before the increment
+        new_level (int): Level after the increment
+
+    Returns:
+        dict | None: The published crossing event, or None if no stage was crossed
+    """
+    entry = EVOLUTION_TABLE.get(virtue_id)
+    if entry is None:
+        return None
+
+    threshold, ki_tiers = entry
+    stage = new_level // threshold
+    if stage <= previous_level // threshold:
+        return None
+
+    ki_tier, amplifier = ki_tiers[min(stage, len(ki_tiers)) - 1]
+    event = {
+        "user_id": user_id,
+        "virtue": symbol(virtue_id),
+        "stage": stage,
+        "threshold": threshold,
+        "level": new_level,
+        "ki_tier": ki_tier,
+        "ki_amplifier": amplifier,
+        "amplified_level": round(new_level * amplifier, 2),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+    log_event("evolution_engine", event)
+    publish(event)
+    return event
@@ -9,11 +9,17 @@ Purpose:
     - Analyze emotional/virtue paradoxes to detect high-impact symbolic events
     - Output narrative-coded "flames" based on energetic strain and internal contradiction
     - Resolve paradox chains for symbolic analysis and class evaluation
+    - Read paradox rules from the compiled tables in utils.symbolic_rules
 """
 
+from utils.memo import memoized
+from utils.symbolic_rules import current_rules, pair_key
+
+
 # -----------------------------------------------
 # Evaluate symbolic paradox strength
 # -----------------------------------------------
+@memoized()
 def evaluate_paradox(emotion, virtue):
     """
     Determine whether the input pair creates a symbolic paradox.
@@ -25,22 +31,13 @@ def evaluate_paradox(emotion, virtue):
     Returns:
         tuple: (paradox_level: int, flame_name: str)
     """
-    paradox_pairs = {
-        ("fear", "courage"): (5, "Black Flame of Insight"),
-        ("anger", "forgiveness"): (4, "Crimson Wreath"),
-        ("grief", "joy"): (3, "Ashen Blossom"),
-        ("envy", "gratitude"): (4, "Emerald Flicker"),
-        ("pride", "humility"): (5, "Ivory Fire")
-    }
-
-    key = (emotion.lower(), virtue.lower())
-    reversed_key = (virtue.lower(), emotion.lower())
-
-    return paradox_pairs.get(key) or paradox_pairs.get(reversed_key) or (1, "Dim Spark")
+    rules = current_rules()
+    return rules.paradox_pairs.get(pair_key(emotion, virtue), rules.paradox_default)
 
 # -----------------------------------------------
 # Resolve paradox and return symbolic structure
 # -----------------------------------------------
+@memoized()
 def resolve_paradox_chain(virtue, emotion):
     """
     Resolves symbolic paradoxes between virtues and emotions
@@ -60,20 +57,7 @@ def resolve_paradox_chain(virtue, emotion):
     """
     fire_level, flame = evaluate_paradox(emotion, virtue)
 
-    paradox_map = {
-        ("compassion", "anger"): "Forgiveness inside rage births growth.",
-        ("truth", "fear"): "Courage to reveal what is hidden.",
-        ("wisdom", "grief"): "Loss is the tutor of insight.",
-        ("honor", "shame"): "Integrity tested by failure yields purity.",
-        ("fear", "courage"): "Fear faced with courage creates transformation.",
-        ("pride", "humility"): "Pride restrained by humility reveals divinity.",
-        ("envy", "gratitude"): "Gratitude dissolves the green fog of envy."
-    }
-
-    key = (virtue.lower(), emotion.lower())
-    reversed_key = (emotion.lower(), virtue.lower())
-
-    symbolic_description = paradox_map.get(key) or paradox_map.get(reversed_key) or (
+    symbolic_description = current_rules().paradox_descriptions.get(pair_key(virtue, emotion)) or (
         f"No paradox detected between {virtue} and {emotion}."
     )
 
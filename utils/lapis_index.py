@@ -12,6 +12,8 @@ Purpose:
 """
 
 from models.query_log import log_event
+from models.vocabulary import normalize
+from utils.symbolic_rules import current_rules
 
 def trigger_lapis_event(virtue, memory_tag=None):
     """
@@ -24,12 +26,9 @@ def trigger_lapis_event(virtue, memory_tag=None):
     Returns:
         dict: Details of whether lapis logic was triggered and why.
     """
-
-    lapis_virtues = {"truth", "sacrifice", "wisdom", "insight", "reverence"}
-    amplified_contexts = {"death", "destiny", "origin", "betrayal", "childhood"}
-
-    virtue_hit = virtue.lower() in lapis_virtues
-    memory_hit = memory_tag and memory_tag.lower() in amplified_contexts
+    rules = current_rules()
+    virtue_hit = normalize(virtue) in rules.lapis_virtues
+    memory_hit = memory_tag and normalize(memory_tag) in rules.amplified_contexts
 
     triggered = virtue_hit or (virtue_hit and memory_hit)
 
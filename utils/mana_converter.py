@@ -10,8 +10,15 @@ Purpose:
     - Weigh emotion and virtue synergy
     - Normalize scores into symbolic energy outputs
     - Prepare symbolic payload for aura shift or paradox ignition
+    - Score whole batches of pairs at once over NumPy arrays
 """
 
+import numpy as np
+
+from utils.memo import memoized
+
+
+@memoized()
 def convert_experience_to_mana(emotion, virtue):
     """
     Converts emotional and virtue input into a symbolic mana value.
@@ -29,3 +36,27 @@ def convert_experience_to_mana(emotion, virtue):
 
     mana = emotion_weight + virtue_weight + synergy_bonus
     return mana
+
+
+def convert_experiences_to_mana(emotions, virtues):
+    """
+    Vectorized form of convert_experience_to_mana for batch transmutation.
+
+    Args:
+        emotions (list[str]): Emotional states, one per pair.
+        virtues (list[str]): Aligned virtues, index-matched to emotions.
+
+    Returns:
+        numpy.ndarray: Integer mana scores in input order.
+    """
+    emotion_arr = np.asarray(emotions, dtype=str)
+    virtue_arr = np.asarray(virtues, dtype=str)
+
+    emotion_weight = np.char.str_len(emotion_arr) * 3
+    virtue_weight = np.char.str_len(virtue_arr) * 5
+
+    # Casting to a one-character dtype keeps only the leading symbol
+    synergy = np.char.lower(emotion_arr.astype("U1")) == np.char.lower(virtue_arr.astype("U1"))
+    synergy_bonus = np.where(synergy, 10, 0)
+
+    return (emotion_weight + virtue_weight + synergy_bonus).astype(np.int64)
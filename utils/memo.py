@@ -0,0 +1,92 @@
+"""
+memo.py
+--------
+Bounded LRU memoization for the pure symbolic scoring functions.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Cache results of pure (emotion, virtue[, fatigue]) scorers behind functools.lru_cache
+    - Hand every caller its own copy of mutable results, so a caller editing a
+      returned dict can never corrupt the cache
+    - Keep a registry of memoized functions for hit-rate metrics and bulk clearing
+
+Only pure functions belong here: anything that logs, records or reads the
+clock must stay outside the cached call.
+
+Configuration (environment):
+    MEMO_MAXSIZE    entries kept per memoized function (default: 4096)
+"""
+
+import copy
+import os
+from functools import lru_cache, wraps
+
+DEFAULT_MAXSIZE = int(os.getenv("MEMO_MAXSIZE", 4096))
+
+# name -> memoized wrapper
+_registry = {}
+
+# Part of every cache key; bumped by clear_caches() so a result computed
+# against old tables can never be served after an invalidation
+_generation = [0]
+
+
+def memoized(maxsize=None, name=None):
+    """
+    Decorator adding a bounded LRU cache to a pure function.
+
+    Args:
+        maxsize (int, optional): Cached entries (default: MEMO_MAXSIZE)
+        name (str, optional): Registry name (default: module.qualname)
+
+    Returns:
+        callable: Decorator; the wrapped function gains cache_info() and cache_clear()
+    """
+    def decorate(func):
+        @lru_cache(maxsize=maxsize or DEFAULT_MAXSIZE)
+        def cached(generation, *args, **kwargs):
+            return func(*args, **kwargs)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            result = cached(_generation[0], *args, **kwargs)
+            # Tuples and scalars are immutable; dicts and lists are copied per caller
+            if isinstance(result, (dict, list)):
+                return copy.copy(result)
+            return result
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        _registry[name or f"{func.__module__}.{func.__qualname__}"] = wrapper
+        return wrapper
+
+    return decorate
+
+
+def cache_stats():
+    """
+    Returns:
+        dict: {name: {"hits", "misses", "size", "maxsize", "hit_rate"}}
+    """
+    stats = {}
+    for name, func in _registry.items():
+        info = func.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_rate": round(info.hits / lookups, 4) if lookups else None
+        }
+    return stats
+
+
+def clear_caches():
+    """
+    Empties every memoized function's cache (e.g. after scoring tables change).
+    """
+    _generation[0] += 1
+    for func in _registry.values():
+        func.cache_clear()
@@ -0,0 +1,389 @@
+"""
+metrics.py
+-----------
+Low-overhead counters, histograms and gauges exposed in Prometheus text format.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Time every blueprint route and each pipeline stage (mana, aura, lapis, record, log)
+    - Record Postgres pool checkout waits and in-memory store sizes
+    - Serve everything at /metrics for Prometheus scrapes
+
+Design:
+    Each thread writes only to its own shard (a plain dict reached through
+    threading.local), so recording takes no lock. A scrape sums the shards;
+    shards of finished threads are folded into a retired total and dropped,
+    which keeps thread-per-request servers from growing the shard list.
+    Gauges are callbacks evaluated at scrape time.
+
+Configuration (environment):
+    METRICS_ENABLED   "0" disables route and stage timing (default: enabled)
+"""
+
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
+# Seconds; suits both sub-millisecond stages and slow Postgres checkouts
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _ShardedMetric:
+    """
+    Base for metrics whose values live in per-thread shards.
+
+    A shard maps a label-values tuple to that thread's cell for the series.
+    """
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []           # (thread, shard)
+        self._retired = {}          # merged cells of finished threads
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _new_cell(self):
+        raise NotImplementedError
+
+    def _merge_cell(self, into, cell):
+        raise NotImplementedError
+
+    def _collect(self):
+        """
+        Returns:
+            dict: label values -> merged cell across all threads
+        """
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._fold(self._retired, shard)
+            self._shards = live
+            merged = {}
+            self._fold(merged, self._retired)
+            for _, shard in live:
+                self._fold(merged, shard)
+        return merged
+
+    def _fold(self, into, shard):
+        # list() snapshots the keys; the owning thread may be adding series
+        for labels in list(shard):
+            cell = into.get(labels)
+            if cell is None:
+                cell = into[labels] = self._new_cell()
+            self._merge_cell(cell, shard[labels])
+
+
+class Counter(_ShardedMetric):
+    """
+    Monotonic count, e.g. requests served.
+    """
+
+    kind = "counter"
+
+    def inc(self, amount=1, labels=()):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _new_cell(self):
+        return [0]
+
+    def _merge_cell(self, into, cell):
+        into[0] += cell[0] if isinstance(cell, list) else cell
+
+    def samples(self):
+        for labels, cell in sorted(self._collect().items()):
+            yield self.name, _format_labels(self.labelnames, labels), cell[0]
+
+
+class Histogram(_ShardedMetric):
+    """
+    Bucketed distribution of observations (cumulative buckets on scrape).
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, labels=()):
+        shard = self._shard()
+        cell = shard.get(labels)
+        if cell is None:
+            # [bucket counts..., +Inf count, sum]
+            cell = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def time(self, labels=()):
+        return _Timer(self, labels)
+
+    def _new_cell(self):
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def _merge_cell(self, into, cell):
+        for i, value in enumerate(cell):
+            into[i] += value
+
+    def samples(self):
+        for labels, cell in sorted(self._collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), cell):
+                cumulative += count
+                le = 'le="' + _format_value(float(bound)) + '"'
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, labels, le), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labelnames, labels), cell[-1]
+            yield f"{self.name}_count", _format_labels(self.labelnames, labels), cumulative
+
+
+class Gauge:
+    """
+    Value read from a callback at scrape time.
+
+    The callback returns a number, or a dict of label-values tuple -> number.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, callback, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self):
+        value = self.callback()
+        if not isinstance(value, dict):
+            value = {(): value}
+        for labels, number in sorted(value.items()):
+            if number is not None:
+                yield self.name, _format_labels(self.labelnames, labels), number
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, self.labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """
+    Named collection of metrics rendered together.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, callback, labelnames=()):
+        return self.register(Gauge(name, documentation, callback, labelnames))
+
+    def render(self):
+        """
+        Returns:
+            str: Every metric in Prometheus text exposition format (0.0.4)
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            try:
+                samples = list(metric.samples())
+            except Exception as e:
+                lines.append(f"# {metric.name} collection failed: {_escape(e)}")
+                continue
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in samples:
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# -----------------------------------------------------------------------------
+# Process-wide registry and the metrics every module shares
+# -----------------------------------------------------------------------------
+registry = MetricsRegistry()
+
+request_latency = registry.histogram(
+    "aurathent_request_seconds", "Request latency by route", ("route", "method")
+)
+requests_total = registry.counter(
+    "aurathent_requests_total", "Requests served by route and status", ("route", "method", "status")
+)
+stage_latency = registry.histogram(
+    "aurathent_stage_seconds", "Latency of symbolic pipeline stages", ("pipeline", "stage")
+)
+pool_wait = registry.histogram(
+    "aurathent_pg_pool_wait_seconds", "Time spent checking a connection out of the Postgres pool"
+)
+pool_checkout_failures = registry.counter(
+    "aurathent_pg_pool_checkout_failures_total", "Postgres pool checkouts that raised"
+)
+
+
+def stage_timer(pipeline, stage):
+    """
+    Context manager timing one pipeline stage, e.g. stage_timer("breath", "mana").
+    """
+    if not METRICS_ENABLED:
+        return _NULL_TIMER
+    return stage_latency.time((pipeline, stage))
+
+
+def register_store_gauges():
+    """
+    Registers scrape-time gauges for in-memory stores, the memo caches and
+    the event pipeline. Imports are local so database/models can import this
+    module without cycles.
+    """
+    from models import aura_model, symbolic_memory, transmutation_record, virtue_profile
+    from models import virtue_leaderboard, transmutation_store
+    from models.query_log import get_retention_stats
+    from models.vocabulary import vocabulary
+    from utils import chrono_synth
+    from utils.event_pipeline import get_event_pipeline
+    from utils.memo import cache_stats
+
+    def store_sizes():
+        retention = get_retention_stats()
+        return {
+            ("query_log_events",): retention["retained"],
+            ("query_log_keys",): retention["keys"],
+            ("transmutation_rows",): len(transmutation_record.transmutation_records),
+            ("transmutation_users",): len(transmutation_record.transmutation_records.user_rows),
+            ("transmutation_pending_writes",): transmutation_store.writer.pending_count(),
+            ("memory_users",): len(symbolic_memory.memory_store),
+            ("chrono_timelines",): len(chrono_synth.timelines),
+            ("aura_users",): len(aura_model.aura_registry),
+            ("virtue_profiles",): len(virtue_profile.user_profiles),
+            ("leaderboard_users",): len(virtue_leaderboard.global_board),
+            ("vocabulary_symbols",): len(vocabulary),
+            ("vocabulary_overflows",): vocabulary.overflows,
+        }
+
+    def memo_series(field):
+        return lambda: {(name,): stats[field] for name, stats in cache_stats().items()}
+
+    def pipeline_series():
+        stats = get_event_pipeline().stats()
+        return {
+            (key,): value for key, value in stats.items() if isinstance(value, (int, float))
+        }
+
+    registry.gauge("aurathent_store_size", "Entries held by in-memory stores", store_sizes, ("store",))
+    registry.gauge("aurathent_memo_hits", "Memo cache hits", memo_series("hits"), ("function",))
+    registry.gauge("aurathent_memo_misses", "Memo cache misses", memo_series("misses"), ("function",))
+    registry.gauge("aurathent_memo_size", "Memo cache entries", memo_series("size"), ("function",))
+    registry.gauge(
+        "aurathent_event_pipeline", "Event pipeline counters and queue depth", pipeline_series, ("stat",)
+    )
+
+
+def init_metrics(app):
+    """
+    Times every request and serves /metrics.
+    Call this from create_app() after the blueprints are registered.
+    """
+    from flask import Response, g, request
+
+    register_store_gauges()
+
+    if METRICS_ENABLED:
+        @app.before_request
+        def _start_request_timer():
+            g._metrics_start = time.perf_counter()
+
+        @app.after_request
+        def _record_request(response):
+            start = g.pop("_metrics_start", None)
+            if start is not None:
+                rule = request.url_rule
+                route = rule.rule if rule is not None else "unmatched"
+                request_latency.observe(time.perf_counter() - start, (route, request.method))
+                requests_total.inc(1, (route, request.method, str(response.status_code)))
+            return response
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return Response(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,379 @@
+"""
+openai_gateway.py
+------------------
+Shared entry point for every upstream OpenAI call.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Hold one OpenAI client per process, so its HTTP connection pool and
+      keep-alive connections are reused across requests and scripts
+    - Coalesce identical in-flight requests into a single upstream call
+      (single-flight): followers wait for the leader and share its result
+    - Cap concurrent upstream calls with a semaphore; callers that cannot get
+      a slot within the queue timeout fail fast with GatewayBusy
+    - Stream completions delta by delta while holding an upstream slot
+    - Bound every call by a deadline and guard the upstream with a circuit
+      breaker (utils/circuit_breaker.py); calls fail fast with CircuitOpen
+      while it is open
+    - Report in-flight calls, queue waits, coalesced and rejected requests
+    - Give offline callers (the calibration scripts) a longer deadline and a
+      shared retry-with-backoff helper
+
+Only identical requests are coalesced: the key is completion_key() over the
+model, messages and every sampling parameter. Streams are never coalesced.
+
+The deadline covers the wait for a slot plus the upstream request; for streams
+it bounds the wait for each chunk. The SDK does not retry inside a deadline:
+retries belong to callers (see call_with_retry), and each attempt counts
+towards the breaker.
+Timeouts, connection errors, 429 and 5xx responses and GatewayBusy count as
+breaker failures; other 4xx responses do not.
+
+Configuration (environment):
+    OPENAI_KEY / OPENAI_API_KEY    API key (OPENAI_KEY wins when both are set)
+    OPENAI_MAX_CONCURRENCY         concurrent upstream calls (default: 8)
+    OPENAI_QUEUE_TIMEOUT           seconds to wait for a slot (default: 10)
+    OPENAI_DEADLINE                default per-call deadline in seconds (default: 20)
+    CALIBRATION_DEADLINE           per-call deadline for the calibration scripts (default: 600)
+    OPENAI_BREAKER_*               breaker thresholds, see utils/circuit_breaker.py
+"""
+
+import os
+import random
+import threading
+import time
+
+from openai import APIConnectionError, APIStatusError, APITimeoutError, OpenAI
+
+from utils.circuit_breaker import BreakerPolicy, CircuitBreaker, CircuitOpen
+from utils.completion_cache import completion_key
+from utils.metrics import registry
+
+MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", 8))
+QUEUE_TIMEOUT = float(os.getenv("OPENAI_QUEUE_TIMEOUT", 10))
+DEADLINE = float(os.getenv("OPENAI_DEADLINE", 20))
+# Offline scripts keep the SDK's own default timeout rather than the web deadline
+CALIBRATION_DEADLINE = float(os.getenv("CALIBRATION_DEADLINE", 600))
+
+# Jittered exponential backoff between call_with_retry attempts
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+upstream_calls = registry.counter(
+    "aurathent_openai_calls_total", "Upstream OpenAI calls by caller and outcome", ("caller", "outcome")
+)
+upstream_latency = registry.histogram(
+    "aurathent_openai_call_seconds", "Upstream OpenAI call latency", ("caller",)
+)
+queue_wait = registry.histogram(
+    "aurathent_openai_queue_wait_seconds", "Time spent waiting for an upstream slot"
+)
+first_token_latency = registry.histogram(
+    "aurathent_openai_first_token_seconds", "Time to the first streamed delta", ("caller",)
+)
+coalesced_requests = registry.counter(
+    "aurathent_openai_coalesced_total", "Requests served by joining an identical in-flight call", ("caller",)
+)
+
+
+class GatewayBusy(RuntimeError):
+    """
+    Raised when no upstream slot frees up within the queue timeout.
+    """
+
+
+def is_upstream_failure(error):
+    """
+    True for errors that say the upstream is unhealthy (and are worth retrying).
+    """
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, (APITimeoutError, APIConnectionError, GatewayBusy))
+
+
+upstream_breaker = CircuitBreaker(
+    "openai", BreakerPolicy.from_env("OPENAI_BREAKER"), is_failure=is_upstream_failure
+)
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs one call per key at a time; concurrent callers with the same key
+    wait for that call and receive its result (or its exception).
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Returns:
+            tuple: (result, shared) where shared is True for followers
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
+
+
+_client = None
+_client_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+_active = [0]
+_active_lock = threading.Lock()
+_flights = SingleFlight()
+
+registry.gauge(
+    "aurathent_openai_in_flight", "Upstream OpenAI calls and distinct coalesced keys in flight",
+    lambda: {("calls",): _active[0], ("keys",): _flights.in_flight()}, ("kind",)
+)
+
+
+def get_client():
+    """
+    Returns:
+        OpenAI: Process-wide client; its connection pool is shared by all callers
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(
+                    api_key=os.getenv("OPENAI_KEY") or os.getenv("OPENAI_API_KEY"),
+                    timeout=DEADLINE,
+                    max_retries=0
+                )
+    return _client
+
+
+def _acquire(caller, timeout):
+    start = time.perf_counter()
+    if not _slots.acquire(timeout=timeout):
+        upstream_calls.inc(1, (caller, "rejected"))
+        raise GatewayBusy(f"All {MAX_CONCURRENCY} upstream slots busy for {timeout:.1f}s")
+    queue_wait.observe(time.perf_counter() - start)
+    with _active_lock:
+        _active[0] += 1
+
+
+def _release(caller, outcome):
+    with _active_lock:
+        _active[0] -= 1
+    _slots.release()
+    upstream_calls.inc(1, (caller, outcome))
+
+
+def bounded(fn, caller="default", timeout=QUEUE_TIMEOUT):
+    """
+    Runs fn() while holding an upstream slot.
+
+    Raises:
+        GatewayBusy: If no slot frees up within `timeout` seconds
+    """
+    _acquire(caller, timeout)
+    outcome = "error"
+    try:
+        with upstream_latency.time((caller,)):
+            result = fn()
+        outcome = "ok"
+        return result
+    finally:
+        _release(caller, outcome)
+
+
+class CompletionStream:
+    """
+    Iterator over the content deltas of a streamed completion.
+
+    Holds an upstream slot until the stream is exhausted, fails or is
+    closed; close() is safe to call more than once and before iteration.
+    """
+
+    def __init__(self, stream, caller):
+        self._stream = stream
+        self._error = None
+        self._chunks = iter(stream)
+        self._caller = caller
+        self._start = time.perf_counter()
+        self._first = True
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._closed:
+            raise StopIteration
+        try:
+            for chunk in self._chunks:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if self._first:
+                        first_token_latency.observe(time.perf_counter() - self._start, (self._caller,))
+                        self._first = False
+                    return delta
+        except BaseException as e:
+            self._error = e
+            self.close("error")
+            raise
+        self.close("ok")
+        raise StopIteration
+
+    def close(self, outcome="cancelled"):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._stream.close()
+        finally:
+            upstream_latency.observe(time.perf_counter() - self._start, (self._caller,))
+            _release(self._caller, outcome)
+            if outcome == "cancelled":
+                # A client hanging up early says nothing about upstream health
+                upstream_breaker.release()
+            else:
+                upstream_breaker.record(self._error)
+
+
+def stream_chat_completion(model, messages, caller="default", deadline=DEADLINE, **params):
+    """
+    Concurrency-bounded, breaker-guarded streaming chat completion.
+
+    The slot is taken and the upstream request sent before this returns, so
+    CircuitOpen, GatewayBusy and connection errors surface here rather than
+    mid-stream.
+
+    Returns:
+        CompletionStream: Iterator of content deltas; close it if abandoned early
+
+    Raises:
+        CircuitOpen: If the breaker is open
+        GatewayBusy: If no upstream slot frees up in time
+    """
+    if not upstream_breaker.allow():
+        raise CircuitOpen(f"Upstream circuit is {upstream_breaker.state}")
+    started = time.monotonic()
+    try:
+        _acquire(caller, min(QUEUE_TIMEOUT, deadline))
+    except GatewayBusy as e:
+        upstream_breaker.record(e)
+        raise
+    try:
+        stream = get_client().chat.completions.create(
+            model=model, messages=messages, stream=True,
+            timeout=_remaining(deadline, started), **params
+        )
+    except BaseException as e:
+        _release(caller, "error")
+        upstream_breaker.record(e)
+        raise
+    return CompletionStream(stream, caller)
+
+
+def _remaining(deadline, started):
+    return max(0.1, deadline - (time.monotonic() - started))
+
+
+def chat_completion(model, messages, caller="default", deadline=DEADLINE, **params):
+    """
+    Coalesced, concurrency-bounded, breaker-guarded chat completion.
+
+    Args:
+        model (str): Model name
+        messages (list): Chat messages
+        caller (str): Label for metrics, e.g. "echo" or "scroll_calibrate"
+        deadline (float): Seconds allowed for the slot wait plus the upstream call
+        **params: Passed to chat.completions.create (temperature, max_tokens, ...)
+
+    Returns:
+        str: Content of the first choice
+
+    Raises:
+        CircuitOpen: If the breaker is open
+        GatewayBusy: If no upstream slot frees up in time
+    """
+    started = time.monotonic()
+
+    def call():
+        completion = get_client().chat.completions.create(
+            model=model, messages=messages, timeout=_remaining(deadline, started), **params
+        )
+        return completion.choices[0].message.content
+
+    def guarded():
+        return upstream_breaker.call(lambda: bounded(call, caller, min(QUEUE_TIMEOUT, deadline)))
+
+    key = completion_key(model, messages, **params)
+    reply, shared = _flights.do(key, guarded)
+    if shared:
+        coalesced_requests.inc(1, (caller,))
+    return reply
+
+
+def _backoff(attempt, error):
+    # An open breaker will not take calls before its cool-down ends
+    if isinstance(error, CircuitOpen):
+        return upstream_breaker.policy.open_seconds
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def call_with_retry(fn, retries, transient=()):
+    """
+    Runs fn(), retrying transient failures with jittered exponential backoff.
+
+    Args:
+        fn (callable): The call, e.g. a chat_completion wrapped in a lambda
+        retries (int): Attempts allowed after the first
+        transient (tuple): Extra exception types worth retrying
+
+    Returns:
+        object: Whatever fn() returns
+
+    Raises:
+        Exception: The last error, or at once for errors that are not transient
+            (client errors such as a bad API key)
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            retryable = isinstance(e, (CircuitOpen,) + tuple(transient)) or is_upstream_failure(e)
+            if not retryable or attempt == retries:
+                raise
+            time.sleep(_backoff(attempt, e))
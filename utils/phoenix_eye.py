@@ -18,8 +18,14 @@ Symbolic Tiering:
     • Mana ≥ 150: Phoenix Phase (Class shift trigger)
 """
 
+import numpy as np
+
+from config.constants import AURA_STATES
 from models.query_log import log_event
 
+# Lower mana bound of each tier above Dormant (Kindled, Ascending, Phoenix Phase)
+AURA_TIER_CUTOFFS = np.array([50, 100, 150])
+
 def detect_aura_shift(mana, memory_tag=None):
     """
     Maps mana value to aura tier and evaluates possible evolution.
@@ -63,3 +69,45 @@ def detect_aura_shift(mana, memory_tag=None):
     })
 
     return result
+
+
+def detect_aura_shifts(manas, memory_tags=None):
+    """
+    Batch form of detect_aura_shift, tiering every mana value at once.
+
+    Args:
+        manas (array-like): Mana values, one per transmutation.
+        memory_tags (list[str], optional): Memory tags index-matched to manas.
+
+    Returns:
+        list[dict]: Aura results in input order, identical to detect_aura_shift().
+    """
+    mana_arr = np.asarray(manas)
+    if memory_tags is None:
+        memory_tags = [None] * len(mana_arr)
+
+    # side="right" places a mana equal to a cutoff in the higher tier
+    tier_scores = np.searchsorted(AURA_TIER_CUTOFFS, mana_arr, side="right")
+    evolved = tier_scores == len(AURA_TIER_CUTOFFS)
+
+    results = []
+    for mana, score, class_shift, memory_tag in zip(
+        mana_arr.tolist(), tier_scores.tolist(), evolved.tolist(), memory_tags
+    ):
+        aura_tier = AURA_STATES[score]
+        results.append({
+            "aura_tier": aura_tier,
+            "tier_score": score,
+            "evolved": class_shift,
+            "memory_reference": memory_tag or "none"
+        })
+
+        log_event("phoenix_eye", {
+            "mana": mana,
+            "tier": aura_tier,
+            "score": score,
+            "evolved": class_shift,
+            "memory_tag": memory_tag or "none"
+        })
+
+    return results
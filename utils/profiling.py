@@ -0,0 +1,153 @@
+"""
+profiling.py
+-------------
+Opt-in cProfile capture for individual requests.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Profile a request in place when it carries the profiling header, or
+      when a random sample falls under the configured rate
+    - Write each profile to a rotating directory, named by route and latency
+    - Cost a single header lookup per request when nothing is profiled
+
+Files:
+    <PROFILE_DIR>/<utc timestamp>__<METHOD>__<route>__<latency>ms.prof
+    Load them with pstats, or aggregate them with profile_report.py.
+
+Configuration (environment):
+    PROFILE_TOKEN        header profiling is enabled only when this is set; the
+                         request header must carry this exact value
+    PROFILE_HEADER       header name (default: X-Aurathent-Profile)
+    PROFILE_SAMPLE_RATE  fraction of requests profiled without the header (default: 0)
+    PROFILE_DIR          output directory (default: profiles)
+    PROFILE_MAX_FILES    newest profiles kept on disk (default: 500)
+"""
+
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Aurathent-Profile")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", 500))
+
+FILE_SUFFIX = ".prof"
+FIELD_SEPARATOR = "__"
+
+# cProfile hooks are process-global on newer Pythons; profile one request at a time
+_active = threading.Lock()
+_rotate_lock = threading.Lock()
+
+
+def route_slug(route):
+    """
+    File-name-safe form of a url rule: "/api/virtue/<user_id>" -> "api.virtue._user_id_".
+    """
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", route.strip("/").replace("/", ".")) or "root"
+
+
+def profile_filename(method, route, latency_ms, when=None):
+    stamp = (when or datetime.utcnow()).strftime("%Y%m%dT%H%M%S%f")
+    return FIELD_SEPARATOR.join(
+        [stamp, method, route_slug(route), f"{latency_ms:.2f}ms"]
+    ) + FILE_SUFFIX
+
+
+def parse_profile_filename(filename):
+    """
+    Returns:
+        dict | None: {"timestamp", "method", "route", "latency_ms"}, or None if
+        the name was not produced by profile_filename()
+    """
+    if not filename.endswith(FILE_SUFFIX):
+        return None
+    parts = filename[:-len(FILE_SUFFIX)].split(FIELD_SEPARATOR)
+    if len(parts) != 4 or not parts[3].endswith("ms"):
+        return None
+    try:
+        latency = float(parts[3][:-2])
+    except ValueError:
+        return None
+    return {"timestamp": parts[0], "method": parts[1], "route": parts[2], "latency_ms": latency}
+
+
+def rotate(directory, keep):
+    """
+    Deletes the oldest profiles so at most `keep` remain.
+    """
+    with _rotate_lock:
+        try:
+            names = sorted(n for n in os.listdir(directory) if n.endswith(FILE_SUFFIX))
+        except OSError:
+            return
+        for name in names[:max(0, len(names) - keep)]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def _wants_profile(headers):
+    if PROFILE_TOKEN and headers.get(PROFILE_HEADER) == PROFILE_TOKEN:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def init_profiling(app):
+    """
+    Registers the profiling hooks. Nothing is registered when neither a
+    token nor a sample rate is configured, so the off state costs nothing.
+    Call this from create_app().
+    """
+    if not PROFILE_TOKEN and PROFILE_SAMPLE_RATE <= 0:
+        return
+
+    from flask import g, request
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+
+    @app.before_request
+    def _start_profile():
+        if not _wants_profile(request.headers) or not _active.acquire(blocking=False):
+            return
+        profiler = cProfile.Profile()
+        g._profile = (profiler, time.perf_counter())
+        profiler.enable()
+
+    @app.after_request
+    def _stop_profile(response):
+        _finish_profile(response)
+        return response
+
+    @app.teardown_request
+    def _release_profile(exc):
+        # after_request is skipped when a handler raises; never leave the profiler on
+        _finish_profile(None)
+
+    def _finish_profile(response):
+        state = g.pop("_profile", None)
+        if state is None:
+            return
+        profiler, start = state
+        try:
+            profiler.disable()
+            latency_ms = (time.perf_counter() - start) * 1000
+            rule = request.url_rule
+            name = profile_filename(
+                request.method, rule.rule if rule is not None else "unmatched", latency_ms
+            )
+            profiler.dump_stats(os.path.join(PROFILE_DIR, name))
+            if response is not None:
+                response.headers["X-Aurathent-Profile-File"] = name
+        except Exception as e:
+            app.logger.error(f"[profiling] Could not write profile: {e}")
+        finally:
+            _active.release()
+        rotate(PROFILE_DIR, PROFILE_MAX_FILES)
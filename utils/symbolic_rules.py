@@ -0,0 +1,207 @@
+"""
+symbolic_rules.py
+------------------
+Compiles config/symbolic_rules.json into frozen lookup tables and hot-swaps
+them when the file changes.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Keep paradox, lapis and hope rules in one declarative file
+    - Key symmetric pairs canonically (sorted), so a lookup is one dict probe
+    - Swap compiled tables atomically; readers never take a lock
+    - Invalidate the scoring memo caches whenever the rules change
+
+Configuration (environment):
+    SYMBOLIC_RULES_PATH           rule file (default: config/symbolic_rules.json)
+    SYMBOLIC_RULES_POLL_INTERVAL  seconds between change checks (default: 2.0)
+"""
+
+import json
+import os
+import threading
+from types import MappingProxyType
+
+from models.query_log import log_event
+from models.vocabulary import normalize
+from utils.memo import clear_caches
+
+RULES_PATH = os.getenv(
+    "SYMBOLIC_RULES_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "symbolic_rules.json")
+)
+POLL_INTERVAL = float(os.getenv("SYMBOLIC_RULES_POLL_INTERVAL", 2.0))
+
+
+def pair_key(a, b):
+    """
+    Canonical key for a symmetric pair of symbols: normalized and sorted.
+    """
+    a, b = normalize(a), normalize(b)
+    return (a, b) if a <= b else (b, a)
+
+
+class RuleTables:
+    """
+    One immutable compiled snapshot of the rule file.
+    """
+
+    __slots__ = (
+        "paradox_pairs", "paradox_default", "paradox_descriptions",
+        "lapis_virtues", "amplified_contexts",
+        "hope_virtues", "regenerative_emotions", "signature"
+    )
+
+    def __init__(self, paradox_pairs, paradox_default, paradox_descriptions,
+                 lapis_virtues, amplified_contexts, hope_virtues,
+                 regenerative_emotions, signature=None):
+        self.paradox_pairs = paradox_pairs
+        self.paradox_default = paradox_default
+        self.paradox_descriptions = paradox_descriptions
+        self.lapis_virtues = lapis_virtues
+        self.amplified_contexts = amplified_contexts
+        self.hope_virtues = hope_virtues
+        self.regenerative_emotions = regenerative_emotions
+        self.signature = signature
+
+
+def _pair_table(entries, value, section):
+    table = {}
+    for entry in entries:
+        key = pair_key(*entry["pair"])
+        if key in table:
+            raise ValueError(f"Duplicate pair {list(key)} in {section}")
+        table[key] = value(entry)
+    return MappingProxyType(table)
+
+
+def _symbol_set(values):
+    return frozenset(normalize(v) for v in values)
+
+
+def compile_rules(data, signature=None):
+    """
+    Validates parsed rule data and builds frozen lookup tables.
+
+    Args:
+        data (dict): Parsed symbolic_rules.json content
+        signature (tuple, optional): (mtime_ns, size) of the source file
+
+    Returns:
+        RuleTables: The compiled snapshot
+
+    Raises:
+        ValueError: If the rule data is malformed
+    """
+    try:
+        paradox, lapis, hope = data["paradox"], data["lapis"], data["hope"]
+        default = paradox["default"]
+        return RuleTables(
+            paradox_pairs=_pair_table(
+                paradox["pairs"], lambda e: (int(e["level"]), str(e["flame"])), "paradox.pairs"
+            ),
+            paradox_default=(int(default["level"]), str(default["flame"])),
+            paradox_descriptions=_pair_table(
+                paradox["descriptions"], lambda e: str(e["description"]), "paradox.descriptions"
+            ),
+            lapis_virtues=_symbol_set(lapis["virtues"]),
+            amplified_contexts=_symbol_set(lapis["amplified_contexts"]),
+            hope_virtues=_symbol_set(hope["virtues"]),
+            regenerative_emotions=_symbol_set(hope["regenerative_emotions"]),
+            signature=signature
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Malformed symbolic rules: {e!r}")
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+def load_rules(path=RULES_PATH):
+    """
+    Reads and compiles the rule file.
+
+    Raises:
+        OSError, ValueError: If the file cannot be read or is malformed
+    """
+    signature = _file_signature(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_rules(json.load(f), signature)
+
+
+# -----------------------------------------------------------------------------
+# Current snapshot and hot reload
+# -----------------------------------------------------------------------------
+_tables = load_rules()
+_reload_lock = threading.Lock()
+_failed_signature = None
+_watcher = None
+
+
+def current_rules():
+    """
+    Returns the active RuleTables. Callers should read it once per call so a
+    concurrent swap can never mix two rule versions within one evaluation.
+    """
+    return _tables
+
+
+def reload_rules(path=RULES_PATH, force=False):
+    """
+    Recompiles the rule file if it changed and swaps the new tables in.
+
+    A file that fails to parse or validate leaves the current tables active.
+
+    Returns:
+        bool: True if new tables were swapped in
+    """
+    global _tables, _failed_signature
+
+    with _reload_lock:
+        signature = _file_signature(path)
+        if not force and signature in (None, _tables.signature, _failed_signature):
+            return False
+        try:
+            tables = load_rules(path)
+        except (OSError, ValueError) as e:
+            # Remember the broken version so the watcher reports it once, not every poll
+            _failed_signature = signature
+            log_event("symbolic_rules", {"path": path, "error": str(e)}, level="error")
+            return False
+
+        # Swap first, then invalidate, so results cached from here on use the new rules
+        _tables = tables
+        clear_caches()
+
+    log_event("symbolic_rules", {"path": path, "reloaded": True, "signature": list(signature or ())})
+    return True
+
+
+def _watch(path, interval, stop):
+    while not stop.wait(interval):
+        reload_rules(path)
+
+
+def start_rule_watcher(path=RULES_PATH, interval=POLL_INTERVAL):
+    """
+    Starts the background thread that polls the rule file for changes.
+
+    Returns:
+        threading.Event: Set it to stop the watcher
+    """
+    global _watcher
+
+    if _watcher is not None and _watcher[0].is_alive():
+        return _watcher[1]
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=_watch, args=(path, interval, stop), name="symbolic-rules-watcher", daemon=True
+    )
+    thread.start()
+    _watcher = (thread, stop)
+    return stop
@@ -0,0 +1,115 @@
+"""
+traffic_capture.py
+-------------------
+Records incoming API requests to an NDJSON capture file for later replay.
+
+Author: Khaylub Thompson-Calvin
+
+Purpose:
+    - Capture method, path, route, JSON payload, status and latency per request
+    - Write off the request path through a dedicated EventPipeline + FileSink
+    - Feed traffic_replay.py, which replays captures against a target server
+    - Drain queued captures to disk when the process exits
+
+Record format (one JSON object per line):
+    {"event": "http_request", "timestamp": iso, "ts": epoch seconds at arrival,
+     "method": str, "path": str (with query), "route": url rule,
+     "content_type": str | null, "body": JSON | null, "raw_body": str | null,
+     "status": int, "latency_ms": float, "level": "info"}
+
+Captures contain request payloads verbatim; treat capture files as user data.
+
+Configuration (environment):
+    TRAFFIC_CAPTURE_FILE         capture path; capture is off when unset
+    TRAFFIC_CAPTURE_PREFIX       only paths with this prefix are captured (default: /api/)
+    TRAFFIC_CAPTURE_SAMPLE_RATE  fraction of matching requests captured (default: 1.0)
+    TRAFFIC_CAPTURE_MAX_BODY     largest non-JSON body kept, in bytes (default: 65536)
+"""
+
+import atexit
+import os
+import random
+import time
+from datetime import datetime
+
+from utils.event_pipeline import EventPipeline, FileSink
+
+CAPTURE_FILE = os.getenv("TRAFFIC_CAPTURE_FILE")
+CAPTURE_PREFIX = os.getenv("TRAFFIC_CAPTURE_PREFIX", "/api/")
+CAPTURE_SAMPLE_RATE = float(os.getenv("TRAFFIC_CAPTURE_SAMPLE_RATE", 1.0))
+CAPTURE_MAX_BODY = int(os.getenv("TRAFFIC_CAPTURE_MAX_BODY", 65536))
+
+EVENT_NAME = "http_request"
+
+_capture_pipeline = None
+
+
+def get_capture_stats():
+    """
+    Returns:
+        dict | None: Capture pipeline counters, or None when capture is off
+    """
+    return _capture_pipeline.stats() if _capture_pipeline is not None else None
+
+
+def init_traffic_capture(app, path=CAPTURE_FILE):
+    """
+    Registers the capture hooks when a capture file is configured.
+    Call this from create_app().
+    """
+    global _capture_pipeline
+
+    if not path:
+        return
+
+    from flask import g, request
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    if _capture_pipeline is not None:
+        _capture_pipeline.stop()
+    _capture_pipeline = EventPipeline(sinks=[FileSink(path)]).start()
+
+    @app.before_request
+    def _start_capture():
+        if not request.path.startswith(CAPTURE_PREFIX):
+            return
+        if CAPTURE_SAMPLE_RATE < 1.0 and random.random() >= CAPTURE_SAMPLE_RATE:
+            return
+        g._capture = (time.time(), time.perf_counter())
+
+    @app.after_request
+    def _write_capture(response):
+        state = g.pop("_capture", None)
+        if state is None:
+            return response
+        arrived, start = state
+
+        body = request.get_json(silent=True)
+        raw_body = None
+        if body is None and request.content_length:
+            data = request.get_data(cache=True)
+            if len(data) <= CAPTURE_MAX_BODY:
+                raw_body = data.decode("utf-8", errors="replace")
+
+        rule = request.url_rule
+        _capture_pipeline.submit({
+            "event": EVENT_NAME,
+            "timestamp": datetime.utcfromtimestamp(arrived).isoformat(),
+            "ts": arrived,
+            "method": request.method,
+            "path": request.full_path.rstrip("?"),
+            "route": rule.rule if rule is not None else "unmatched",
+            "content_type": request.content_type,
+            "body": body,
+            "raw_body": raw_body,
+            "status": response.status_code,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3)
+        })
+        return response
+
+
+@atexit.register
+def _drain_on_exit():
+    if _capture_pipeline is not None:
+        _capture_pipeline.stop()
@@ -12,6 +12,11 @@ Purpose:
     - Integrates with transmutation record for aura recovery or rebirth logic
 """
 
+from models.vocabulary import normalize
+from utils.memo import memoized
+from utils.symbolic_rules import current_rules
+
+@memoized()
 def bind_hope_chain(emotion, virtue, fatigue_level):
     """
     Evaluate emotional context to determine if a 'hope-binder' thread should be formed.
@@ -25,10 +30,8 @@ def bind_hope_chain(emotion, virtue, fatigue_level):
         dict: A symbolic package of sustained guidance.
     """
 
-    hope_virtues = {"faith", "perseverance", "humility", "renewal", "compassion"}
-    regenerative_emotions = {"grief", "patience", "yearning", "loneliness"}
-
-    chain_bound = virtue.lower() in hope_virtues and emotion.lower() in regenerative_emotions
+    rules = current_rules()
+    chain_bound = normalize(virtue) in rules.hope_virtues and normalize(emotion) in rules.regenerative_emotions
 
     nourishment = max(1, 10 - fatigue_level)  # inverse fatigue = strength of output
 
@@ -56,7 +59,7 @@ def bind_hope_to_memory(memory_tag):
         "joy": "Golden wheat bound to aura.",
     }
 
-    message = binding_table.get(memory_tag.lower(), "Hope layered over shadow.")
+    message = binding_table.get(normalize(memory_tag), "Hope layered over shadow.")
     return {
         "binding": "hope",
         "message": message,